@@ -0,0 +1,26 @@
+# gestureflow/_synthetic.py
+
+from typing import Sequence
+
+import numpy as np
+
+
+def synthetic_hand(extended: Sequence[int]) -> np.ndarray:
+    """Builds a (21, 3) right hand with the given fingers (thumb first) extended."""
+    points = [(0.5, 0.9, 0.0)]
+    if extended[0]:
+        points += [(0.45, 0.85, 0.0), (0.40, 0.80, 0.0), (0.34, 0.75, 0.0), (0.28, 0.70, 0.0)]
+    else:
+        points += [(0.45, 0.85, 0.0), (0.42, 0.80, 0.0), (0.45, 0.78, 0.0), (0.47, 0.79, 0.0)]
+    for x, is_extended in zip((0.45, 0.5, 0.55, 0.6), extended[1:]):
+        ys = (0.70, 0.60, 0.53, 0.47) if is_extended else (0.70, 0.64, 0.68, 0.71)
+        points += [(x, y, 0.0) for y in ys]
+    return np.array(points, dtype=np.float32)
+
+
+def perturbed_hands(count: int, noise: float = 0.02, seed: int = 0) -> np.ndarray:
+    """Returns (count, 21, 3) noisy synthetic hands covering every combination of extended fingers."""
+    rng = np.random.default_rng(seed)
+    templates = np.stack([synthetic_hand(bits) for bits in np.ndindex(2, 2, 2, 2, 2)])
+    hands = templates[rng.integers(len(templates), size=count)]
+    return hands + rng.normal(0.0, noise, hands.shape).astype(np.float32)
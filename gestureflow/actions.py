@@ -4,6 +4,10 @@ import logging
 import time
 import platform
 import sys
+import threading
+
+from gestureflow.cursor import CursorInterpolator, ScreenMapping
+from gestureflow.landmarks import as_landmark_array
 
 # Optional imports - wrap in try-except to handle missing installations gracefully
 try:
@@ -48,6 +52,9 @@ class ActionHandler:
         self.serial_connection = None
         self.last_action_time = {} # Track last execution time per gesture to prevent spamming
         self.action_debounce_ms = config.get('action_debounce_ms', 500) # Min ms between same action
+        self._os_lock = threading.Lock() # Serializes pyautogui calls with the cursor thread
+        self.cursor = None
+        self.screen_mapping = None # Camera-to-screen mapping of the absolute mouse mode
 
         # --- PyAutoGUI Setup ---
         self.pyautogui_enabled = PYAUTOGUI_AVAILABLE and config.get('pyautogui', {}).get('enabled', False)
@@ -61,10 +68,30 @@ class ActionHandler:
                 # Get screen dimensions for potential mouse control mapping
                 self.screen_width, self.screen_height = pyautogui.size()
                 logging.info(f"Screen dimensions: {self.screen_width}x{self.screen_height}")
+                mouse_config = self._mouse_control_settings(config)
                 self.mouse_control_active = False
-                self.mouse_control_gesture = config.get('mouse_control', {}).get('control_gesture')
-                self.mouse_sensitivity = config.get('mouse_control', {}).get('sensitivity', 1.5)
+                self.mouse_control_gesture = mouse_config.get('control_gesture')
+                self.mouse_sensitivity = mouse_config.get('sensitivity', 1.5)
                 self.prev_mouse_landmark = None # Store previous landmark for relative movement
+                self._mouse_remainder = (0.0, 0.0) # Sub-pixel movement not yet applied
+                # "relative": the pointer follows the fingertip's movement;
+                # "absolute": a rectangle of the camera image covers the whole screen
+                self.mouse_mode = mouse_config.get('mode', 'relative')
+                if self.mouse_mode == 'absolute':
+                    self.screen_mapping = ScreenMapping(
+                        (self.screen_width, self.screen_height),
+                        active_region=mouse_config.get('active_region', (0.2, 0.2, 0.8, 0.8)), # left, top, right, bottom (0-1)
+                        edge_dead_zone=mouse_config.get('edge_dead_zone', 0.05), # Pinned border, fraction of the region
+                        acceleration=mouse_config.get('acceleration', 1.0)) # Response curve exponent; 1 is linear
+                elif self.mouse_mode != 'relative':
+                    raise ValueError(f"Unknown mouse_control mode '{self.mouse_mode}' (expected 'relative' or 'absolute').")
+                # Pointer updates per second from a background thread that glides
+                # between camera frames; 0 moves once per processed frame instead
+                interpolation_hz = mouse_config.get('interpolation_hz', 120)
+                if self.mouse_control_gesture and interpolation_hz > 0:
+                    self.cursor = CursorInterpolator(
+                        self._move_pointer, rate_hz=interpolation_hz, lock=self._os_lock,
+                        move_to=self._move_pointer_to if self.screen_mapping else None).start()
             except Exception as e:
                 logging.error(f"Failed to configure PyAutoGUI: {e}. Disabling OS control.")
                 self.pyautogui_enabled = False
@@ -85,6 +112,21 @@ class ActionHandler:
                  logging.warning("PySerial is configured to be enabled, but the library is not available.")
 
 
+    @staticmethod
+    def _mouse_control_settings(config: dict) -> dict:
+        """
+        Collects the mouse control settings: the 'mouse_control' section,
+        overridden by the gesture_actions entry of type "mouse_control" (e.g.
+        OPEN_PALM in config.json), which also names the control gesture.
+        """
+        settings = dict(config.get('mouse_control', {}))
+        for gesture_name, action in config.get('gesture_actions', {}).items():
+            if isinstance(action, dict) and action.get('type') == 'mouse_control':
+                settings.update({key: value for key, value in action.items() if key not in ('type', 'description')})
+                settings['control_gesture'] = gesture_name
+                break
+        return settings
+
     def _init_serial(self):
         """Initializes the serial connection based on the configuration."""
         serial_config = self.config.get('serial', {})
@@ -125,14 +167,26 @@ class ActionHandler:
             return True
         return False
 
+    def moves_pointer(self, gesture_name: str) -> bool:
+        """
+        Tells whether execute_action() would move the mouse pointer for this
+        gesture (mouse control). Callers that debounce repeated gestures should
+        still call execute_action() on every frame for these, or the pointer
+        only gets a new target once per debounce interval.
+        """
+        if not self.pyautogui_enabled or gesture_name in self.gesture_map:
+            return False
+        return gesture_name == self.mouse_control_gesture or self.mouse_control_active
+
     def execute_action(self, gesture_name: str, landmarks=None):
         """
         Executes the action mapped to the given gesture name.
 
         Args:
             gesture_name (str): The name of the recognized gesture.
-            landmarks (list, optional): The list of detected hand landmarks.
-                                        Required for actions like mouse control.
+            landmarks (optional): The hand's (21, 3) landmark array (or
+                                  HandLandmarks / MediaPipe landmark list).
+                                  Required for actions like mouse control.
         """
         if not gesture_name or gesture_name == 'NO_HAND':
             # Handle potential mouse control deactivation when no hand/gesture is detected
@@ -140,6 +194,8 @@ class ActionHandler:
                  logging.debug("Deactivating mouse control due to lack of gesture.")
                  self.mouse_control_active = False
                  self.prev_mouse_landmark = None
+                 if self.cursor:
+                     self.cursor.release()
             return
 
         action_config = self.gesture_map.get(gesture_name)
@@ -151,6 +207,8 @@ class ActionHandler:
                     logging.info(f"Activating mouse control with gesture: {gesture_name}")
                     self.mouse_control_active = True
                     self.prev_mouse_landmark = None # Reset previous landmark on activation
+                    if self.cursor:
+                        self.cursor.release()
             elif self.pyautogui_enabled and self.mouse_control_active:
                 # If mouse control is active, but the current gesture isn't the control gesture,
                 # potentially deactivate it or handle other gestures if configured.
@@ -164,7 +222,7 @@ class ActionHandler:
                 pass # Keep mouse control active unless explicitly stopped or another action occurs
 
             # If mouse control is active, perform mouse movement regardless of other mappings
-            if self.pyautogui_enabled and self.mouse_control_active and landmarks:
+            if self.pyautogui_enabled and self.mouse_control_active and landmarks is not None:
                 self._handle_mouse_movement(landmarks)
                 return # Don't process other actions if mouse control is active
 
@@ -181,123 +239,167 @@ class ActionHandler:
 
         logging.info(f"Executing action for gesture '{gesture_name}': Type='{action_type}', Command='{command}'")
 
-        try:
-            # --- PyAutoGUI Actions ---
-            if action_type == 'keyboard' and self.pyautogui_enabled:
-                if not command:
-                    logging.warning(f"Keyboard action for '{gesture_name}' has no command.")
-                    return
-                # Simple parsing for hotkeys vs single keys
-                keys = command.split('+')
-                if len(keys) > 1:
-                    pyautogui.hotkey(*keys)
-                else:
-                    pyautogui.press(keys[0])
-                logging.debug(f"Executed keyboard command: {command}")
-
-            elif action_type == 'mouse' and self.pyautogui_enabled:
-                if command == 'click':
-                    pyautogui.click()
-                    logging.debug("Executed mouse click.")
-                elif command == 'right_click':
-                    pyautogui.rightClick()
-                    logging.debug("Executed mouse right click.")
-                elif command == 'double_click':
-                    pyautogui.doubleClick()
-                    logging.debug("Executed mouse double click.")
-                elif command == 'scroll_up':
-                    amount = action_config.get('amount', 100) # Configurable scroll amount
-                    pyautogui.scroll(amount)
-                    logging.debug(f"Executed mouse scroll up by {amount}.")
-                elif command == 'scroll_down':
-                    amount = action_config.get('amount', 100)
-                    pyautogui.scroll(-amount) # Negative for down scroll
-                    logging.debug(f"Executed mouse scroll down by {amount}.")
-                # Add more mouse commands as needed (drag, specific positions, etc.)
-                else:
-                    logging.warning(f"Unknown mouse command '{command}' for gesture '{gesture_name}'.")
-
-            # --- PySerial Actions ---
-            elif action_type == 'serial' and self.pyserial_enabled:
-                if not self.serial_connection or not self.serial_connection.is_open:
-                    logging.warning("Serial action requested, but connection is not available.")
-                    # Optionally try to reconnect?
-                    # try: self._init_serial()
-                    # except: pass # Ignore reconnect failure here
-                    return
-                if not command:
-                    logging.warning(f"Serial action for '{gesture_name}' has no command.")
-                    return
-
-                # Send command, ensuring it ends with a newline for Arduino compatibility
-                command_bytes = (command + '\n').encode('utf-8')
-                self.serial_connection.write(command_bytes)
-                logging.debug(f"Sent serial command: {command}")
-                # Optional: Read response?
-                # response = self.serial_connection.readline().decode('utf-8').strip()
-                # if response: logging.debug(f"Received serial response: {response}")
-
-            # --- Unknown Action Type ---
-            elif action_type:
-                logging.warning(f"Unsupported action type '{action_type}' for gesture '{gesture_name}'.")
-
-        except Exception as e:
-            logging.error(f"Error executing action for gesture '{gesture_name}': {e}")
-            # Reset debounce timer in case of error to allow retrying
-            if gesture_name in self.last_action_time:
-                 del self.last_action_time[gesture_name]
-            # Handle specific library errors if needed
-            if isinstance(e, pyautogui.PyAutoGUIException):
-                logging.error("PyAutoGUI specific error occurred.")
-            elif PYSERIAL_AVAILABLE and isinstance(e, serial.SerialException):
-                logging.error("Serial communication error occurred. Closing connection.")
-                self.close() # Attempt to close faulty connection
-                self.pyserial_enabled = False # Disable further serial attempts
+        # The cursor thread may be moving the pointer; OS input calls go one at a time
+        with self._os_lock:
+            try:
+                # --- PyAutoGUI Actions ---
+                if action_type == 'keyboard' and self.pyautogui_enabled:
+                    if not command:
+                        logging.warning(f"Keyboard action for '{gesture_name}' has no command.")
+                        return
+                    # Simple parsing for hotkeys vs single keys
+                    keys = command.split('+')
+                    if len(keys) > 1:
+                        pyautogui.hotkey(*keys)
+                    else:
+                        pyautogui.press(keys[0])
+                    logging.debug(f"Executed keyboard command: {command}")
+
+                elif action_type == 'mouse' and self.pyautogui_enabled:
+                    if command == 'click':
+                        pyautogui.click()
+                        logging.debug("Executed mouse click.")
+                    elif command == 'right_click':
+                        pyautogui.rightClick()
+                        logging.debug("Executed mouse right click.")
+                    elif command == 'double_click':
+                        pyautogui.doubleClick()
+                        logging.debug("Executed mouse double click.")
+                    elif command == 'scroll_up':
+                        amount = action_config.get('amount', 100) # Configurable scroll amount
+                        pyautogui.scroll(amount)
+                        logging.debug(f"Executed mouse scroll up by {amount}.")
+                    elif command == 'scroll_down':
+                        amount = action_config.get('amount', 100)
+                        pyautogui.scroll(-amount) # Negative for down scroll
+                        logging.debug(f"Executed mouse scroll down by {amount}.")
+                    # Add more mouse commands as needed (drag, specific positions, etc.)
+                    else:
+                        logging.warning(f"Unknown mouse command '{command}' for gesture '{gesture_name}'.")
+
+                # --- PySerial Actions ---
+                elif action_type == 'serial' and self.pyserial_enabled:
+                    if not self.serial_connection or not self.serial_connection.is_open:
+                        logging.warning("Serial action requested, but connection is not available.")
+                        # Optionally try to reconnect?
+                        # try: self._init_serial()
+                        # except: pass # Ignore reconnect failure here
+                        return
+                    if not command:
+                        logging.warning(f"Serial action for '{gesture_name}' has no command.")
+                        return
+
+                    # Send command, ensuring it ends with a newline for Arduino compatibility
+                    command_bytes = (command + '\n').encode('utf-8')
+                    self.serial_connection.write(command_bytes)
+                    logging.debug(f"Sent serial command: {command}")
+                    # Optional: Read response?
+                    # response = self.serial_connection.readline().decode('utf-8').strip()
+                    # if response: logging.debug(f"Received serial response: {response}")
+
+                # --- Unknown Action Type ---
+                elif action_type:
+                    logging.warning(f"Unsupported action type '{action_type}' for gesture '{gesture_name}'.")
+
+            except Exception as e:
+                logging.error(f"Error executing action for gesture '{gesture_name}': {e}")
+                # Reset debounce timer in case of error to allow retrying
+                if gesture_name in self.last_action_time:
+                     del self.last_action_time[gesture_name]
+                # Handle specific library errors if needed
+                if isinstance(e, pyautogui.PyAutoGUIException):
+                    logging.error("PyAutoGUI specific error occurred.")
+                elif PYSERIAL_AVAILABLE and isinstance(e, serial.SerialException):
+                    logging.error("Serial communication error occurred. Closing connection.")
+                    self._close_serial() # Attempt to close faulty connection
+                    self.pyserial_enabled = False # Disable further serial attempts
 
 
     def _handle_mouse_movement(self, landmarks):
         """
         Controls the mouse pointer based on hand landmarks (e.g., index finger tip).
-        Uses relative movement based on the change from the previous frame.
+        In relative mode the pointer moves by the change from the previous frame;
+        in absolute mode it goes to the fingertip's place in the active region
+        (see gestureflow.cursor.ScreenMapping).
+        Landmark jitter is left to the landmark filter upstream (see
+        gestureflow.tracking.OneEuroLandmarkFilter); sub-pixel movement is
+        carried over to the next frame instead of being dropped.
 
         Args:
-            landmarks: List of normalized hand landmarks from MediaPipe.
+            landmarks: The hand's normalized (21, 3) landmark array.
         """
-        if not self.pyautogui_enabled or not landmarks or len(landmarks) <= 8:
+        points = as_landmark_array(landmarks) if landmarks is not None else None
+        if not self.pyautogui_enabled or points is None or len(points) <= 8:
              # Ensure landmarks are valid and index finger tip (landmark 8) exists
             self.prev_mouse_landmark = None # Reset if landmarks are invalid
+            if self.cursor:
+                self.cursor.release()
             return
 
         # Use the tip of the index finger (landmark 8) for control
-        index_tip = landmarks[8]
-        # Landmarks are normalized (0.0 to 1.0). Convert to screen coordinates.
-        # Invert Y-axis because landmark Y increases downwards, screen Y increases upwards.
-        target_x = int(index_tip.x * self.screen_width)
-        target_y = int((1.0 - index_tip.y) * self.screen_height) # Invert Y
+        index_tip = (float(points[8, 0]), float(points[8, 1]))
+
+        if self.screen_mapping:
+            screen_x, screen_y = self.screen_mapping.map(*index_tip)
+            if self.cursor:
+                self.cursor.update(screen_x, screen_y)
+            else:
+                pyautogui.moveTo(int(round(screen_x)), int(round(screen_y)), duration=0)
+            self.prev_mouse_landmark = index_tip
+            return
+
+        # Landmarks are normalized (0.0 to 1.0). Convert to screen coordinates;
+        # landmark Y and screen Y both grow downwards, as in absolute mode.
+        target_x = index_tip[0] * self.screen_width
+        target_y = index_tip[1] * self.screen_height
+
+        if self.cursor:
+            # The cursor thread glides towards the target at its own rate
+            self.cursor.update(target_x * self.mouse_sensitivity, target_y * self.mouse_sensitivity)
+            self.prev_mouse_landmark = index_tip
+            return
 
         if self.prev_mouse_landmark:
             # Calculate relative movement
-            prev_x = int(self.prev_mouse_landmark.x * self.screen_width)
-            prev_y = int((1.0 - self.prev_mouse_landmark.y) * self.screen_height)
+            prev_x = self.prev_mouse_landmark[0] * self.screen_width
+            prev_y = self.prev_mouse_landmark[1] * self.screen_height
 
-            # Apply sensitivity factor
-            delta_x = int((target_x - prev_x) * self.mouse_sensitivity)
-            delta_y = int((target_y - prev_y) * self.mouse_sensitivity)
+            # Apply sensitivity factor; the fraction of a pixel left over from
+            # the last frame is added so slow movements still add up
+            remainder_x, remainder_y = self._mouse_remainder
+            exact_x = (target_x - prev_x) * self.mouse_sensitivity + remainder_x
+            exact_y = (target_y - prev_y) * self.mouse_sensitivity + remainder_y
+            delta_x, delta_y = int(exact_x), int(exact_y)
+            self._mouse_remainder = (exact_x - delta_x, exact_y - delta_y)
 
             # Use moveRel for smoother relative movement
-            if abs(delta_x) > 1 or abs(delta_y) > 1: # Add a small threshold to avoid jitter
+            if delta_x or delta_y:
                 pyautogui.moveRel(delta_x, delta_y, duration=0) # Duration 0 for immediate move
                 # logging.debug(f"Mouse moveRel: dx={delta_x}, dy={delta_y}")
+        else:
+            self._mouse_remainder = (0.0, 0.0)
 
         # Update previous landmark position for the next frame
         self.prev_mouse_landmark = index_tip
 
-        # Optional: Absolute positioning (can be jittery)
-        # pyautogui.moveTo(target_x, target_y, duration=0.1)
 
+    def _move_pointer(self, delta_x: int, delta_y: int):
+        """Relative pointer move for the cursor thread (without pyautogui's per-call pause)."""
+        pyautogui.moveRel(delta_x, delta_y, duration=0, _pause=False)
+
+    def _move_pointer_to(self, x: int, y: int):
+        """Absolute pointer move for the cursor thread (without pyautogui's per-call pause)."""
+        pyautogui.moveTo(x, y, duration=0, _pause=False)
 
     def close(self):
-        """Closes any open connections (like serial)."""
+        """Stops the cursor thread and closes any open connections (like serial)."""
+        if self.cursor:
+            self.cursor.stop()
+            self.cursor = None
+        self._close_serial()
+
+    def _close_serial(self):
+        """Closes the serial connection, if open."""
         if self.serial_connection and self.serial_connection.is_open:
             try:
                 self.serial_connection.close()
@@ -317,7 +419,7 @@ if __name__ == '__main__':
             "OPEN_PALM": {"action": "mouse", "command": "click"},
             "THUMBS_UP": {"action": "serial", "command": "LED_ON"},
             "THUMBS_DOWN": {"action": "serial", "command": "LED_OFF"},
-            "POINTING_INDEX": {"action": "mouse", "command": "scroll_up", "amount": 50},
+            "POINTING_UP": {"action": "mouse", "command": "scroll_up", "amount": 50},
             "VICTORY": {"action": "keyboard", "command": "win"}, # Example: Open Start menu on Windows
         },
         "serial": {
@@ -359,8 +461,8 @@ if __name__ == '__main__':
         action_handler.execute_action("OPEN_PALM")
         time.sleep(1)
 
-        print("Testing PyAutoGUI - POINTING_INDEX (scroll up)...")
-        action_handler.execute_action("POINTING_INDEX")
+        print("Testing PyAutoGUI - POINTING_UP (scroll up)...")
+        action_handler.execute_action("POINTING_UP")
         time.sleep(1)
 
         print("Testing PyAutoGUI - VICTORY (e.g., Win/Cmd key)...")
@@ -0,0 +1,165 @@
+# gestureflow/adaptive.py
+
+import time
+from typing import Any, List, Optional, Sequence, Tuple
+
+import cv2
+import numpy as np
+
+
+class ResolutionController:
+    """
+    Chooses an inference resolution from a ladder to hold a latency target.
+
+    Per-frame inference latencies are smoothed with an exponential moving
+    average. The controller steps one rung down the ladder when the average
+    stays above the upper band for `patience` frames, and one rung up when the
+    latency predicted for the next larger rung (scaled by the pixel count) stays
+    below the lower band. The gap between the bands plus a cooldown after every
+    switch keep it from oscillating between two rungs.
+    """
+
+    def __init__(self,
+                 ladder: Sequence[int] = (1280, 960, 640, 480),
+                 target_ms: float = 25.0,
+                 hysteresis: float = 0.15,
+                 smoothing: float = 0.1,
+                 patience: int = 10,
+                 cooldown: int = 30):
+        """
+        Initializes the ResolutionController.
+
+        Args:
+            ladder: Candidate inference widths in pixels. Heights follow the
+                    frame's aspect ratio. Sorted largest first internally.
+            target_ms: Per-frame inference latency to hold, in milliseconds.
+            hysteresis: Half-width of the dead band around the target, as a
+                        fraction (0.15 -> step down above 115%, step up only if
+                        the larger rung is predicted below 85%).
+            smoothing: EMA factor applied to each new latency sample (0-1].
+            patience: Consecutive frames a band must be violated before switching.
+            cooldown: Frames to wait after a switch before considering another one.
+        """
+        if not ladder:
+            raise ValueError("ResolutionController needs at least one resolution.")
+        self.ladder: List[int] = sorted({int(w) for w in ladder}, reverse=True)
+        self.target_ms = target_ms
+        self.hysteresis = hysteresis
+        self.smoothing = smoothing
+        self.patience = patience
+        self.cooldown = cooldown
+
+        self.index = 0  # Start at full quality; the controller backs off if needed
+        self.average_ms: Optional[float] = None
+        self.switches = 0
+        self._over = 0
+        self._under = 0
+        self._frames_since_switch = 0
+
+    @property
+    def width(self) -> int:
+        """The inference width currently selected."""
+        return self.ladder[self.index]
+
+    def inference_size(self, frame_shape: Tuple[int, ...]) -> Optional[Tuple[int, int]]:
+        """
+        Returns the (width, height) to run inference at for a frame, or None if
+        the frame is already at or below the selected width.
+        """
+        frame_h, frame_w = frame_shape[:2]
+        if frame_w <= self.width:
+            return None
+        return self.width, max(1, int(round(frame_h * self.width / frame_w)))
+
+    def _switch(self, new_index: int):
+        """Moves to another rung and rescales the latency estimate to match it."""
+        area_ratio = (self.ladder[new_index] / self.ladder[self.index]) ** 2
+        self.average_ms *= area_ratio
+        self.index = new_index
+        self.switches += 1
+        self._over = self._under = 0
+        self._frames_since_switch = 0
+
+    def update(self, latency_ms: float) -> int:
+        """
+        Feeds one inference latency sample.
+
+        Args:
+            latency_ms: Time the last inference took, in milliseconds.
+
+        Returns:
+            The inference width to use for the next frame.
+        """
+        if self.average_ms is None:
+            self.average_ms = latency_ms
+        else:
+            self.average_ms += self.smoothing * (latency_ms - self.average_ms)
+        self._frames_since_switch += 1
+        if self._frames_since_switch < self.cooldown:
+            return self.width
+
+        upper = self.target_ms * (1.0 + self.hysteresis)
+        lower = self.target_ms * (1.0 - self.hysteresis)
+
+        can_step_down = self.index < len(self.ladder) - 1
+        self._over = self._over + 1 if (can_step_down and self.average_ms > upper) else 0
+
+        can_step_up = self.index > 0
+        if can_step_up:
+            predicted_ms = self.average_ms * (self.ladder[self.index - 1] / self.width) ** 2
+            self._under = self._under + 1 if predicted_ms < lower else 0
+        else:
+            self._under = 0
+
+        if self._over >= self.patience:
+            self._switch(self.index + 1)
+        elif self._under >= self.patience:
+            self._switch(self.index - 1)
+        return self.width
+
+
+class AdaptiveResolutionDetector:
+    """
+    Wraps a HandDetector and downscales its input according to a ResolutionController.
+
+    Landmarks are normalized to the image size, so results need no remapping.
+    Exposes the same process_frame() interface as HandDetector; other attributes
+    are forwarded to the wrapped detector.
+    """
+
+    def __init__(self, detector: Any, controller: Optional[ResolutionController] = None):
+        """
+        Initializes the AdaptiveResolutionDetector.
+
+        Args:
+            detector: The HandDetector (or another wrapper) to run.
+            controller: The ResolutionController to follow. A default one is
+                        created if None.
+        """
+        self.detector = detector
+        self.controller = controller or ResolutionController()
+        self._resize_buffer: Optional[np.ndarray] = None
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.detector, name)
+
+    def process_frame(self, frame: np.ndarray, is_rgb: bool = False) -> Tuple[List[Any], Optional[Any]]:
+        """
+        Runs the wrapped detector at the currently selected resolution and feeds
+        the measured latency back to the controller. See HandDetector.process_frame.
+        """
+        start = time.perf_counter()
+        size = self.controller.inference_size(frame.shape)
+        if size is not None:
+            width, height = size
+            if self._resize_buffer is None or self._resize_buffer.shape[:2] != (height, width):
+                self._resize_buffer = np.empty((height, width) + frame.shape[2:], dtype=frame.dtype)
+            frame = cv2.resize(frame, size, dst=self._resize_buffer, interpolation=cv2.INTER_AREA)
+
+        landmarks_list, results = self.detector.process_frame(frame, is_rgb=is_rgb)
+        self.controller.update((time.perf_counter() - start) * 1000.0)
+        return landmarks_list, results
+
+    def close(self):
+        """Releases the wrapped detector."""
+        self.detector.close()
@@ -0,0 +1,187 @@
+# gestureflow/capture.py
+
+import logging
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+
+class FrameGrabber:
+    """
+    Pulls frames from a cv2.VideoCapture on a background thread.
+
+    The capture thread reads frames as fast as the driver delivers them and
+    keeps only the newest one in a single slot ("latest frame wins"). The
+    processing loop therefore always works on the most recent image instead of
+    draining a queue of stale frames while inference is slow. Frames that were
+    overwritten before anyone consumed them are counted as dropped.
+    """
+
+    def __init__(self, capture: Any, read_timeout: float = 1.0, name: str = "FrameGrabber"):
+        """
+        Initializes the FrameGrabber.
+
+        Args:
+            capture: An opened cv2.VideoCapture (or any object exposing
+                     read(), isOpened() and release()).
+            read_timeout: Default number of seconds read() waits for a new frame
+                          before reporting failure.
+            name: Name given to the capture thread.
+        """
+        self.capture = capture
+        self.read_timeout = read_timeout
+        self.name = name
+
+        self._condition = threading.Condition()
+        self._frame: Optional[np.ndarray] = None
+        self._frame_seq = 0          # Sequence number of the frame in the slot
+        self._frame_time = 0.0       # time.monotonic() when the slot frame was captured
+        self._last_read_seq = 0      # Sequence number last handed to a consumer
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+        self._pending_properties: Dict[int, float] = {}  # Applied by the capture thread
+
+        # Counters (read via stats())
+        self.frames_captured = 0
+        self.frames_consumed = 0
+        self.frames_dropped = 0
+        self.read_failures = 0
+
+        # Capture timestamp of the frame most recently returned by read()
+        self.last_frame_time = 0.0
+
+    def start(self) -> 'FrameGrabber':
+        """Starts the capture thread. Returns self so it can be chained."""
+        if self._running:
+            return self
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+        return self
+
+    def _run(self):
+        """Capture thread body: keep the slot filled with the newest frame."""
+        consecutive_failures = 0
+        while self._running:
+            if self._pending_properties:
+                self._apply_pending_properties()
+            success, frame = self.capture.read()
+            if not success or frame is None:
+                self.read_failures += 1
+                consecutive_failures += 1
+                if consecutive_failures == 30:
+                    logging.warning("FrameGrabber: camera returned no frames for 30 consecutive reads.")
+                time.sleep(0.01)  # Avoid spinning on a dead device
+                continue
+            consecutive_failures = 0
+
+            with self._condition:
+                self.frames_captured += 1
+                # The previous frame was never consumed: it is being overwritten.
+                if self._frame_seq > self._last_read_seq:
+                    self.frames_dropped += 1
+                self._frame = frame
+                self._frame_seq += 1
+                self._frame_time = time.monotonic()
+                self._condition.notify_all()
+
+    def _apply_pending_properties(self):
+        """Applies queued capture property changes (capture thread only)."""
+        with self._condition:
+            properties, self._pending_properties = self._pending_properties, {}
+        for prop, value in properties.items():
+            if not self.capture.set(prop, value):
+                logging.debug(f"FrameGrabber: capture property {prop} could not be set to {value}.")
+
+    def set(self, prop: int, value: float) -> bool:
+        """
+        Changes a cv2.CAP_PROP_* property of the capture device.
+
+        The change is queued and applied by the capture thread before its next
+        read, so the driver is never reconfigured in the middle of a read.
+
+        Returns:
+            True once the change is queued. If the capture thread is not running
+            the change is applied immediately and the driver's answer returned.
+        """
+        if not self._running:
+            return self.capture.set(prop, value)
+        with self._condition:
+            self._pending_properties[prop] = value
+        return True
+
+    def get(self, prop: int) -> float:
+        """Returns a cv2.CAP_PROP_* property of the capture device."""
+        with self._condition:
+            if prop in self._pending_properties:
+                return self._pending_properties[prop]
+        return self.capture.get(prop)
+
+    def read(self, timeout: Optional[float] = None) -> Tuple[bool, Optional[np.ndarray]]:
+        """
+        Returns the newest frame that has not been returned before.
+
+        Blocks until the capture thread delivers a fresh frame. Mirrors the
+        cv2.VideoCapture.read() return convention so it can be used as a drop-in
+        replacement in the main loop.
+
+        Args:
+            timeout: Seconds to wait for a new frame. Defaults to read_timeout.
+
+        Returns:
+            A tuple (success, frame). success is False and frame is None if no new
+            frame arrived within the timeout or the grabber is stopped.
+        """
+        timeout = self.read_timeout if timeout is None else timeout
+        with self._condition:
+            if not self._condition.wait_for(
+                    lambda: self._frame_seq > self._last_read_seq or not self._running,
+                    timeout=timeout):
+                return False, None
+            if self._frame_seq <= self._last_read_seq:
+                return False, None  # Stopped while waiting
+            self._last_read_seq = self._frame_seq
+            self.frames_consumed += 1
+            self.last_frame_time = self._frame_time
+            return True, self._frame
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Returns a snapshot of the capture counters.
+
+        Returns:
+            A dictionary with the number of captured, consumed and dropped frames,
+            the number of failed driver reads and the fraction of captured frames
+            that were dropped.
+        """
+        with self._condition:
+            captured = self.frames_captured
+            return {
+                "frames_captured": captured,
+                "frames_consumed": self.frames_consumed,
+                "frames_dropped": self.frames_dropped,
+                "read_failures": self.read_failures,
+                "drop_rate": (self.frames_dropped / captured) if captured else 0.0,
+            }
+
+    def isOpened(self) -> bool:
+        """Returns True while the underlying capture device is open."""
+        return self.capture.isOpened()
+
+    def stop(self):
+        """Stops the capture thread and wakes up any waiting reader."""
+        if not self._running:
+            return
+        with self._condition:
+            self._running = False
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+
+    def release(self):
+        """Stops the capture thread and releases the capture device."""
+        self.stop()
+        self.capture.release()
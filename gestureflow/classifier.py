@@ -1,4 +1,3 @@
-```python
 # -*- coding: utf-8 -*-
 """
 GestureFlow Interface: Hand Gesture Classifier
@@ -6,11 +5,19 @@ GestureFlow Interface: Hand Gesture Classifier
 This module defines the GestureClassifier class responsible for identifying
 predefined hand gestures based on the geometric properties of hand landmarks
 detected by MediaPipe.
+
+Gestures are declared as data (see GestureClassifier.DEFAULT_GESTURE_DEFINITIONS)
+and can be added or overridden from the application config; no Python code is
+needed per gesture.
 """
 
+import itertools
 import math
+import operator
 import numpy as np
-from typing import List, Optional, Any
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from gestureflow.landmarks import NUM_LANDMARKS, as_hand
 
 # --- Project-Level Library Imports ---
 # These libraries are essential for the overall GestureFlow project,
@@ -22,12 +29,156 @@ from typing import List, Optional, Any
 # --- End Project-Level Imports ---
 
 
+class ClassifierThresholds(NamedTuple):
+    """
+    Validated, immutable set of classifier thresholds.
+
+    Field names double as the threshold names usable as bounds in gesture
+    definitions. These values may require tuning based on performance and
+    specific camera setup.
+    """
+
+    # Factor for comparing tip-MCP vs PIP-MCP distance for extension
+    FINGER_EXTEND_FACTOR: float = 1.6
+    # Factor for comparing tip-MCP vs PIP-MCP distance for curling
+    FINGER_CURL_FACTOR: float = 1.0  # Tip closer to MCP than PIP is from MCP implies curl
+    # Max distance factor (tip to wrist / wrist to middle MCP) for fist
+    FIST_MAX_TIP_WRIST_FACTOR: float = 0.6
+    # Min distance factor (thumb tip to index MCP / index MCP to pinky MCP) for thumb abduction in open palm
+    OPEN_PALM_THUMB_ABDUCTION_FACTOR: float = 0.7
+    # Min Y-coord diff factor (tip.y vs mcp.y / wrist-mcp distance) for thumbs up
+    THUMBS_UP_Y_FACTOR: float = -0.1  # Thumb tip should be significantly above MCP (negative Y direction in image coords)
+    # Min Y-coord diff factor for thumbs down (thumb tip significantly below its MCP)
+    THUMBS_DOWN_Y_FACTOR: float = 0.1
+    # Max distance factor for curled fingers in specific gestures (pointing, victory, thumbs up)
+    CURL_MAX_TIP_MCP_FACTOR: float = 1.2  # Allow slightly more tolerance than strict curl
+    # Max distance factor (thumb tip to index tip / index MCP to pinky MCP) for the OK sign touch
+    OK_SIGN_TOUCH_FACTOR: float = 0.35
+    # Max distance factor (index tip to middle tip / index MCP to pinky MCP) for fingers held together
+    # (INDEX_AND_MIDDLE_UP); fingers further apart make VICTORY. Straight, unspread fingers are
+    # about a third of the palm width apart, so only tips pressed together fall below it.
+    FINGERS_TOGETHER_FACTOR: float = 0.25
+    # Margin (palm lengths) over which a constraint's score ramps from 0.5 (on a
+    # threshold) to 0 or 1; see GestureClassifier.classify_batch(). Finger
+    # states ramp over half the band between the curl and extend factors instead.
+    SCORE_SOFTNESS: float = 0.1
+    # With finger state tracking, how far (in the same tip-MCP / PIP-MCP
+    # ratio as the two factors above) a finger must move back past the
+    # threshold that put it into the extended or curled state to leave it
+    FINGER_STATE_HYSTERESIS: float = 0.15
+
+    @classmethod
+    def from_dict(cls, overrides: Optional[dict] = None,
+                  base: Optional['ClassifierThresholds'] = None) -> 'ClassifierThresholds':
+        """
+        Validates threshold overrides and applies them on top of base.
+
+        Args:
+            overrides: Threshold name -> value. Missing names keep the base value.
+            base: The thresholds to start from (defaults if None).
+
+        Raises:
+            ValueError: If a name is unknown or a value is not a finite number.
+        """
+        base = base or cls()
+        overrides = dict(overrides or {})
+        unknown = set(overrides) - set(cls._fields)
+        if unknown:
+            raise ValueError(f"Unknown classifier thresholds: {sorted(unknown)}")
+        for name, value in overrides.items():
+            if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value):
+                raise ValueError(f"Threshold {name} must be a finite number, got {value!r}.")
+            overrides[name] = float(value)
+        if overrides.get("SCORE_SOFTNESS", base.SCORE_SOFTNESS) <= 0.0:
+            raise ValueError("Threshold SCORE_SOFTNESS must be positive.")
+        if overrides.get("FINGER_STATE_HYSTERESIS", base.FINGER_STATE_HYSTERESIS) < 0.0:
+            raise ValueError("Threshold FINGER_STATE_HYSTERESIS must not be negative.")
+        return base._replace(**overrides)
+
+
+class _Ops(NamedTuple):
+    """The comparison and logic operators constraint evaluators are written with."""
+
+    lt: Callable[[Any, Any], Any]
+    le: Callable[[Any, Any], Any]
+    both: Callable[[Any, Any], Any]
+    either: Callable[[Any, Any], Any]
+
+
+# Yes/no decisions: plain comparisons and & / |, on floats or bool arrays.
+_DECIDE = _Ops(operator.lt, operator.le, operator.and_, operator.or_)
+
+
+def _score_ops(softness: float, batch: bool) -> _Ops:
+    """
+    Graded counterparts of _DECIDE, for Python floats or (batch) float arrays.
+
+    a < b scores 0.5 when a == b and ramps linearly to 1 (or 0) once b is
+    softness above (or below) a; NaN scores 0. "both" is the minimum and
+    "either" the maximum, so a score is above 0.5 exactly where the decision
+    is True.
+    """
+    scale = 0.5 / softness
+    if batch:
+        def lt(a, b):
+            return np.fmin(np.fmax(0.5 + (b - a) * scale, 0.0), 1.0)
+        return _Ops(lt, lt, np.fmin, np.fmax)
+
+    def lt(a, b):
+        value = 0.5 + (b - a) * scale
+        return 1.0 if value >= 1.0 else value if value > 0.0 else 0.0  # NaN fails both tests
+    return _Ops(lt, lt, min, max)
+
+
+class _EvaluationPlan:
+    """
+    Everything classify() needs, compiled from one set of thresholds and
+    definitions. Never modified once built, so swapping the classifier's plan
+    reference is atomic for concurrent callers.
+    """
+
+    __slots__ = ('thresholds', 'definitions', 'pair_slots', 'offsets', 'pairs', 'num_pairs',
+                 'offset_rows', 'offset_columns', 'offset_axes', 'hand_offsets',
+                 'extend_factor', 'curl_max_factor',
+                 'gestures', 'gesture_names', 'lookup', 'code_matches', 'batch_constraints',
+                 'excluded_states', 'score_constraints', 'state_exclusions', 'batch_score_constraints',
+                 'state_bands', 'state_ramp', 'code_names')
+
+    def __init__(self, thresholds: ClassifierThresholds, definitions: List[dict]):
+        self.thresholds = thresholds
+        self.definitions = definitions
+
+
 class GestureClassifier:
     """
     Classifies hand gestures based on the spatial arrangement of landmarks.
 
     Uses geometric heuristics (distances, angles, relative positions)
     to distinguish between predefined gestures like FIST, OPEN_PALM, etc.
+
+    Lengths are measured in palm lengths (wrist to middle MCP) straight from
+    the raw landmarks: distances and image-frame offsets only need dividing by
+    the palm length, and hand-frame offsets are rotated by the palm direction,
+    so the rules never build the full normalized hand
+    (gestureflow.landmarks.normalize_landmarks) the learned classifiers use.
+
+    Gesture definitions are compiled once into an evaluation plan:
+        - every landmark distance any definition needs is measured in one
+          vectorized pass per frame, shared by all gestures;
+        - the five finger states are packed into a base-3 state code, and a
+          precomputed table lists the candidate gestures of each code in
+          priority order;
+        - only those candidates' remaining constraints are evaluated, stopping
+          at the first gesture that passes.
+
+    The same definitions also yield graded scores (classify_batch(...,
+    return_scores=True), score()): every comparison becomes a ramp around its
+    threshold, so a score says how clearly a pose passes or fails a rule.
+
+    With track_finger_states, classify() keeps each finger's state from frame
+    to frame (see FingerStateTracker) and answers straight from the finger
+    states whenever they alone decide the gesture, without normalizing or
+    measuring the hand. Such a classifier follows a single hand.
     """
 
     # Define landmark indices for clarity (using MediaPipe Hand convention)
@@ -53,6 +204,14 @@ class GestureClassifier:
     PINKY_DIP = 19
     PINKY_TIP = 20
 
+    # Landmark names usable in gesture definitions
+    LANDMARKS = {name: index for index, name in enumerate((
+        "WRIST", "THUMB_CMC", "THUMB_MCP", "THUMB_IP", "THUMB_TIP",
+        "INDEX_MCP", "INDEX_PIP", "INDEX_DIP", "INDEX_TIP",
+        "MIDDLE_MCP", "MIDDLE_PIP", "MIDDLE_DIP", "MIDDLE_TIP",
+        "RING_MCP", "RING_PIP", "RING_DIP", "RING_TIP",
+        "PINKY_MCP", "PINKY_PIP", "PINKY_DIP", "PINKY_TIP"))}
+
     # Finger definitions for easier iteration
     FINGERS = {
         "THUMB": [THUMB_TIP, THUMB_IP, THUMB_MCP, THUMB_CMC],
@@ -65,124 +224,838 @@ class GestureClassifier:
     FINGER_PIPS = [THUMB_IP, INDEX_PIP, MIDDLE_PIP, RING_PIP, PINKY_PIP] # Note: THUMB_IP is equivalent PIP for thumb
     FINGER_MCPS = [THUMB_MCP, INDEX_MCP, MIDDLE_MCP, RING_MCP, PINKY_MCP]
 
-    def __init__(self, thresholds: Optional[dict] = None):
+    # Landmark pairs that are always measured (finger states and the built-in
+    # checks rely on them). The D_* constants are the slots of each group in
+    # the measurement vector; pairs needed by gesture constraints follow them.
+    D_TIP_MCP = 0        # 5 slots: fingertip to MCP, thumb first
+    D_PIP_MCP = 5        # 5 slots: PIP (thumb: IP) to MCP
+    D_TIP_WRIST = 10     # 4 slots: index..pinky tip to wrist
+    D_PALM_LENGTH = 14   # Wrist to middle MCP, the reference hand size
+    D_PALM_WIDTH = 15    # Index MCP to pinky MCP
+    _BASE_PAIRS = list(zip(FINGER_TIPS + FINGER_PIPS + FINGER_TIPS[1:] + [WRIST, INDEX_MCP],
+                           FINGER_MCPS + FINGER_MCPS + [WRIST] * 4 + [MIDDLE_MCP, PINKY_MCP]))
+    # Reference lengths constraints can be relative to
+    REFERENCE_LENGTHS = {"palm_length": D_PALM_LENGTH, "palm_width": D_PALM_WIDTH}
+    _AXES = {"x": 0, "y": 1, "z": 2}
+    _SUM_XYZ = np.ones(3)
+
+    # Per-finger states. A hand's state code packs them as base-3 digits,
+    # thumb first: code = sum(state[finger] * 3 ** finger).
+    CURLED, UNCERTAIN, EXTENDED = 0, 1, 2
+    NUM_STATE_CODES = 3 ** 5
+    FINGER_NAMES = ("thumb", "index", "middle", "ring", "pinky")
+    _STATE_LETTERS = {"C": (CURLED,), "U": (UNCERTAIN,), "E": (EXTENDED,), "*": (CURLED, UNCERTAIN, EXTENDED)}
+    _STATE_WEIGHTS = 3 ** np.arange(5)
+
+    # Built-in gestures, in priority order. Each definition has:
+    #   name:        The gesture name reported by classify().
+    #   fingers:     Allowed states per finger, as letters: E extended,
+    #                C curled, U uncertain, * any (the default for omitted fingers).
+    #   constraints: Further conditions, all of which must hold:
+    #       {"distance": [A, B], "min"/"max": v, "relative_to": R}
+    #           Distance between landmarks A and B.
+    #       {"angle": [A, B, C], "min"/"max": degrees}
+    #           Angle at landmark B between B->A and B->C.
+    #       {"offset": [A, B], "axis": "x"|"y"|"z", "frame": "hand"|"image", "min"/"max": v, "relative_to": R}
+    #           Coordinate of B minus that of A along an axis, i.e. the
+    #           direction a bone points in. In the "hand" frame (default) -y
+    #           points from the wrist towards the fingers whatever the hand's
+    #           rotation; in the "image" frame y grows downwards on screen.
+    #       {"check": name}
+    #           A built-in compound test (_check_<name>).
+    #     Lengths are in palm lengths (wrist to middle MCP). Bounds are
+    #     exclusive and may be numbers or threshold names. R is "palm_length",
+    #     "palm_width" or a landmark pair [A, B]; bounds are then multiples of
+    #     that length.
+    # THUMBS_UP, THUMBS_DOWN and POINTING_UP are about the direction on screen
+    # (thumbs up and down only differ by a rotation), so they use the image frame.
+    # Config entries with the same name replace a built-in definition;
+    # {"name": ..., "enabled": false} removes it.
+    DEFAULT_GESTURE_DEFINITIONS = (
+        {"name": "FIST",
+         "fingers": {"thumb": "CU", "index": "CU", "middle": "CU", "ring": "CU", "pinky": "CU"},
+         "constraints": [{"check": "closed_hand"}]},
+        {"name": "OPEN_PALM",
+         "fingers": {"thumb": "E", "index": "E", "middle": "E", "ring": "E", "pinky": "E"},
+         "constraints": [{"distance": ["THUMB_TIP", "INDEX_MCP"], "relative_to": "palm_width",
+                          "min": "OPEN_PALM_THUMB_ABDUCTION_FACTOR"}]},
+        {"name": "THUMBS_UP",
+         "fingers": {"thumb": "E", "index": "C", "middle": "C", "ring": "C", "pinky": "C"},
+         "constraints": [{"offset": ["THUMB_MCP", "THUMB_TIP"], "axis": "y", "frame": "image",
+                          "relative_to": "palm_length",
+                          "max": "THUMBS_UP_Y_FACTOR"}]},
+        {"name": "THUMBS_DOWN",
+         "fingers": {"thumb": "E", "index": "C", "middle": "C", "ring": "C", "pinky": "C"},
+         "constraints": [{"offset": ["THUMB_MCP", "THUMB_TIP"], "axis": "y", "frame": "image",
+                          "relative_to": "palm_length",
+                          "min": "THUMBS_DOWN_Y_FACTOR"}]},
+        {"name": "POINTING_UP",
+         "fingers": {"index": "E", "middle": "C", "ring": "C", "pinky": "C"},
+         "constraints": [{"offset": ["INDEX_MCP", "INDEX_TIP"], "axis": "y", "frame": "image", "max": 0.0}]},
+        {"name": "VICTORY",
+         "fingers": {"index": "E", "middle": "E", "ring": "C", "pinky": "C"},
+         "constraints": [{"distance": ["INDEX_TIP", "MIDDLE_TIP"], "relative_to": "palm_width",
+                          "min": "FINGERS_TOGETHER_FACTOR"}]},
+        {"name": "INDEX_AND_MIDDLE_UP",
+         "fingers": {"index": "E", "middle": "E", "ring": "C", "pinky": "C"},
+         "constraints": [{"distance": ["INDEX_TIP", "MIDDLE_TIP"], "relative_to": "palm_width",
+                          "max": "FINGERS_TOGETHER_FACTOR"}]},
+        {"name": "THREE_FINGERS_UP",
+         "fingers": {"thumb": "CU", "index": "E", "middle": "E", "ring": "E", "pinky": "C"}},
+        {"name": "SPIDERMAN",
+         "fingers": {"thumb": "E", "index": "E", "middle": "C", "ring": "C", "pinky": "E"}},
+        {"name": "ROCK",
+         "fingers": {"thumb": "CU", "index": "E", "middle": "C", "ring": "C", "pinky": "E"}},
+        {"name": "CALL_ME",
+         "fingers": {"thumb": "E", "index": "C", "middle": "C", "ring": "C", "pinky": "E"}},
+        {"name": "OK_SIGN",
+         "fingers": {"index": "CU", "middle": "E", "ring": "E", "pinky": "E"},
+         "constraints": [{"distance": ["THUMB_TIP", "INDEX_TIP"], "relative_to": "palm_width",
+                          "max": "OK_SIGN_TOUCH_FACTOR"}]},
+    )
+
+    # Landmark pairs finger state tracking measures on the raw landmarks: the
+    # first halves of D_TIP_MCP, D_PIP_MCP and D_PALM_LENGTH, then the second halves
+    _TRACKED_PAIRS = np.array(FINGER_TIPS + FINGER_PIPS + [WRIST] + FINGER_MCPS + FINGER_MCPS + [MIDDLE_MCP],
+                              dtype=np.intp)
+
+    # Poses per classify_batch() step; bounds the temporary arrays to a few MB.
+    _BATCH_CHUNK = 16384
+
+    def __init__(self, thresholds: Optional[dict] = None, definitions: Optional[Sequence[dict]] = None,
+                 track_finger_states: bool = False):
         """
         Initializes the GestureClassifier.
 
         Args:
             thresholds (Optional[dict]): A dictionary to override default
-                                         detection thresholds. If None, defaults
-                                         are used.
-        """
-        self.thresholds = thresholds if thresholds else self._default_thresholds()
-        # Pre-calculate or store any static data if needed
-
-    def _default_thresholds(self) -> dict:
-        """
-        Defines default thresholds for various gesture detection heuristics.
-        These values may require tuning based on performance and specific camera setup.
-        """
-        return {
-            # Factor for comparing tip-MCP vs PIP-MCP distance for extension
-            "FINGER_EXTEND_FACTOR": 1.6,
-            # Factor for comparing tip-MCP vs PIP-MCP distance for curling
-            "FINGER_CURL_FACTOR": 1.0, # Tip closer to MCP than PIP is from MCP implies curl
-             # Max distance factor (tip to wrist / wrist to middle MCP) for fist
-            "FIST_MAX_TIP_WRIST_FACTOR": 0.6,
-            # Min distance factor (thumb tip to index MCP / index MCP to pinky MCP) for thumb abduction in open palm
-            "OPEN_PALM_THUMB_ABDUCTION_FACTOR": 0.7,
-            # Min Y-coord diff factor (tip.y vs mcp.y / wrist-mcp distance) for thumbs up
-            "THUMBS_UP_Y_FACTOR": -0.1, # Thumb tip should be significantly above MCP (negative Y direction in image coords)
-            # Max distance factor for curled fingers in specific gestures (pointing, victory, thumbs up)
-            "CURL_MAX_TIP_MCP_FACTOR": 1.2, # Allow slightly more tolerance than strict curl
-        }
-
-    def _get_landmark(self, landmarks: List[Any], index: int) -> Optional[Any]:
-        """Safely retrieves a landmark object by its index."""
-        if landmarks and 0 <= index < len(landmarks):
-            # Assuming landmarks are objects with x, y, z attributes
-            if hasattr(landmarks[index], 'x') and \
-               hasattr(landmarks[index], 'y') and \
-               hasattr(landmarks[index], 'z'):
-                return landmarks[index]
-        return None
-
-    def _calculate_distance(self, p1: Any, p2: Any) -> float:
-        """
-        Calculates the Euclidean distance between two landmark points.
-        Assumes landmarks have 'x', 'y', 'z' attributes.
-        Returns float('inf') if either point is invalid.
-        """
-        if p1 is None or p2 is None:
-            return float('inf')
-        try:
-            return math.sqrt((p1.x - p2.x)**2 + (p1.y - p2.y)**2 + (p1.z - p2.z)**2)
-        except AttributeError:
-            # Handle cases where landmarks might not have x, y, z (e.g., visibility check failed)
-            return float('inf')
-        except Exception as e:
-            print(f"Error calculating distance: {e}")
-            return float('inf')
-
-    def _is_finger_extended(self, landmarks: List[Any], tip_idx: int, pip_idx: int, mcp_idx: int) -> bool:
-        """
-        Checks if a finger is extended based on relative distances.
-        Compares distance from tip to MCP vs distance from PIP to MCP.
-        """
-        tip = self._get_landmark(landmarks, tip_idx)
-        pip = self._get_landmark(landmarks, pip_idx)
-        mcp = self._get_landmark(landmarks, mcp_idx)
-
-        if not all([tip, pip, mcp]):
-            return False # Cannot determine state if landmarks are missing
-
-        dist_tip_mcp = self._calculate_distance(tip, mcp)
-        dist_pip_mcp = self._calculate_distance(pip, mcp)
-
-        # Avoid division by zero or near-zero, indicates unreliable landmark data
-        if dist_pip_mcp < 1e-6:
-            return False
-
-        # Finger is extended if the tip is significantly farther from the MCP than the PIP is.
-        extend_factor = self.thresholds.get("FINGER_EXTEND_FACTOR", 1.6)
-        return (dist_tip_mcp / dist_pip_mcp) > extend_factor
-
-    def _is_finger_curled(self, landmarks: List[Any], tip_idx: int, pip_idx: int, mcp_idx: int) -> bool:
-        """
-        Checks if a finger is curled based on relative distances.
-        Compares distance from tip to MCP vs distance from PIP to MCP.
-        """
-        tip = self._get_landmark(landmarks, tip_idx)
-        pip = self._get_landmark(landmarks, pip_idx)
-        mcp = self._get_landmark(landmarks, mcp_idx)
-
-        if not all([tip, pip, mcp]):
-            return False # Cannot determine state
-
-        dist_tip_mcp = self._calculate_distance(tip, mcp)
-        dist_pip_mcp = self._calculate_distance(pip, mcp)
-
-        if dist_pip_mcp < 1e-6:
-            # If PIP and MCP are very close, check if tip is also very close
-            return dist_tip_mcp < 0.05 # Use a small absolute threshold (needs tuning)
-
-        # Finger is curled if the tip is closer to the MCP than the PIP is (or not significantly farther).
-        curl_factor = self.thresholds.get("FINGER_CURL_FACTOR", 1.0)
-        return (dist_tip_mcp / dist_pip_mcp) < curl_factor
-
-    # --- Specific Gesture Logic ---
-
-    def _is_fist(self, landmarks: List[Any]) -> bool:
-        """Checks if the hand configuration resembles a fist."""
-        wrist = self._get_landmark(landmarks, self.WRIST)
-        middle_mcp = self._get_landmark(landmarks, self.MIDDLE_MCP)
-        if not wrist or not middle_mcp: return False
-
-        # Reference distance: wrist to middle finger MCP
-        ref_dist = self._calculate_distance(wrist, middle_mcp)
-        if ref_dist < 1e-6: return False # Avoid division by zero
-
-        # Check if all non-thumb fingertips are close to the wrist/palm center
-        max_dist_factor = self.thresholds.get("FIST_MAX_TIP_WRIST_FACTOR", 0.6)
-        all_fingers_close = True
-        for tip_idx in [self.INDEX
\ No newline at end of file
+                                         detection thresholds (see
+                                         ClassifierThresholds). If None,
+                                         defaults are used.
+            definitions (Optional[Sequence[dict]]): Gesture definitions (see
+                                         DEFAULT_GESTURE_DEFINITIONS) that add
+                                         to or replace the built-in ones.
+            track_finger_states (bool): Make classify() stateful: finger
+                                         states change with hysteresis (see
+                                         FingerStateTracker). Use one
+                                         classifier per tracked hand.
+
+        Raises:
+            ValueError: If a threshold is unknown or not a number, or a gesture
+                        definition is malformed.
+        """
+        self._plan = self._compile(ClassifierThresholds.from_dict(thresholds),
+                                   self._merge_definitions(definitions or []))
+        self.tracker = FingerStateTracker() if track_finger_states else None
+
+    @property
+    def thresholds(self) -> ClassifierThresholds:
+        """The thresholds the current plan was compiled with."""
+        return self._plan.thresholds
+
+    @property
+    def definitions(self) -> List[dict]:
+        """The merged gesture definitions, in priority order."""
+        return self._plan.definitions
+
+    @property
+    def gestures(self) -> Tuple[str, ...]:
+        """All gesture names classify() can return, "UNKNOWN" first."""
+        return self._plan.gestures
+
+    def set_thresholds(self, thresholds: dict):
+        """
+        Changes thresholds at runtime, e.g. from a tuning UI.
+
+        The new plan is compiled on the side and swapped in with a single
+        reference assignment, so classify() calls running on other threads
+        see either the old thresholds or the new ones, never a mix.
+
+        Args:
+            thresholds: Threshold name -> value; names not given keep their
+                        current value.
+
+        Raises:
+            ValueError: If a threshold is unknown or not a number. The current
+                        thresholds stay in effect.
+        """
+        plan = self._plan
+        self._plan = self._compile(ClassifierThresholds.from_dict(thresholds, base=plan.thresholds),
+                                   plan.definitions)
+
+    def _merge_definitions(self, definitions: Sequence[dict]) -> List[dict]:
+        """Applies config definitions on top of the built-in ones, keeping priority order."""
+        merged = {definition["name"]: definition for definition in self.DEFAULT_GESTURE_DEFINITIONS}
+        for definition in definitions:
+            if "name" not in definition:
+                raise ValueError(f"Gesture definition without a name: {definition!r}")
+            if definition.get("enabled", True):
+                merged[definition["name"]] = definition  # Replaces in place or appends
+            else:
+                merged.pop(definition["name"], None)
+        return list(merged.values())
+
+    # --- Plan compilation ---
+
+    def _compile(self, thresholds: ClassifierThresholds, definitions: List[dict]) -> _EvaluationPlan:
+        """
+        Compiles thresholds and definitions into the evaluation plan used by
+        classify() and classify_batch().
+
+        Raises:
+            ValueError: If a definition uses an unknown landmark, finger,
+                        state letter, check, axis or threshold.
+        """
+        plan = _EvaluationPlan(thresholds, definitions)
+        plan.pair_slots = {pair: slot for slot, pair in enumerate(self._BASE_PAIRS)}
+        plan.offsets = []  # (pair slot, axis, in image frame) of each offset measurement
+        parsed = [(definition["name"], self._allowed_states(definition),
+                   [self._parse_constraint(plan, definition["name"], spec)
+                    for spec in definition.get("constraints", [])])
+                  for definition in definitions]
+
+        # Distances first, then offsets: the measurement vector m is their concatenation.
+        plan.num_pairs = len(plan.pair_slots)
+        pairs = sorted(plan.pair_slots, key=plan.pair_slots.get)
+        plan.pairs = np.array([a for a, _ in pairs] + [b for _, b in pairs], dtype=np.intp)
+        plan.offset_rows = np.array([slot for slot, _, _ in plan.offsets], dtype=np.intp)
+        plan.offset_columns = np.arange(len(plan.offsets))
+        plan.offset_axes = np.array([axis + 3 * (not in_image) for _, axis, in_image in plan.offsets],
+                                    dtype=np.intp)
+        plan.hand_offsets = not all(in_image for _, _, in_image in plan.offsets)
+
+        plan.extend_factor = thresholds.FINGER_EXTEND_FACTOR
+        plan.curl_max_factor = thresholds.CURL_MAX_TIP_MCP_FACTOR
+        # Per finger (thumb first): (extend enter, extend exit, curl enter, curl exit) factors
+        hysteresis = thresholds.FINGER_STATE_HYSTERESIS
+        plan.state_bands = [(plan.extend_factor, plan.extend_factor - hysteresis,
+                             plan.curl_max_factor, plan.curl_max_factor + hysteresis)] * 5
+        # Scoring: finger state memberships ramp over half the uncertain band
+        # (in tip-MCP / PIP-MCP ratio), so a finger in the middle of the band
+        # is fully uncertain and one past the far edge fully curled or extended.
+        plan.state_ramp = 0.5 / max((plan.extend_factor - plan.curl_max_factor) / 2.0, 0.05)
+
+        plan.gestures = ("UNKNOWN",) + tuple(name for name, _, _ in parsed)
+        plan.gesture_names = np.array(plan.gestures)
+        lookup = [[] for _ in range(self.NUM_STATE_CODES)]
+        code_matches = np.zeros((self.NUM_STATE_CODES, len(plan.gestures)), dtype=bool)
+        # Finger states each gesture rules out, for scoring: (gesture, finger, state)
+        state_exclusions = np.ones((len(parsed), 5, 3), dtype=bool)
+        score_ops = _score_ops(thresholds.SCORE_SOFTNESS, batch=False)
+        batch_score_ops = _score_ops(thresholds.SCORE_SOFTNESS, batch=True)
+        # Identical constraints are built once: key -> (decision, score, batch score, gesture columns)
+        constraints: Dict[tuple, Tuple[Callable, Callable, Callable, List[int]]] = {}
+        for column, (name, allowed, keys) in enumerate(parsed, start=1):
+            compiled = []
+            for key in keys:
+                if key not in constraints:
+                    constraints[key] = (self._build_constraint(plan, key, _DECIDE),
+                                        self._build_constraint(plan, key, score_ops),
+                                        self._build_constraint(plan, key, batch_score_ops), [])
+                constraints[key][3].append(column)
+                compiled.append(constraints[key][0])
+            compiled = tuple(compiled)
+            for combination in itertools.product(*allowed):
+                code = int(np.dot(combination, self._STATE_WEIGHTS))
+                lookup[code].append((name, compiled))
+                code_matches[code, column] = True
+            for finger, states in enumerate(allowed):
+                state_exclusions[column - 1, finger, states] = False
+
+        plan.lookup = [tuple(candidates) for candidates in lookup]
+        # The gesture of each state code when its top candidate has no constraints, else None
+        plan.code_names = [candidates[0][0] if candidates and not candidates[0][1] else
+                           None if candidates else "UNKNOWN" for candidates in plan.lookup]
+        plan.code_matches = code_matches
+        plan.batch_constraints = [(decide, columns) for decide, _, _, columns in constraints.values()]
+        plan.excluded_states = [np.flatnonzero(excluded).tolist() for excluded in state_exclusions]
+        plan.score_constraints = [(score, columns) for _, score, _, columns in constraints.values()]
+        plan.state_exclusions = state_exclusions
+        plan.batch_score_constraints = [(score, np.subtract(columns, 1))
+                                        for _, _, score, columns in constraints.values()]
+        return plan
+
+    def _allowed_states(self, definition: dict) -> List[List[int]]:
+        """Returns the allowed state values of each finger, thumb first."""
+        fingers = {finger.lower(): letters for finger, letters in definition.get("fingers", {}).items()}
+        unknown = set(fingers) - set(self.FINGER_NAMES)
+        if unknown:
+            raise ValueError(f"Gesture '{definition['name']}' uses unknown fingers {sorted(unknown)}.")
+        allowed = []
+        for finger in self.FINGER_NAMES:
+            letters = fingers.get(finger, "*").upper()
+            try:
+                allowed.append(sorted({state for letter in letters for state in self._STATE_LETTERS[letter]}))
+            except KeyError as e:
+                raise ValueError(f"Gesture '{definition['name']}' uses unknown finger state {e}.") from None
+        return allowed
+
+    def _landmark(self, gesture: str, name: Any) -> int:
+        """Resolves a landmark name (or index) from a definition."""
+        if isinstance(name, int) and 0 <= name < NUM_LANDMARKS:
+            return name
+        if isinstance(name, str) and name.upper() in self.LANDMARKS:
+            return self.LANDMARKS[name.upper()]
+        raise ValueError(f"Gesture '{gesture}' uses unknown landmark {name!r}.")
+
+    def _pair_slot(self, plan: _EvaluationPlan, a: int, b: int, ordered: bool = False) -> int:
+        """Returns the measurement slot of landmark pair (a, b), adding it if new."""
+        if (a, b) in plan.pair_slots:
+            return plan.pair_slots[(a, b)]
+        if not ordered and (b, a) in plan.pair_slots:
+            return plan.pair_slots[(b, a)]  # Distances are symmetric
+        plan.pair_slots[(a, b)] = len(plan.pair_slots)
+        return plan.pair_slots[(a, b)]
+
+    def _bound(self, plan: _EvaluationPlan, gesture: str, value: Any) -> Optional[float]:
+        """Resolves a constraint bound: a number, a threshold name or None."""
+        if value is None or isinstance(value, (int, float)):
+            return value
+        if value in plan.thresholds._fields:
+            return getattr(plan.thresholds, value)
+        raise ValueError(f"Gesture '{gesture}' uses unknown threshold {value!r}.")
+
+    def _parse_constraint(self, plan: _EvaluationPlan, gesture: str, spec: dict) -> tuple:
+        """
+        Turns one constraint spec into a hashable key describing what to measure.
+
+        Measurement references are ("d", pair slot) for distances and
+        ("o", offset index) for offsets; _build_constraint() maps them to final
+        positions once all pairs are known.
+        """
+        if "check" in spec:
+            if not hasattr(self, f"_check_{spec['check']}"):
+                raise ValueError(f"Gesture '{gesture}' uses unknown check '{spec['check']}'.")
+            return ("check", spec["check"])
+        lower, upper = self._bound(plan, gesture, spec.get("min")), self._bound(plan, gesture, spec.get("max"))
+        if lower is None and upper is None:
+            raise ValueError(f"Gesture '{gesture}' has a constraint without min or max: {spec!r}")
+
+        reference = spec.get("relative_to")
+        if reference is not None:
+            if isinstance(reference, str):
+                if reference not in self.REFERENCE_LENGTHS:
+                    raise ValueError(f"Gesture '{gesture}' uses unknown reference length '{reference}'.")
+                reference = ("d", self.REFERENCE_LENGTHS[reference])
+            else:
+                reference = ("d", self._pair_slot(plan, *(self._landmark(gesture, lm) for lm in reference)))
+            if reference == ("d", self.D_PALM_LENGTH):
+                reference = None  # Normalized lengths are already in palm lengths
+
+        if "distance" in spec:
+            a, b = (self._landmark(gesture, lm) for lm in spec["distance"])
+            return ("range", ("d", self._pair_slot(plan, a, b)), lower, upper, reference)
+        if "offset" in spec:
+            a, b = (self._landmark(gesture, lm) for lm in spec["offset"])
+            axis, frame = spec.get("axis", "y"), spec.get("frame", "hand")
+            if axis not in self._AXES:
+                raise ValueError(f"Gesture '{gesture}' uses unknown axis {axis!r}.")
+            if frame not in ("hand", "image"):
+                raise ValueError(f"Gesture '{gesture}' uses unknown frame {frame!r}.")
+            # A pair's row in the kernel is first minus second, so B - A is pair (B, A).
+            offset = (self._pair_slot(plan, b, a, ordered=True), self._AXES[axis], frame == "image")
+            if offset not in plan.offsets:
+                plan.offsets.append(offset)
+            return ("range", ("o", plan.offsets.index(offset)), lower, upper, reference)
+        if "angle" in spec:
+            a, b, c = (self._landmark(gesture, lm) for lm in spec["angle"])
+            sides = (self._pair_slot(plan, a, b), self._pair_slot(plan, c, b), self._pair_slot(plan, a, c))
+            # A larger angle means a smaller cosine, so the bounds swap.
+            cos_lower = None if upper is None else math.cos(math.radians(upper))
+            cos_upper = None if lower is None else math.cos(math.radians(lower))
+            return ("angle", sides, cos_lower, cos_upper)
+        raise ValueError(f"Gesture '{gesture}' has an unknown constraint type: {spec!r}")
+
+    def _build_constraint(self, plan: _EvaluationPlan, key: tuple, ops: _Ops) -> Callable[[Any], Any]:
+        """
+        Builds the evaluator for a parsed constraint.
+
+        Evaluators receive the measurement vector m either as a list of floats
+        (one hand) or as the rows of a (slots, N) array (a batch), so they stick
+        to arithmetic and the operators in ops. With _DECIDE that keeps
+        classify() and classify_batch() on the very same expressions; with
+        _score_ops() the same evaluator grades the pose instead. Validity
+        guards (degenerate lengths) stay plain comparisons either way.
+        """
+        def slot(ref):
+            kind, index = ref
+            return index if kind == "d" else plan.num_pairs + index
+
+        lt, both = ops.lt, ops.both
+        if key[0] == "check":
+            return getattr(self, f"_check_{key[1]}")(plan.thresholds, ops)
+        if key[0] == "angle":
+            # Law of cosines on the three side lengths, multiplied out so a
+            # degenerate (zero-length) side simply fails the test.
+            (ab, cb, ac), cos_lower, cos_upper = key[1], key[2], key[3]
+
+            def angle(m):
+                two_sides = 2.0 * m[ab] * m[cb]
+                cos_numerator = m[ab] * m[ab] + m[cb] * m[cb] - m[ac] * m[ac]
+                result = two_sides > 1e-12
+                if cos_lower is not None:
+                    result = both(result, lt(cos_lower * two_sides, cos_numerator))
+                if cos_upper is not None:
+                    result = both(result, lt(cos_numerator, cos_upper * two_sides))
+                return result
+            return angle
+
+        _, value_ref, lower, upper, reference = key
+        value = slot(value_ref)
+        if reference is None:
+            if upper is None:
+                return lambda m: lt(lower, m[value])
+            if lower is None:
+                return lambda m: lt(m[value], upper)
+            return lambda m: both(lt(lower, m[value]), lt(m[value], upper))
+        ref = slot(reference)
+        if upper is None:
+            return lambda m: both(m[ref] >= 1e-6, lt(lower * m[ref], m[value]))
+        if lower is None:
+            return lambda m: both(m[ref] >= 1e-6, lt(m[value], upper * m[ref]))
+        return lambda m: both(both(m[ref] >= 1e-6, lt(lower * m[ref], m[value])), lt(m[value], upper * m[ref]))
+
+    # --- Built-in checks ---
+    # Each _check_<name> returns an evaluator (see _build_constraint) for
+    # conditions that do not fit a single distance, angle or offset bound.
+
+    def _check_closed_hand(self, thresholds: ClassifierThresholds, ops: _Ops) -> Callable[[Any], Any]:
+        """All four fingertips pulled in to the wrist, or all four fingers tightly curled."""
+        max_dist_factor = thresholds.FIST_MAX_TIP_WRIST_FACTOR
+        curl_factor = thresholds.FINGER_CURL_FACTOR
+        tip_wrist_slots = range(self.D_TIP_WRIST, self.D_TIP_WRIST + 4)
+        finger_slots = [(self.D_TIP_MCP + finger, self.D_PIP_MCP + finger) for finger in range(1, 5)]
+
+        lt, le, both, either = ops
+
+        def closed_hand(m):
+            close = curled = True
+            for tip_wrist in tip_wrist_slots:
+                close = both(close, le(m[tip_wrist], max_dist_factor))  # In palm lengths
+            for tip_slot, pip_slot in finger_slots:
+                tip_mcp, pip_mcp = m[tip_slot], m[pip_slot]
+                # With unreliable PIP/MCP landmarks only a tip close to the joint
+                # (a quarter palm length) counts as curled.
+                curled = both(curled, either(both(pip_mcp >= 1e-6, lt(tip_mcp, curl_factor * pip_mcp)),
+                                             both(pip_mcp < 1e-6, lt(tip_mcp, 0.25))))
+            # Degenerate hands are all NaN and fail every comparison.
+            return either(close, curled)
+        return closed_hand
+
+    # --- Evaluation ---
+
+    def _measure(self, plan: _EvaluationPlan, points: np.ndarray):
+        """
+        Computes every landmark distance and offset the plan needs for a stack
+        of hands in one vectorized pass (see _measurements() for one hand).
+
+        Args:
+            points: (N, 21, 3) raw landmarks.
+
+        Returns:
+            A tuple (distances, offsets) of float64 arrays in palm lengths:
+            (N, pairs) distances, one per measured landmark pair (see the D_*
+            slots), and (N, offsets) axis offsets used by offset constraints.
+            Rows are NaN for hands that normalize_landmarks would reject (no
+            usable palm length).
+        """
+        gathered = points.take(plan.pairs, axis=-2)
+        diff = gathered[:, :plan.num_pairs, :] - gathered[:, plan.num_pairs:, :]
+        # Summing the squared components with a float64 matmul is the cheapest
+        # way to get float64 distances out of the float32 landmarks.
+        distances = np.sqrt(np.square(diff) @ self._SUM_XYZ)
+        palm_length = distances[:, self.D_PALM_LENGTH]
+        palm = diff[:, self.D_PALM_LENGTH, :2].astype(np.float64)  # Wrist minus middle MCP
+        planar_length = np.sqrt(np.square(palm) @ self._SUM_XYZ[:2])
+        valid = (planar_length >= 1e-6) & (palm_length >= 1e-6) & np.isfinite(palm_length)
+        palm_length = np.where(valid, palm_length, np.nan)[:, None]
+        if plan.hand_offsets:
+            with np.errstate(divide='ignore', invalid='ignore'):
+                direction = -palm / planar_length[:, None]
+            vectors = diff[:, plan.offset_rows, :] @ self._both_frames(direction[:, 0], direction[:, 1])
+            offsets = vectors[:, plan.offset_columns, plan.offset_axes]
+        else:
+            offsets = diff[:, plan.offset_rows, plan.offset_axes].astype(np.float64)
+        return distances / palm_length, offsets / palm_length
+
+    @staticmethod
+    def _both_frames(ux: Any, uy: Any) -> np.ndarray:
+        """
+        (3, 6) or (N, 3, 6) matrix [identity | rotation into the hand frame]
+        for the unit palm direction (ux, uy), see normalize_landmarks.
+        """
+        if np.ndim(ux) == 0:
+            return np.array([[1.0, 0.0, 0.0, -uy, -ux, 0.0],
+                             [0.0, 1.0, 0.0, ux, -uy, 0.0],
+                             [0.0, 0.0, 1.0, 0.0, 0.0, 1.0]])
+        matrix = np.zeros(np.shape(ux) + (3, 6))
+        matrix[..., [0, 1, 2, 2], [0, 1, 2, 5]] = 1.0
+        matrix[..., 0, 3], matrix[..., 0, 4] = -uy, -ux
+        matrix[..., 1, 3], matrix[..., 1, 4] = ux, -uy
+        return matrix
+
+    def _state_code(self, plan: _EvaluationPlan, m: List[float]) -> int:
+        """
+        Packs the five finger states of one hand into its base-3 state code.
+
+        A finger is extended if its tip is much farther from the MCP joint than
+        the PIP joint is, curled if it is not much farther, and uncertain in
+        between or when the landmarks are degenerate. The thumb's IP joint plays
+        the role of the PIP joint.
+        """
+        extend_factor = plan.extend_factor
+        curl_max_factor = plan.curl_max_factor
+        code = 0
+        weight = 1
+        for tip_mcp, pip_mcp in zip(m[self.D_TIP_MCP:self.D_TIP_MCP + 5], m[self.D_PIP_MCP:self.D_PIP_MCP + 5]):
+            if pip_mcp >= 1e-6 and tip_mcp > extend_factor * pip_mcp:
+                code += self.EXTENDED * weight
+            elif not (pip_mcp >= 1e-6 and tip_mcp < curl_max_factor * pip_mcp):
+                code += self.UNCERTAIN * weight
+            weight *= 3
+        return code
+
+    def _state_codes(self, plan: _EvaluationPlan, d: np.ndarray) -> np.ndarray:
+        """Vectorized _state_code() for an (N, slots) distance array."""
+        tip_mcp = d[:, self.D_TIP_MCP:self.D_TIP_MCP + 5]
+        pip_mcp = d[:, self.D_PIP_MCP:self.D_PIP_MCP + 5]
+        valid = pip_mcp >= 1e-6
+        states = np.where(
+            valid & (tip_mcp > plan.extend_factor * pip_mcp), self.EXTENDED,
+            np.where(valid & (tip_mcp < plan.curl_max_factor * pip_mcp), self.CURLED, self.UNCERTAIN))
+        return states @ self._STATE_WEIGHTS
+
+    def _score(self, plan: _EvaluationPlan, m: List[float], states: Optional[List[int]] = None) -> List[float]:
+        """
+        Graded counterpart of the gesture lookup for one hand: the score of
+        every gesture, UNKNOWN first (see classify_batch()).
+
+        Each finger gets a curled, an uncertain (neither) and an extended
+        membership; a gesture's finger score is one minus the strongest
+        membership in a state it rules out. A gesture then scores as well as
+        its weakest rule: the fingers or any constraint.
+
+        With the tracked finger states (FingerStateTracker.states), a finger
+        held in a state by hysteresis is scored against the threshold it
+        would have to cross to leave it, as the tracked decision is.
+        """
+        memberships = []  # finger * 3 + state
+        for finger, (tip_mcp, pip_mcp) in enumerate(zip(m[self.D_TIP_MCP:self.D_TIP_MCP + 5],
+                                                        m[self.D_PIP_MCP:self.D_PIP_MCP + 5])):
+            extended = curled = 0.0
+            if pip_mcp >= 1e-6:
+                extend_factor, extend_exit, curl_factor, curl_exit = plan.state_bands[finger]
+                if states is not None:
+                    if states[finger] == self.EXTENDED:
+                        extend_factor = extend_exit
+                    elif states[finger] == self.CURLED:
+                        curl_factor = curl_exit
+                scale = plan.state_ramp / pip_mcp
+                extended = 0.5 + (tip_mcp - extend_factor * pip_mcp) * scale
+                extended = 1.0 if extended >= 1.0 else extended if extended > 0.0 else 0.0
+                curled = 0.5 + (curl_factor * pip_mcp - tip_mcp) * scale
+                curled = 1.0 if curled >= 1.0 else curled if curled > 0.0 else 0.0
+            memberships += [curled, 1.0 - max(extended, curled), extended]
+        scores = [0.0] + [1.0 - max([memberships[index] for index in excluded], default=0.0)
+                          for excluded in plan.excluded_states]
+        for constraint, columns in plan.score_constraints:
+            value = float(constraint(m))
+            for column in columns:
+                scores[column] = min(scores[column], value)
+        scores[0] = 1.0 - max(scores[1:], default=0.0)
+        return scores
+
+    def _finger_scores(self, plan: _EvaluationPlan, d: np.ndarray) -> np.ndarray:
+        """Vectorized finger part of _score() for an (N, slots) distance array, UNKNOWN excluded."""
+        tip_mcp = d[:, self.D_TIP_MCP:self.D_TIP_MCP + 5]
+        pip_mcp = d[:, self.D_PIP_MCP:self.D_PIP_MCP + 5]
+        valid = pip_mcp >= 1e-6
+        with np.errstate(divide='ignore', invalid='ignore'):
+            scale = plan.state_ramp / pip_mcp
+        extended = np.where(valid, np.fmin(np.fmax(0.5 + (tip_mcp - plan.extend_factor * pip_mcp) * scale, 0.0), 1.0), 0.0)
+        curled = np.where(valid, np.fmin(np.fmax(0.5 + (plan.curl_max_factor * pip_mcp - tip_mcp) * scale, 0.0), 1.0), 0.0)
+        memberships = np.stack((curled, 1.0 - np.fmax(extended, curled), extended), axis=-1)  # By state value
+        return 1.0 - (memberships[:, None] * plan.state_exclusions).max(axis=(2, 3))
+
+    def _match_batch(self, plan: _EvaluationPlan, points: np.ndarray,
+                     scores: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Evaluates every gesture definition for a stack of hands with broadcasting.
+
+        Uses the same distance kernel, state-code rules and constraint
+        evaluators as classify(), so it decides exactly what the per-frame path
+        decides.
+
+        Args:
+            points: (N, 21, 3) raw landmarks.
+            scores: Optional (N, len(gestures)) float array; if given, columns
+                    1 and up receive the graded score of each gesture.
+
+        Returns:
+            (N, len(gestures)) bool array; column 0 (UNKNOWN) is left False.
+        """
+        distances, offsets = self._measure(plan, points)
+        matches = plan.code_matches[self._state_codes(plan, distances)]
+        m = np.concatenate((distances, offsets), axis=1).T
+        for constraint, columns in plan.batch_constraints:
+            matches[:, columns] &= constraint(m)[:, None]
+        if scores is not None:
+            # A gesture scores as well as its weakest rule: fingers or any constraint.
+            graded = self._finger_scores(plan, distances)
+            for constraint, columns in plan.batch_score_constraints:
+                graded[:, columns] = np.fmin(graded[:, columns], constraint(m)[:, None])
+            scores[:, 1:] = graded
+        return matches
+
+    def _tracked_state_code(self, plan: _EvaluationPlan, tracker: 'FingerStateTracker',
+                            points: np.ndarray) -> Optional[int]:
+        """
+        Advances tracker by one frame and returns the hand's state code.
+
+        Tip/PIP/MCP distance ratios do not change under normalization, so they
+        are taken from the raw landmarks. Returns None (and resets tracker) for
+        hands normalize_landmarks would reject.
+        """
+        gathered = points.take(self._TRACKED_PAIRS, axis=0)
+        diff = gathered[:11] - gathered[11:]
+        d = np.sqrt(np.square(diff) @ self._SUM_XYZ).tolist()
+        px, py = diff[10, :2].tolist()
+        palm_length = d[10]
+        if not (px * px + py * py >= 1e-12 and palm_length >= 1e-6 and math.isfinite(palm_length)):
+            tracker.reset()
+            return None
+
+        min_pip_mcp = 1e-6 * palm_length  # As in _state_code(), in palm lengths
+        states = tracker.states
+        code = 0
+        weight = 1
+        for finger, (extend_enter, extend_exit, curl_enter, curl_exit) in enumerate(plan.state_bands):
+            tip_mcp, pip_mcp = d[finger], d[5 + finger]
+            state = states[finger]
+            if not pip_mcp >= min_pip_mcp:
+                state = self.UNCERTAIN
+            elif state == self.EXTENDED and tip_mcp > extend_exit * pip_mcp:
+                pass
+            elif state == self.CURLED and tip_mcp < curl_exit * pip_mcp:
+                pass
+            elif tip_mcp > extend_enter * pip_mcp:
+                state = self.EXTENDED
+            elif tip_mcp < curl_enter * pip_mcp:
+                state = self.CURLED
+            else:
+                state = self.UNCERTAIN
+            states[finger] = state
+            code += state * weight
+            weight *= 3
+        return code
+
+    def _measurements(self, plan: _EvaluationPlan, hand: Any) -> List[float]:
+        """
+        The measurement vector m of one HandLandmarks: the same values as a
+        row of _measure(), as plain Python floats (cheaper to compare than
+        NumPy scalars in the constraints).
+        """
+        gathered = hand.points.take(plan.pairs, axis=0)
+        diff = gathered[:plan.num_pairs] - gathered[plan.num_pairs:]
+        distances = np.sqrt(np.square(diff) @ self._SUM_XYZ).tolist()
+        palm_length = distances[self.D_PALM_LENGTH]
+        px, py = diff[self.D_PALM_LENGTH, :2].tolist()  # Wrist minus middle MCP
+        planar_length = math.sqrt(px * px + py * py)
+        if not (planar_length >= 1e-6 and palm_length >= 1e-6 and math.isfinite(palm_length)):
+            return [math.nan] * (plan.num_pairs + len(plan.offsets))
+        if plan.hand_offsets:
+            vectors = diff[plan.offset_rows] @ self._both_frames(-px / planar_length, -py / planar_length)
+            offsets = vectors[plan.offset_columns, plan.offset_axes].tolist()
+        else:
+            offsets = diff[plan.offset_rows, plan.offset_axes].tolist()
+        return [value / palm_length for value in distances + offsets]
+
+    def _evaluate(self, plan: _EvaluationPlan, hand: Any,
+                  tracker: Optional['FingerStateTracker'] = None) -> Tuple[str, Optional[List[float]]]:
+        """
+        Classifies one HandLandmarks with plan, advancing tracker if given.
+
+        Returns:
+            (gesture name, measurement vector m); m is None when the tracked
+            finger states decided the gesture without measuring the hand.
+        """
+        code = None if tracker is None else self._tracked_state_code(plan, tracker, hand.points)
+        if code is not None and plan.code_names[code] is not None:
+            return plan.code_names[code], None
+        m = self._measurements(plan, hand)
+        if code is None:
+            code = self._state_code(plan, m)
+
+        # Candidates are stored in priority order; most codes have none or one.
+        for name, constraints in plan.lookup[code]:
+            for constraint in constraints:
+                if not constraint(m):
+                    break
+            else:
+                return name, m
+        return "UNKNOWN", m
+
+    # --- Public API ---
+
+    def reset_tracking(self):
+        """Forgets the tracked finger states, e.g. when a different hand is classified."""
+        if self.tracker is not None:
+            self.tracker.reset()
+
+    def classify(self, hand_landmarks: Any) -> str:
+        """
+        Classifies the gesture formed by a single hand.
+
+        Args:
+            hand_landmarks: A (21, 3) landmark array or HandLandmarks (see
+                            gestureflow.landmarks). A MediaPipe
+                            NormalizedLandmarkList or a list of landmark objects
+                            is also accepted and converted first.
+
+        Returns:
+            str: The gesture name (e.g. "FIST", "OPEN_PALM") or "UNKNOWN".
+        """
+        if hand_landmarks is None:
+            return "UNKNOWN"
+        hand = as_hand(hand_landmarks)
+        if hand.points.shape != (NUM_LANDMARKS, 3):
+            return "UNKNOWN"
+        return self._evaluate(self._plan, hand, self.tracker)[0]
+
+    def classify_with_confidence(self, hand_landmarks: Any) -> Tuple[str, float]:
+        """
+        Classifies a single hand and reports how clearly it fits.
+
+        Returns:
+            (gesture name or "UNKNOWN", the score of that name as in
+            classify_batch(..., return_scores=True)). Any recognized gesture
+            scores at least 0.5; values near 0.5 mean the pose sits on a
+            threshold and may flicker between frames. With finger state
+            tracking, fingers held by hysteresis are scored against the
+            thresholds that keep them in their state.
+        """
+        if hand_landmarks is None:
+            return "UNKNOWN", 0.0
+        hand = as_hand(hand_landmarks)
+        if hand.points.shape != (NUM_LANDMARKS, 3):
+            return "UNKNOWN", 0.0
+        plan = self._plan
+        gesture, m = self._evaluate(plan, hand, self.tracker)
+        if m is None:
+            m = self._measurements(plan, hand)
+        states = None if self.tracker is None else self.tracker.states
+        return gesture, self._score(plan, m, states)[plan.gestures.index(gesture)]
+
+    def score(self, hand_landmarks: Any) -> np.ndarray:
+        """
+        Scores a single hand against every gesture.
+
+        Returns:
+            (len(gestures),) float32 array aligned with self.gestures, see
+            classify_batch().
+        """
+        plan = self._plan
+        hand = None if hand_landmarks is None else as_hand(hand_landmarks)
+        if hand is None or hand.points.shape != (NUM_LANDMARKS, 3):
+            scores = [1.0] + [0.0] * (len(plan.gestures) - 1)
+        else:
+            scores = self._score(plan, self._measurements(plan, hand))
+        return np.array(scores, dtype=np.float32)
+
+    def classify_batch(self, landmarks: np.ndarray, return_scores: bool = False,
+                       normalized: Optional[Tuple[np.ndarray, np.ndarray]] = None):
+        """
+        Classifies a stack of hand poses in one vectorized pass.
+
+        Gives exactly the same answer as calling classify() on every pose, at a
+        small fraction of the cost; meant for offline evaluation, replay and
+        threshold tuning. Poses are independent: finger state tracking does
+        not apply.
+
+        Args:
+            landmarks: Array of shape (N, 21, 3) with normalized landmarks.
+            return_scores: If True, also return the per-gesture scores.
+            normalized: Accepted for the shared classifier interface (see
+                        gestureflow.model.HandClassifier) and ignored: the
+                        rules measure the raw landmarks.
+
+        Returns:
+            An (N,) array of gesture names. With return_scores, a tuple (names,
+            scores) where scores is an (N, len(gestures)) float32 array of
+            graded scores in [0, 1]. Each comparison in a gesture's rules
+            scores 0.5 on its threshold and ramps to 1 (or 0) over
+            SCORE_SOFTNESS palm lengths (finger states: over half the
+            uncertain band of the tip-MCP / PIP-MCP ratio, so a clean pose
+            scores 1); the gesture takes its weakest score.
+            A gesture scores above 0.5 exactly where its rule holds (before
+            the priority order picks one), and the UNKNOWN column is one minus
+            the best gesture score.
+
+        Raises:
+            ValueError: If landmarks does not have shape (N, 21, 3).
+        """
+        points = np.asarray(landmarks, dtype=np.float32)
+        if points.ndim != 3 or points.shape[1:] != (NUM_LANDMARKS, 3):
+            raise ValueError(f"classify_batch expects an (N, {NUM_LANDMARKS}, 3) array, got shape {points.shape}.")
+
+        plan = self._plan
+        matches = np.empty((len(points), len(plan.gestures)), dtype=bool)
+        scores = np.zeros((len(points), len(plan.gestures)), dtype=np.float32) if return_scores else None
+        for start in range(0, len(points), self._BATCH_CHUNK):
+            chunk = slice(start, start + self._BATCH_CHUNK)
+            matches[chunk] = self._match_batch(plan, points[chunk], None if scores is None else scores[chunk])
+        matches[:, 0] = ~matches[:, 1:].any(axis=1)
+
+        # The first matching column in priority order wins (UNKNOWN only matches alone).
+        names = plan.gesture_names[matches.argmax(axis=1)]
+        if return_scores:
+            scores[:, 0] = 1.0 - scores[:, 1:].max(axis=1, initial=0.0)
+            return names, scores
+        return names
+
+
+class FingerStateTracker:
+    """
+    Per-hand finger states that change with hysteresis.
+
+    A finger becomes extended when its tip-MCP distance exceeds
+    FINGER_EXTEND_FACTOR times its PIP-MCP distance, as in a stateless
+    classify(), but stays extended until the ratio falls below that factor
+    minus FINGER_STATE_HYSTERESIS; curled works the same way around
+    CURL_MAX_TIP_MCP_FACTOR. A finger held near a threshold therefore keeps its
+    state instead of flipping every few frames. The bands are per finger
+    (_EvaluationPlan.state_bands).
+
+    A state kept across a tracking gap is corrected on the first frame that
+    leaves its band, so the tracker need not be reset when the hand is lost.
+    """
+
+    __slots__ = ('states',)
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """Forgets all finger states (every finger uncertain)."""
+        self.states = [GestureClassifier.UNCERTAIN] * 5
+
+
+if __name__ == "__main__":
+    # Micro-benchmark: time classify() on synthetic hands (no camera needed).
+    import timeit
+
+    from gestureflow._synthetic import perturbed_hands, synthetic_hand
+
+    classifier = GestureClassifier()
+    runs = 20000
+    for extended in [(0, 0, 0, 0, 0), (1, 1, 1, 1, 1), (1, 0, 0, 0, 0), (0, 1, 0, 0, 0), (0, 1, 1, 0, 0),
+                     (0, 1, 1, 1, 0), (1, 1, 0, 0, 1), (0, 1, 0, 0, 1), (1, 0, 0, 0, 1), (1, 0, 1, 0, 1)]:
+        hand = synthetic_hand(extended)
+        best = min(timeit.repeat(lambda: classifier.classify(hand), number=runs, repeat=5))
+        print(f"{classifier.classify(hand):<20} {best / runs * 1e6:6.2f} us/hand")
+
+    batch = perturbed_hands(100000)
+    start = timeit.default_timer()
+    classifier.classify_batch(batch)
+    elapsed = timeit.default_timer() - start
+    print(f"classify_batch: {len(batch)} hands in {elapsed * 1000:.1f} ms ({elapsed / len(batch) * 1e9:.0f} ns/hand)")
@@ -0,0 +1,234 @@
+# gestureflow/cursor.py
+
+import math
+import threading
+import time
+from typing import Callable, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+class ScreenMapping:
+    """
+    Maps camera positions to absolute screen positions.
+
+    A configurable active rectangle of the (normalized, 0-1) camera image
+    covers the whole screen, so the hand never has to reach the image border.
+    Within an edge dead zone along the rectangle's border the pointer stays
+    pinned to the screen edge, which makes edges and corners easy to hit. An
+    optional acceleration curve slows the pointer near the centre of the
+    region and speeds it up towards the edges.
+
+    Everything but the curve is folded into one 2x3 affine matrix when the
+    mapping is built, so map() costs a single small matrix-vector product.
+    """
+
+    def __init__(self, screen_size: Tuple[int, int],
+                 active_region: Sequence[float] = (0.2, 0.2, 0.8, 0.8),
+                 edge_dead_zone: float = 0.05, acceleration: float = 1.0):
+        """
+        Initializes the ScreenMapping.
+
+        Args:
+            screen_size: (width, height) of the screen in pixels.
+            active_region: (left, top, right, bottom) of the camera rectangle
+                           mapped onto the screen, in normalized image
+                           coordinates.
+            edge_dead_zone: Width of the pinned border, as a fraction of the
+                            active region's width and height (per side).
+            acceleration: Exponent of the response curve from the region's
+                          centre; 1 is linear, larger values give finer control
+                          near the centre and faster movement near the edges.
+
+        Raises:
+            ValueError: If the region is empty, the dead zones cover it
+                        entirely or acceleration is not positive.
+        """
+        left, top, right, bottom = (float(value) for value in active_region)
+        if not (right > left and bottom > top):
+            raise ValueError(f"Empty active region {tuple(active_region)}.")
+        if not 0.0 <= edge_dead_zone < 0.5:
+            raise ValueError(f"edge_dead_zone must be in [0, 0.5), got {edge_dead_zone}.")
+        if not acceleration > 0.0:
+            raise ValueError(f"acceleration must be positive, got {acceleration}.")
+        self.screen_size = (int(screen_size[0]), int(screen_size[1]))
+        self.acceleration = acceleration
+
+        # Camera -> [-1, 1] across the region minus its dead zones.
+        half_width = (right - left) * (0.5 - edge_dead_zone)
+        half_height = (bottom - top) * (0.5 - edge_dead_zone)
+        centre_x, centre_y = (left + right) / 2.0, (top + bottom) / 2.0
+        to_unit = np.array([[1.0 / half_width, 0.0, -centre_x / half_width],
+                            [0.0, 1.0 / half_height, -centre_y / half_height],
+                            [0.0, 0.0, 1.0]])
+        # [-1, 1] -> screen pixels, last pixel included.
+        screen_half = ((self.screen_size[0] - 1) / 2.0, (self.screen_size[1] - 1) / 2.0)
+        self._to_screen = np.array([[screen_half[0], 0.0, screen_half[0]],
+                                    [0.0, screen_half[1], screen_half[1]]])
+        # With a linear response the clamp commutes with the scaling, so the
+        # whole mapping is one affine transform.
+        self.matrix = self._to_screen @ to_unit if acceleration == 1.0 else to_unit[:2]
+        self._max = (self.screen_size[0] - 1, self.screen_size[1] - 1)
+
+    def map(self, x: float, y: float) -> Tuple[float, float]:
+        """Returns the screen position (pixels, clamped to the screen) of a camera position."""
+        if self.acceleration == 1.0:
+            screen_x, screen_y = (self.matrix @ (x, y, 1.0)).tolist()
+            max_x, max_y = self._max
+            return min(max(screen_x, 0.0), max_x), min(max(screen_y, 0.0), max_y)
+        (scale_x, _, offset_x), (_, scale_y, offset_y) = self._to_screen.tolist()
+        u, v = (min(max(value, -1.0), 1.0) for value in (self.matrix @ (x, y, 1.0)).tolist())
+        u = math.copysign(abs(u) ** self.acceleration, u)
+        v = math.copysign(abs(v) ** self.acceleration, v)
+        return offset_x + scale_x * u, offset_y + scale_y * v
+
+
+class CursorInterpolator:
+    """
+    Moves the pointer at a fixed high rate, independent of the camera frame rate.
+
+    The capture loop only sets a target position with update(), once per
+    processed frame. A background thread ticking at rate_hz glides the pointer
+    from where it is towards the newest target over one frame interval and
+    issues small relative moves, so a 30 fps hand track becomes a smooth
+    120-240 Hz pointer motion at the cost of one frame interval of lag.
+
+    Positions are in screen pixels. By default only their differences are
+    applied (relative movement) and fractions of a pixel are carried over to
+    the next tick; with move_to the positions are absolute (see
+    ScreenMapping). The thread sleeps while no target is active.
+    """
+
+    def __init__(self, move_rel: Callable[[int, int], None], rate_hz: float = 120.0,
+                 lock: Optional[threading.Lock] = None, max_interval_s: float = 0.1,
+                 clock: Callable[[], float] = time.monotonic,
+                 move_to: Optional[Callable[[int, int], None]] = None):
+        """
+        Initializes the CursorInterpolator. No thread runs until start().
+
+        Args:
+            move_rel: Moves the pointer by (dx, dy) pixels, e.g. a wrapper of
+                      pyautogui.moveRel.
+            rate_hz: Pointer updates per second.
+            lock: Held around every pointer move, to serialize them with other
+                  users of the OS input API.
+            max_interval_s: Longest glide between two targets; targets that
+                            arrive after a longer pause are reached that fast.
+            clock: Time source, in seconds.
+            move_to: Moves the pointer to (x, y) pixels. If given, targets are
+                     absolute screen positions and move_rel is not used.
+        """
+        self.move_rel = move_rel
+        self.move_to = move_to
+        self.period = 1.0 / rate_hz
+        self.lock = lock or threading.Lock()
+        self.max_interval_s = max_interval_s
+        self.clock = clock
+
+        self._state_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.release()
+
+    def start(self) -> 'CursorInterpolator':
+        """Launches the cursor thread (once)."""
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="gestureflow-cursor", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: float = 1.0):
+        """Stops the cursor thread."""
+        with self._state_lock:
+            self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def release(self):
+        """Forgets the target; the next update() starts a new stroke without moving the pointer."""
+        with self._state_lock:
+            self._active = False
+            self._start = self._end = self._emitted = (0.0, 0.0)
+            self._start_time = self._last_update = None
+            self._duration = self.period
+
+    def update(self, x: float, y: float, timestamp: Optional[float] = None):
+        """
+        Sets a new target position.
+
+        Args:
+            x, y: Target in screen pixels (absolute with move_to; otherwise
+                  any origin, only movement counts).
+            timestamp: When the position was observed; defaults to now.
+        """
+        now = self.clock() if timestamp is None else timestamp
+        with self._state_lock:
+            if not self._active:
+                # First target of a stroke: that is where the pointer already is
+                # (relative), or where it jumps on the next tick (absolute).
+                self._start = self._end = (x, y)
+                self._emitted = (x, y) if self.move_to is None else None
+                self._start_time = self._last_update = now
+                self._active = True
+            else:
+                # Glide from the current position so a target arriving early or
+                # late never makes the pointer jump, over one frame interval.
+                self._start = self._position(now)
+                self._end = (x, y)
+                self._duration = min(max(now - self._last_update, self.period), self.max_interval_s)
+                self._start_time = self._last_update = now
+        self._wake.set()
+
+    def _position(self, now: float):
+        """Interpolated position at time now (state lock held)."""
+        progress = min(max((now - self._start_time) / self._duration, 0.0), 1.0)
+        (x0, y0), (x1, y1) = self._start, self._end
+        return x0 + (x1 - x0) * progress, y0 + (y1 - y0) * progress
+
+    def _run(self):
+        """Thread body: at most one pointer move per tick while a stroke is active."""
+        next_tick = self.clock()
+        while True:
+            with self._state_lock:
+                if self._stop.is_set():
+                    break
+                self._wake.clear()  # An update() or stop() after this point wakes the waits below
+                active = self._active
+                if active:
+                    now = self.clock()
+                    x, y = self._position(now)
+                    if self.move_to is not None:
+                        target = (int(round(x)), int(round(y)))
+                        move = target != self._emitted
+                        self._emitted = target
+                    else:
+                        emitted_x, emitted_y = self._emitted
+                        dx, dy = int(x - emitted_x), int(y - emitted_y)
+                        self._emitted = (emitted_x + dx, emitted_y + dy)
+                        move = bool(dx or dy)
+                    # Targets stopped coming (hand lost or still): rest once reached.
+                    idle = now - self._start_time >= self._duration and now - self._last_update > self.max_interval_s
+            if not active:
+                self._wake.wait()
+                next_tick = self.clock()
+                continue
+            if move:
+                with self.lock:
+                    if self.move_to is not None:
+                        self.move_to(*target)
+                    else:
+                        self.move_rel(dx, dy)
+            if idle:
+                self._wake.wait(self.max_interval_s)
+                next_tick = self.clock()
+                continue
+            next_tick += self.period
+            delay = next_tick - self.clock()
+            if delay > 0:
+                self._stop.wait(delay)
+            else:
+                next_tick = self.clock()  # Fell behind; do not try to catch up with a burst
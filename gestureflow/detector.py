@@ -5,6 +5,40 @@ import mediapipe as mp
 import numpy as np
 from typing import List, Optional, Tuple, Any
 
+# MediaPipe labels handedness assuming a mirrored (selfie) input image
+_MIRRORED_HANDEDNESS = {"Left": "Right", "Right": "Left"}
+
+
+def mirror_results(results: Any) -> Any:
+    """
+    Mirrors MediaPipe Hands results horizontally, in place.
+
+    Running detection on the unflipped camera frame and mirroring the 21
+    landmarks per hand afterwards gives the same output as flipping the whole
+    frame first, at a fraction of the cost: x becomes 1 - x (normalized) or -x
+    (world coordinates, metres around the hand centre) and the Left/Right
+    handedness labels are swapped.
+
+    Args:
+        results: The raw results object returned by Hands.process().
+
+    Returns:
+        The same results object, for convenience.
+    """
+    if results is None:
+        return results
+    for hand_landmarks in results.multi_hand_landmarks or []:
+        for landmark in hand_landmarks.landmark:
+            landmark.x = 1.0 - landmark.x
+    for hand_world_landmarks in getattr(results, 'multi_hand_world_landmarks', None) or []:
+        for landmark in hand_world_landmarks.landmark:
+            landmark.x = -landmark.x
+    for hand_handedness in results.multi_handedness or []:
+        for classification in hand_handedness.classification:
+            classification.label = _MIRRORED_HANDEDNESS.get(classification.label, classification.label)
+    return results
+
+
 class HandDetector:
     """
     Detects hands and extracts landmarks from image frames using MediaPipe Hands.
@@ -15,7 +49,12 @@ class HandDetector:
                  max_num_hands: int = 2,
                  model_complexity: int = 1,
                  min_detection_confidence: float = 0.5,
-                 min_tracking_confidence: float = 0.5):
+                 min_tracking_confidence: float = 0.5,
+                 mirror_landmarks: bool = False,
+                 roi_tracking: bool = False,
+                 roi_size: int = 256,
+                 roi_padding: float = 0.3,
+                 roi_redetect_interval: int = 30):
         """
         Initializes the HandDetector.
 
@@ -28,12 +67,34 @@ class HandDetector:
                                       detection to be considered successful.
             min_tracking_confidence: Minimum confidence value ([0.0, 1.0]) for the
                                      hand landmarks to be considered tracked successfully.
+            mirror_landmarks: Whether to mirror the detected landmarks and
+                              handedness horizontally. Lets callers run detection
+                              on the unflipped camera frame and still get
+                              selfie-view coordinates, leaving the pixel flip to
+                              the display path (or skipping it when headless).
+            roi_tracking: Whether to run inference on a crop around the hands found
+                          in the previous frame instead of the full frame. The
+                          crop is resized to roi_size x roi_size and landmarks
+                          are mapped back to full-frame coordinates. Falls back
+                          to full-frame detection when the hands are lost.
+            roi_size: Side length in pixels of the (square) inference input in
+                      ROI tracking mode.
+            roi_padding: Padding added around the landmark bounding box, as a
+                         fraction of its largest side, on each side.
+            roi_redetect_interval: Run a full-frame detection at least every this
+                                   many frames so new hands entering outside the
+                                   ROI are picked up.
         """
         self.static_image_mode = static_image_mode
         self.max_num_hands = max_num_hands
         self.model_complexity = model_complexity
         self.min_detection_confidence = min_detection_confidence
         self.min_tracking_confidence = min_tracking_confidence
+        self.mirror_landmarks = mirror_landmarks
+        self.roi_tracking = roi_tracking
+        self.roi_size = roi_size
+        self.roi_padding = roi_padding
+        self.roi_redetect_interval = roi_redetect_interval
 
         # Initialize MediaPipe Hands
         self.mp_hands = mp.solutions.hands
@@ -51,16 +112,40 @@ class HandDetector:
             # or handle it in a way that allows the application to continue degraded.
             self.hands = None # Indicate initialization failure
 
+        # ROI tracking state. Crops get their own Hands instance so MediaPipe's
+        # internal tracking never mixes crop and full-frame coordinates.
+        self.roi_hands = None
+        if self.roi_tracking and self.hands is not None:
+            try:
+                self.roi_hands = self.mp_hands.Hands(
+                    static_image_mode=False,
+                    max_num_hands=self.max_num_hands,
+                    model_complexity=self.model_complexity,
+                    min_detection_confidence=self.min_detection_confidence,
+                    min_tracking_confidence=self.min_tracking_confidence
+                )
+            except Exception as e:
+                print(f"Error initializing MediaPipe Hands for ROI tracking: {e}")
+                self.roi_tracking = False
+        self._roi: Optional[Tuple[int, int, int, int]] = None  # (x0, y0, x1, y1) in pixels
+        self._roi_frame_shape: Optional[Tuple[int, int]] = None  # Frame size the ROI refers to
+        self._frames_since_full_detection = 0
+        self._roi_buffer: Optional[np.ndarray] = None
+        self.roi_frames = 0         # Frames served from the ROI crop
+        self.full_frames = 0        # Frames that needed full-frame detection
+
         self.mp_drawing = mp.solutions.drawing_utils
         self.mp_drawing_styles = mp.solutions.drawing_styles
 
 
-    def process_frame(self, frame: np.ndarray) -> Tuple[List[Any], Optional[Any]]:
+    def process_frame(self, frame: np.ndarray, is_rgb: bool = False) -> Tuple[List[Any], Optional[Any]]:
         """
         Processes a single image frame to detect hands and landmarks.
 
         Args:
             frame: The input image frame (in BGR format).
+            is_rgb: Set to True if the frame is already RGB (e.g. produced by
+                    FramePreprocessor); the colour conversion is then skipped.
 
         Returns:
             A tuple containing:
@@ -74,36 +159,128 @@ class HandDetector:
             print("Error: Hand detector was not initialized successfully.")
             return [], None
 
-        # Convert the BGR image to RGB
-        try:
-            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        except cv2.error as e:
-            print(f"Error converting frame color space: {e}")
-            return [], None
+        results = None
+        use_roi = (self.roi_tracking and self._roi is not None and
+                   self._roi_frame_shape == frame.shape[:2] and
+                   self._frames_since_full_detection < self.roi_redetect_interval)
+        if use_roi:
+            results = self._process_roi(frame, is_rgb)
+            if results is not None:
+                self._frames_since_full_detection += 1
+                self.roi_frames += 1
+
+        if results is None:
+            # Full-frame detection (default path, or ROI tracking lost)
+            if is_rgb:
+                rgb_frame = frame
+            else:
+                # Convert the BGR image to RGB
+                try:
+                    rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+                except cv2.error as e:
+                    print(f"Error converting frame color space: {e}")
+                    return [], None
+            results = self._run_hands(self.hands, rgb_frame)
+            if results is None:
+                return [], None
+            self._frames_since_full_detection = 0
+            self.full_frames += 1
+
+        if self.roi_tracking:
+            # Computed before mirroring: the ROI lives in raw frame coordinates.
+            self._roi = self._roi_from_results(results, frame.shape[1], frame.shape[0])
+            self._roi_frame_shape = frame.shape[:2]
+
+        if self.mirror_landmarks:
+            mirror_results(results)
 
+        detected_hands_landmarks = []
+        if results.multi_hand_landmarks:
+            # Extract landmarks for each detected hand
+            for hand_landmarks in results.multi_hand_landmarks:
+                detected_hands_landmarks.append(hand_landmarks)
+
+        return detected_hands_landmarks, results
+
+    def _run_hands(self, hands: Any, rgb_frame: np.ndarray) -> Optional[Any]:
+        """Runs a MediaPipe Hands instance on an RGB image. Returns None on failure."""
         # To improve performance, optionally mark the image as not writeable to
         # pass by reference.
         rgb_frame.flags.writeable = False
 
         # Process the frame and find hands
         try:
-            results = self.hands.process(rgb_frame)
+            results = hands.process(rgb_frame)
         except Exception as e:
             print(f"Error processing frame with MediaPipe Hands: {e}")
             # Ensure frame is writeable again even if processing fails
             rgb_frame.flags.writeable = True
-            return [], None
+            return None
 
         # Allow writing to the frame again
         rgb_frame.flags.writeable = True # Although we don't modify rgb_frame here, good practice
+        return results
 
-        detected_hands_landmarks = []
-        if results.multi_hand_landmarks:
-            # Extract landmarks for each detected hand
-            for hand_landmarks in results.multi_hand_landmarks:
-                detected_hands_landmarks.append(hand_landmarks)
+    def _process_roi(self, frame: np.ndarray, is_rgb: bool) -> Optional[Any]:
+        """
+        Runs detection on the tracked region of interest only.
 
-        return detected_hands_landmarks, results
+        Returns the results with landmarks mapped back to full-frame normalized
+        coordinates, or None if no hand was found in the crop.
+        """
+        x0, y0, x1, y1 = self._roi
+        frame_h, frame_w = frame.shape[:2]
+        crop = frame[y0:y1, x0:x1]
+        if crop.size == 0:
+            return None
+
+        # Resize (and colour-convert) only the crop, into a reused buffer
+        if self._roi_buffer is None:
+            self._roi_buffer = np.empty((self.roi_size, self.roi_size, 3), dtype=np.uint8)
+        try:
+            cv2.resize(crop, (self.roi_size, self.roi_size), dst=self._roi_buffer,
+                       interpolation=cv2.INTER_AREA)
+            if not is_rgb:
+                cv2.cvtColor(self._roi_buffer, cv2.COLOR_BGR2RGB, dst=self._roi_buffer)
+        except cv2.error as e:
+            print(f"Error preparing ROI crop: {e}")
+            return None
+
+        results = self._run_hands(self.roi_hands, self._roi_buffer)
+        if results is None or not results.multi_hand_landmarks:
+            return None
+
+        # Crop-normalized -> full-frame normalized coordinates. z shares the
+        # scale of x in MediaPipe, so it is scaled by the crop width as well.
+        crop_w, crop_h = x1 - x0, y1 - y0
+        scale_x, scale_y = crop_w / frame_w, crop_h / frame_h
+        offset_x, offset_y = x0 / frame_w, y0 / frame_h
+        for hand_landmarks in results.multi_hand_landmarks:
+            for landmark in hand_landmarks.landmark:
+                landmark.x = landmark.x * scale_x + offset_x
+                landmark.y = landmark.y * scale_y + offset_y
+                landmark.z = landmark.z * scale_x
+        return results
+
+    def _roi_from_results(self, results: Any, frame_w: int, frame_h: int) -> Optional[Tuple[int, int, int, int]]:
+        """
+        Computes the padded square crop (x0, y0, x1, y1) enclosing all detected hands.
+        Returns None if no hand was detected.
+        """
+        if not results.multi_hand_landmarks:
+            return None
+        xs = [lm.x for hand in results.multi_hand_landmarks for lm in hand.landmark]
+        ys = [lm.y for hand in results.multi_hand_landmarks for lm in hand.landmark]
+        min_x, max_x = min(xs) * frame_w, max(xs) * frame_w
+        min_y, max_y = min(ys) * frame_h, max(ys) * frame_h
+
+        # Square crop so the resize keeps the hand's aspect ratio
+        side = max(max_x - min_x, max_y - min_y) * (1.0 + 2.0 * self.roi_padding)
+        side = min(max(side, 64.0), float(min(frame_w, frame_h)))
+        center_x, center_y = (min_x + max_x) / 2.0, (min_y + max_y) / 2.0
+        x0 = int(round(min(max(center_x - side / 2.0, 0.0), frame_w - side)))
+        y0 = int(round(min(max(center_y - side / 2.0, 0.0), frame_h - side)))
+        return x0, y0, x0 + int(side), y0 + int(side)
 
     def draw_landmarks(self, frame: np.ndarray, results: Any) -> np.ndarray:
         """
@@ -132,6 +309,8 @@ class HandDetector:
         """
         Releases MediaPipe Hands resources.
         """
+        if hasattr(self, 'roi_hands') and self.roi_hands:
+            self.roi_hands.close()
         if hasattr(self, 'hands') and self.hands:
             self.hands.close()
             print("MediaPipe Hands resources released.")
@@ -139,7 +318,8 @@ class HandDetector:
 
 # Example Usage (can be run standalone for testing)
 if __name__ == '__main__':
-    detector = HandDetector(max_num_hands=2, min_detection_confidence=0.7)
+    # Detect on the raw frame and mirror the landmarks; only the preview is flipped.
+    detector = HandDetector(max_num_hands=2, min_detection_confidence=0.7, mirror_landmarks=True)
 
     # Use webcam
     cap = cv2.VideoCapture(0)
@@ -156,15 +336,12 @@ if __name__ == '__main__':
             print("Ignoring empty camera frame.")
             continue
 
-        # Flip the frame horizontally for a later selfie-view display
-        # and convert the BGR image to RGB.
-        frame = cv2.flip(frame, 1)
-
-        # Process the frame
+        # Process the unflipped frame; landmarks come back mirrored
         landmarks_list, results = detector.process_frame(frame)
 
-        # Draw landmarks on the frame
-        annotated_frame = detector.draw_landmarks(frame.copy(), results) # Draw on a copy
+        # Flip the frame horizontally for the selfie-view display and draw on it
+        # (cv2.flip returns a new array, so the camera frame stays untouched)
+        annotated_frame = detector.draw_landmarks(cv2.flip(frame, 1), results)
 
         # Display handedness and landmark count (example of using results)
         if results and results.multi_handedness:
@@ -0,0 +1,225 @@
+# gestureflow/frame_ring.py
+
+import multiprocessing as mp
+import time
+from multiprocessing import shared_memory
+from typing import Any, Optional, Tuple
+
+import numpy as np
+
+# Per-slot header fields (int64 each)
+_SEQ = 0        # Sequence number of the frame stored in the slot (0 = never written)
+_OWNERS = 1     # >0: number of owners, 0: free, -1: being written
+_TIMESTAMP = 2  # Capture time in nanoseconds (time.time_ns())
+_HEADER_FIELDS = 4  # Padded to 32 bytes per slot
+
+_WRITING = -1
+
+# Frame data starts on a cache-line boundary after the header block
+_ALIGNMENT = 64
+
+
+def _attach_shared_memory(name: str) -> shared_memory.SharedMemory:
+    """
+    Attaches to an existing shared memory block without taking ownership of it.
+
+    Only the creating process unlinks the ring. On Python 3.13+ attaching
+    processes opt out of resource tracking explicitly; on older versions the
+    spawned stages share their parent's resource tracker, where the duplicate
+    registration is harmless.
+    """
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        return shared_memory.SharedMemory(name=name)
+
+
+class SharedFrameRing:
+    """
+    A ring of preallocated frame slots in shared memory.
+
+    Frames are written once into a slot and then read in place by every stage
+    that needs them (detection, visualisation), so only a small
+    (slot, seq, timestamp) tuple has to travel through inter-process queues
+    instead of a pickled multi-megabyte array.
+
+    Each slot carries a small header with the sequence number of the frame it
+    holds and an owner count:
+        - The producer calls acquire() to get a free slot, fills frame(slot) and
+          calls publish(), which hands one ownership reference to the message
+          describing the frame.
+        - Whoever consumes or discards that message calls release(). Once the
+          owner count drops to zero the slot can be reused.
+        - Readers call view(slot, seq), which returns None if the slot no longer
+          holds the frame they expect.
+
+    Instances can be passed to child processes as Process arguments; unpickling
+    attaches to the same shared memory block instead of copying it.
+    """
+
+    def __init__(self, num_slots: int, frame_shape: Tuple[int, ...], dtype: Any = np.uint8,
+                 name: Optional[str] = None, lock: Optional[Any] = None, create: bool = True):
+        """
+        Initializes (creates or attaches to) a SharedFrameRing.
+
+        Args:
+            num_slots: Number of frame slots. Must cover every frame that can be
+                       in flight at once (queued or being processed).
+            frame_shape: Shape of one frame, e.g. (720, 1280, 3).
+            dtype: Pixel data type.
+            name: Name of the shared memory block. Required when create is False.
+            lock: A multiprocessing lock guarding the slot headers. Created if None.
+            create: Whether to allocate a new block (owner) or attach to `name`.
+        """
+        if num_slots < 1:
+            raise ValueError("SharedFrameRing needs at least one slot.")
+        self.num_slots = num_slots
+        self.frame_shape = tuple(frame_shape)
+        self.dtype = np.dtype(dtype)
+        self.frame_nbytes = int(np.prod(self.frame_shape)) * self.dtype.itemsize
+        self._lock = lock if lock is not None else mp.Lock()
+        self._owner = create
+
+        header_nbytes = num_slots * _HEADER_FIELDS * 8
+        self._data_offset = (header_nbytes + _ALIGNMENT - 1) // _ALIGNMENT * _ALIGNMENT
+        slot_stride = (self.frame_nbytes + _ALIGNMENT - 1) // _ALIGNMENT * _ALIGNMENT
+        self._slot_stride = slot_stride
+
+        if create:
+            self._shm = shared_memory.SharedMemory(
+                name=name, create=True, size=self._data_offset + slot_stride * num_slots)
+        else:
+            if name is None:
+                raise ValueError("A name is required to attach to an existing SharedFrameRing.")
+            self._shm = _attach_shared_memory(name)
+
+        self._headers = np.ndarray((num_slots, _HEADER_FIELDS), dtype=np.int64, buffer=self._shm.buf)
+        if create:
+            self._headers[:] = 0
+        # Preallocated views, one per slot; never reallocated.
+        self._frames = [
+            np.ndarray(self.frame_shape, dtype=self.dtype, buffer=self._shm.buf,
+                       offset=self._data_offset + i * slot_stride)
+            for i in range(num_slots)
+        ]
+
+        # Producer statistics (only meaningful in the writing process)
+        self.frames_written = 0
+        self.frames_dropped = 0
+
+    @property
+    def name(self) -> str:
+        """Name of the underlying shared memory block."""
+        return self._shm.name
+
+    def __reduce__(self):
+        # Pickling (e.g. as a Process argument) attaches instead of copying.
+        return (SharedFrameRing,
+                (self.num_slots, self.frame_shape, self.dtype.str, self.name, self._lock, False))
+
+    # --- Producer side ---
+
+    def acquire(self) -> Optional[int]:
+        """
+        Reserves a free slot for writing.
+
+        The least recently written free slot is chosen so readers holding an
+        older sequence number are the last ones to be invalidated.
+
+        Returns:
+            The slot index, or None if every slot is still owned by a consumer
+            (the caller should drop the frame).
+        """
+        with self._lock:
+            free = np.flatnonzero(self._headers[:, _OWNERS] == 0)
+            if free.size == 0:
+                self.frames_dropped += 1
+                return None
+            slot = int(free[np.argmin(self._headers[free, _SEQ])])
+            self._headers[slot, _OWNERS] = _WRITING
+            return slot
+
+    def frame(self, slot: int) -> np.ndarray:
+        """Returns the writable array backing a slot (for the producer)."""
+        return self._frames[slot]
+
+    def publish(self, slot: int, seq: int, timestamp_ns: Optional[int] = None,
+                owners: int = 1) -> Tuple[int, int, int]:
+        """
+        Marks a slot written and hands out ownership references.
+
+        Args:
+            slot: Slot index returned by acquire().
+            seq: Monotonically increasing frame sequence number (> 0).
+            timestamp_ns: Capture time; defaults to time.time_ns().
+            owners: Number of release() calls needed before the slot is reused.
+
+        Returns:
+            The (slot, seq, timestamp_ns) message to send to consumers.
+        """
+        timestamp_ns = time.time_ns() if timestamp_ns is None else timestamp_ns
+        with self._lock:
+            self._headers[slot, _SEQ] = seq
+            self._headers[slot, _TIMESTAMP] = timestamp_ns
+            self._headers[slot, _OWNERS] = owners
+        self.frames_written += 1
+        return slot, seq, timestamp_ns
+
+    def abandon(self, slot: int):
+        """Returns a slot obtained from acquire() without publishing it."""
+        with self._lock:
+            if self._headers[slot, _OWNERS] == _WRITING:
+                self._headers[slot, _OWNERS] = 0
+
+    # --- Consumer side ---
+
+    def view(self, slot: int, seq: int) -> Optional[np.ndarray]:
+        """
+        Returns the frame in a slot without copying it.
+
+        Args:
+            slot: Slot index from the published message.
+            seq: Sequence number from the published message.
+
+        Returns:
+            The frame array, or None if the slot was recycled and no longer holds
+            frame `seq`.
+        """
+        if self._headers[slot, _SEQ] != seq or self._headers[slot, _OWNERS] <= 0:
+            return None
+        return self._frames[slot]
+
+    def retain(self, slot: int, count: int = 1):
+        """Adds ownership references, e.g. before fanning a message out to more consumers."""
+        with self._lock:
+            if self._headers[slot, _OWNERS] > 0:
+                self._headers[slot, _OWNERS] += count
+
+    def release(self, slot: int):
+        """Drops one ownership reference; the slot becomes free when none are left."""
+        with self._lock:
+            if self._headers[slot, _OWNERS] > 0:
+                self._headers[slot, _OWNERS] -= 1
+
+    def in_use(self) -> int:
+        """Returns the number of slots currently owned or being written."""
+        return int(np.count_nonzero(self._headers[:, _OWNERS] != 0))
+
+    # --- Lifetime ---
+
+    def close(self):
+        """Detaches from the shared memory. The creating process also unlinks it."""
+        self._frames = []
+        self._headers = None
+        try:
+            self._shm.close()
+        except BufferError:
+            # A view handed out by view()/frame() is still alive; the mapping is
+            # released together with it.
+            pass
+        if self._owner:
+            try:
+                self._shm.unlink()
+            except FileNotFoundError:
+                pass
+            self._owner = False
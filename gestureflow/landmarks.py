@@ -0,0 +1,170 @@
+# gestureflow/landmarks.py
+
+import math
+from typing import Any, List, Optional, Tuple
+
+import numpy as np
+
+NUM_LANDMARKS = 21
+WRIST = 0
+MIDDLE_MCP = 9
+
+# Landmark index pairs forming the hand skeleton (same as mp.solutions.hands.HAND_CONNECTIONS)
+HAND_CONNECTIONS = np.array([
+    (0, 1), (1, 2), (2, 3), (3, 4),            # Thumb
+    (0, 5), (5, 6), (6, 7), (7, 8),            # Index
+    (5, 9), (9, 10), (10, 11), (11, 12),       # Middle
+    (9, 13), (13, 14), (14, 15), (15, 16),     # Ring
+    (13, 17), (0, 17), (17, 18), (18, 19), (19, 20),  # Pinky and palm base
+], dtype=np.intp)
+
+
+class HandLandmarks:
+    """
+    One detected hand in the array form used by every stage after detection.
+
+    MediaPipe results are converted once per hand per frame (see
+    hands_from_results); the classifier, actions and visualisation then work on
+    `points` directly instead of walking protobuf landmark objects.
+
+    The hand-aligned form (see normalize_landmarks) is computed on first use
+    and cached, so every classifier that looks at the same hand shares it.
+
+    Attributes:
+        points: Contiguous (21, 3) float32 array of normalized x, y, z.
+        handedness: "Left", "Right" or None if unknown.
+        score: Handedness confidence in [0, 1] (0.0 if unknown).
+    """
+
+    __slots__ = ('points', 'handedness', 'score', '_normalized', '_palm_direction')
+
+    def __init__(self, points: np.ndarray, handedness: Optional[str] = None, score: float = 0.0):
+        self.points = points
+        self.handedness = handedness
+        self.score = score
+        self._normalized = None
+        self._palm_direction = None
+
+    @property
+    def normalized(self) -> np.ndarray:
+        """Wrist-centred, palm-scaled, palm-aligned (21, 3) landmarks (all NaN if degenerate)."""
+        if self._normalized is None:
+            self._normalized, self._palm_direction = normalize_landmarks(self.points)
+        return self._normalized
+
+    @property
+    def palm_direction(self) -> np.ndarray:
+        """Unit (x, y) image direction from the wrist to the middle MCP."""
+        if self._normalized is None:
+            self._normalized, self._palm_direction = normalize_landmarks(self.points)
+        return self._palm_direction
+
+    def __repr__(self) -> str:
+        return f"HandLandmarks(handedness={self.handedness!r}, score={self.score:.2f})"
+
+
+def landmark_list_to_array(hand_landmarks: Any) -> np.ndarray:
+    """
+    Converts a MediaPipe NormalizedLandmarkList (or a list of objects with x, y, z
+    attributes) into a (21, 3) float32 array.
+    """
+    landmarks = getattr(hand_landmarks, 'landmark', hand_landmarks)
+    flat = [value for lm in landmarks for value in (lm.x, lm.y, lm.z)]
+    return np.array(flat, dtype=np.float32).reshape(-1, 3)
+
+
+def as_landmark_array(landmarks: Any) -> np.ndarray:
+    """
+    Returns the (21, 3) float32 array for any supported landmark representation:
+    HandLandmarks, a NumPy array, a MediaPipe NormalizedLandmarkList or a list of
+    landmark objects. Arrays already in the right form are returned as is.
+    """
+    if isinstance(landmarks, HandLandmarks):
+        return landmarks.points
+    if isinstance(landmarks, np.ndarray):
+        if landmarks.dtype == np.float32 and landmarks.flags.c_contiguous:
+            return landmarks
+        return np.ascontiguousarray(landmarks, dtype=np.float32)
+    return landmark_list_to_array(landmarks)
+
+
+def as_hand(landmarks: Any) -> HandLandmarks:
+    """Returns landmarks as HandLandmarks, wrapping arrays and MediaPipe lists (without handedness)."""
+    if isinstance(landmarks, HandLandmarks):
+        return landmarks
+    return HandLandmarks(as_landmark_array(landmarks))
+
+
+def normalize_landmarks(points: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Maps landmarks into the hand's own frame: translated so the wrist is the
+    origin, rotated in the image plane so the wrist -> middle MCP direction
+    points up (negative y, as in image coordinates), and divided by the
+    wrist -> middle MCP distance. Lengths are then in palm lengths and do not
+    depend on where the hand is, how large it appears or how it is rotated.
+
+    Args:
+        points: (21, 3) or (N, 21, 3) landmarks.
+
+    Returns:
+        A tuple (normalized, palm_direction): float32 landmarks of the same
+        shape, and the (..., 2) unit image direction (ux, uy) of the palm used
+        for the rotation. A hand-frame vector (x', y') points along
+        (-uy * x' - ux * y', ux * x' - uy * y') in the image. Degenerate hands
+        (palm length or its image-plane part below 1e-6) come back as NaN.
+    """
+    points = np.asarray(points, dtype=np.float32)
+    if points.ndim == 2:
+        # One hand: rotation and scale as a single 3x3 product.
+        relative = points - points[WRIST]
+        px, py, pz = relative[MIDDLE_MCP].tolist()
+        planar_length = math.sqrt(px * px + py * py)
+        palm_length = math.sqrt(planar_length * planar_length + pz * pz)
+        if not (planar_length >= 1e-6 and palm_length >= 1e-6 and math.isfinite(palm_length)):
+            return np.full(points.shape, np.nan, dtype=np.float32), np.full(2, np.nan, dtype=np.float32)
+        ux, uy, scale = px / planar_length, py / planar_length, 1.0 / palm_length
+        transform = np.array([[-uy * scale, -ux * scale, 0.0],
+                              [ux * scale, -uy * scale, 0.0],
+                              [0.0, 0.0, scale]], dtype=np.float32)
+        return relative @ transform, np.array((ux, uy), dtype=np.float32)
+
+    # A stack of hands: the same arithmetic per hand (float64 transform, float32
+    # product), so a hand normalizes identically alone or in a batch.
+    relative = points - points[..., WRIST:WRIST + 1, :]
+    px, py, pz = np.moveaxis(relative[..., MIDDLE_MCP, :].astype(np.float64), -1, 0)
+    planar_length = np.sqrt(px * px + py * py)
+    palm_length = np.sqrt(planar_length * planar_length + pz * pz)
+    valid = (planar_length >= 1e-6) & (palm_length >= 1e-6) & np.isfinite(palm_length)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ux, uy, scale = px / planar_length, py / planar_length, 1.0 / palm_length
+    zero = np.zeros_like(scale)
+    transform = np.stack((np.stack((-uy * scale, -ux * scale, zero), axis=-1),
+                          np.stack((ux * scale, -uy * scale, zero), axis=-1),
+                          np.stack((zero, zero, scale), axis=-1)), axis=-2).astype(np.float32)
+    with np.errstate(invalid='ignore'):
+        normalized = relative @ transform
+    normalized[~valid] = np.nan
+    palm_direction = np.stack((ux, uy), axis=-1).astype(np.float32)
+    palm_direction[~valid] = np.nan
+    return normalized, palm_direction
+
+def hands_from_results(landmarks_list: List[Any], results: Any = None) -> List[HandLandmarks]:
+    """
+    Converts the output of HandDetector.process_frame into HandLandmarks.
+
+    Args:
+        landmarks_list: The per-hand landmark lists returned by process_frame.
+        results: The raw results object, used for handedness labels and scores.
+
+    Returns:
+        One HandLandmarks per detected hand, in detection order.
+    """
+    handedness_list = getattr(results, 'multi_handedness', None) or []
+    hands = []
+    for index, hand_landmarks in enumerate(landmarks_list or []):
+        label, score = None, 0.0
+        if index < len(handedness_list):
+            classification = handedness_list[index].classification[0]
+            label, score = classification.label, classification.score
+        hands.append(HandLandmarks(landmark_list_to_array(hand_landmarks), label, score))
+    return hands
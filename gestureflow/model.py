@@ -0,0 +1,464 @@
+# gestureflow/model.py
+
+import argparse
+import time
+from typing import Any, List, Optional, Protocol, Sequence, Tuple
+
+import numpy as np
+
+from gestureflow.landmarks import NUM_LANDMARKS, as_hand, normalize_landmarks
+
+NUM_FEATURES = (NUM_LANDMARKS - 1) * 3
+
+
+def landmark_features(landmarks: np.ndarray, normalized: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Turns hand landmarks into model features: the hand-aligned landmarks of
+    normalize_landmarks without the wrist (always the origin), flattened.
+
+    Args:
+        landmarks: (21, 3) or (N, 21, 3) landmarks.
+        normalized: normalize_landmarks(landmarks)[0], if already computed.
+
+    Returns:
+        (60,) or (N, 60) float32 features; NaN for degenerate hands.
+    """
+    if normalized is None:
+        normalized = normalize_landmarks(landmarks)[0]
+    return normalized[..., 1:, :].reshape(normalized.shape[:-2] + (NUM_FEATURES,))
+
+
+class HandClassifier(Protocol):
+    """
+    The interface shared by GestureClassifier, GestureModel and TemplateMatcher,
+    so any of them can drive the application or be combined by
+    HybridGestureClassifier.
+    """
+
+    gestures: Tuple[str, ...]
+
+    def classify(self, hand_landmarks: Any) -> str: ...
+
+    def classify_with_confidence(self, hand_landmarks: Any) -> Tuple[str, float]: ...
+
+    def classify_batch(self, landmarks: np.ndarray, return_scores: bool = False,
+                       normalized: Optional[Tuple[np.ndarray, np.ndarray]] = None): ...
+
+
+class GestureModel:
+    """
+    Small learned gesture classifier: softmax regression or a one-hidden-layer
+    MLP on landmark_features().
+
+    Inference is the feature transform plus one or two matrix multiplies in
+    NumPy; the input standardization is folded into the first layer when the
+    model is built. Exposes the same classify() / classify_batch() interface
+    as GestureClassifier, so either can drive the application.
+    """
+
+    def __init__(self, labels: Sequence[str], layers: List[Tuple[np.ndarray, np.ndarray]],
+                 mean: np.ndarray, scale: np.ndarray, min_confidence: float = 0.0):
+        """
+        Initializes the GestureModel.
+
+        Args:
+            labels: Gesture name of each output.
+            layers: (weights, bias) per layer; hidden layers use ReLU.
+            mean: Per-feature mean used to standardize the inputs.
+            scale: Per-feature standard deviation used to standardize the inputs.
+            min_confidence: Predictions whose probability is below this are
+                            reported as "UNKNOWN".
+        """
+        self.labels = tuple(labels)
+        self.layers = [(np.asarray(w, dtype=np.float32), np.asarray(b, dtype=np.float32)) for w, b in layers]
+        self.mean = np.asarray(mean, dtype=np.float32)
+        self.scale = np.asarray(scale, dtype=np.float32)
+        self.min_confidence = min_confidence
+        self.gestures = ("UNKNOWN",) + tuple(label for label in self.labels if label != "UNKNOWN")
+        self._gesture_names = np.array(self.gestures)
+        self._columns = np.array([self.gestures.index(label) for label in self.labels], dtype=np.intp)
+
+        # Fold (x - mean) / scale into the first layer: x @ (W / scale) + (b - (mean / scale) @ W).
+        weights, bias = self.layers[0]
+        self._layers = [(weights / self.scale[:, None], bias - (self.mean / self.scale) @ weights)] + self.layers[1:]
+
+    def _logits(self, features: np.ndarray) -> np.ndarray:
+        activations = features
+        for weights, bias in self._layers[:-1]:
+            activations = np.maximum(activations @ weights + bias, 0.0)
+        weights, bias = self._layers[-1]
+        return activations @ weights + bias
+
+    def predict_proba(self, landmarks: np.ndarray, normalized: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Returns the class probabilities, one column per entry of self.labels.
+
+        Args:
+            landmarks: (21, 3) or (N, 21, 3) normalized landmarks.
+            normalized: normalize_landmarks(landmarks)[0], if already computed.
+        """
+        logits = self._logits(landmark_features(landmarks, normalized))
+        logits = np.exp(logits - logits.max(axis=-1, keepdims=True))
+        return logits / logits.sum(axis=-1, keepdims=True)
+
+    def classify(self, hand_landmarks: Any) -> str:
+        """
+        Classifies the gesture formed by a single hand.
+
+        Args:
+            hand_landmarks: A (21, 3) landmark array, HandLandmarks or MediaPipe
+                            landmark list.
+
+        Returns:
+            str: The most likely gesture name, or "UNKNOWN" if its probability
+                 is below min_confidence or the hand is degenerate.
+        """
+        if hand_landmarks is None:
+            return "UNKNOWN"
+        return self.classify_with_confidence(hand_landmarks)[0]
+
+    def classify_with_confidence(self, hand_landmarks: Any) -> Tuple[str, float]:
+        """Returns (gesture name or "UNKNOWN", probability of the most likely label) for one hand."""
+        hand = as_hand(hand_landmarks)
+        if hand.points.shape != (NUM_LANDMARKS, 3):
+            return "UNKNOWN", 0.0
+        features = landmark_features(hand.points, hand.normalized)
+        if not np.isfinite(features).all():
+            return "UNKNOWN", 0.0
+        logits = self._logits(features)
+        best = int(logits.argmax())
+        # Probability of the best class without normalizing the whole vector.
+        confidence = float(1.0 / np.exp(logits - logits[best]).sum())
+        if confidence < self.min_confidence:
+            return "UNKNOWN", confidence
+        return self.labels[best], confidence
+
+    def classify_batch(self, landmarks: np.ndarray, return_scores: bool = False,
+                       normalized: Optional[Tuple[np.ndarray, np.ndarray]] = None):
+        """
+        Classifies a stack of hand poses.
+
+        Args:
+            landmarks: Array of shape (N, 21, 3) with normalized landmarks.
+            return_scores: If True, also return the per-gesture probabilities.
+            normalized: normalize_landmarks(landmarks), if already computed.
+
+        Returns:
+            An (N,) array of gesture names. With return_scores, a tuple (names,
+            scores) where scores is an (N, len(gestures)) float32 array of class
+            probabilities (the UNKNOWN column is 0 unless it is a trained label).
+
+        Raises:
+            ValueError: If landmarks does not have shape (N, 21, 3).
+        """
+        points = np.asarray(landmarks, dtype=np.float32)
+        if points.ndim != 3 or points.shape[1:] != (NUM_LANDMARKS, 3):
+            raise ValueError(f"classify_batch expects an (N, {NUM_LANDMARKS}, 3) array, got shape {points.shape}.")
+        features = landmark_features(points, (normalized or normalize_landmarks(points))[0])
+        usable = np.isfinite(features).all(axis=1)
+        probabilities = np.zeros((len(points), len(self.labels)), dtype=np.float32)
+        if usable.any():
+            logits = self._logits(features[usable])
+            logits = np.exp(logits - logits.max(axis=1, keepdims=True))
+            probabilities[usable] = logits / logits.sum(axis=1, keepdims=True)
+        scores = np.zeros((len(points), len(self.gestures)), dtype=np.float32)
+        scores[:, self._columns] = probabilities
+        best = self._columns[probabilities.argmax(axis=1)]
+        usable &= probabilities.max(axis=1) >= self.min_confidence
+        names = self._gesture_names[np.where(usable, best, 0)]
+        if return_scores:
+            return names, scores
+        return names
+
+    def save(self, path: str):
+        """Saves the model as a compact .npz file."""
+        arrays = {"labels": np.array(self.labels), "mean": self.mean, "scale": self.scale}
+        for index, (weights, bias) in enumerate(self.layers):
+            arrays[f"weights_{index}"] = weights
+            arrays[f"bias_{index}"] = bias
+        np.savez_compressed(path, **arrays)
+
+    @classmethod
+    def load(cls, path: str, min_confidence: float = 0.0) -> 'GestureModel':
+        """Loads a model written by save()."""
+        with np.load(path, allow_pickle=False) as data:
+            layers = []
+            while f"weights_{len(layers)}" in data:
+                layers.append((data[f"weights_{len(layers)}"], data[f"bias_{len(layers)}"]))
+            if not layers:
+                raise ValueError(f"{path} does not contain a gesture model.")
+            return cls([str(label) for label in data["labels"]], layers, data["mean"], data["scale"],
+                       min_confidence=min_confidence)
+
+
+class HybridGestureClassifier:
+    """
+    Combines the rule-based GestureClassifier with a GestureModel (or any two
+    HandClassifiers, e.g. a TemplateMatcher).
+
+    Both see the same HandLandmarks, so the hand is normalized only once.
+
+    Modes:
+        "fallback": the rules decide; the model is asked only when they return UNKNOWN.
+        "override": the model decides when it is confident; the rules otherwise.
+    """
+
+    MODES = ("fallback", "override")
+
+    def __init__(self, rules: HandClassifier, model: HandClassifier, mode: str = "fallback"):
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown hybrid classifier mode '{mode}', expected one of {self.MODES}.")
+        self.rules = rules
+        self.model = model
+        self.mode = mode
+        self.gestures = tuple(dict.fromkeys(rules.gestures + model.gestures))
+        self._gesture_names = np.array(self.gestures)
+
+    def reset_tracking(self):
+        """Forgets per-hand state kept by either classifier (see GestureClassifier.reset_tracking())."""
+        for classifier in (self.rules, self.model):
+            reset = getattr(classifier, "reset_tracking", None)
+            if reset is not None:
+                reset()
+
+    def classify(self, hand_landmarks: Any) -> str:
+        """Classifies a single hand, see the class docstring for how the two are combined."""
+        if hand_landmarks is None:
+            return "UNKNOWN"
+        hand_landmarks = as_hand(hand_landmarks)
+        first, second = (self.rules, self.model) if self.mode == "fallback" else (self.model, self.rules)
+        gesture = first.classify(hand_landmarks)
+        return gesture if gesture != "UNKNOWN" else second.classify(hand_landmarks)
+
+    def classify_with_confidence(self, hand_landmarks: Any) -> Tuple[str, float]:
+        """Like classify(), also returning the confidence of whichever classifier decided."""
+        if hand_landmarks is None:
+            return "UNKNOWN", 0.0
+        hand_landmarks = as_hand(hand_landmarks)
+        first, second = (self.rules, self.model) if self.mode == "fallback" else (self.model, self.rules)
+        gesture, confidence = first.classify_with_confidence(hand_landmarks)
+        if gesture != "UNKNOWN":
+            return gesture, confidence
+        return second.classify_with_confidence(hand_landmarks)
+
+    def classify_batch(self, landmarks: np.ndarray, return_scores: bool = False,
+                       normalized: Optional[Tuple[np.ndarray, np.ndarray]] = None):
+        """
+        Classifies a stack of hand poses like classify() would.
+
+        With return_scores, scores hold the rule scores and model probabilities
+        side by side, mapped onto self.gestures (the higher of the two per gesture).
+        """
+        points = np.asarray(landmarks, dtype=np.float32)
+        if normalized is None and points.ndim == 3 and points.shape[1:] == (NUM_LANDMARKS, 3):
+            normalized = normalize_landmarks(points)
+        first, second = (self.rules, self.model) if self.mode == "fallback" else (self.model, self.rules)
+        first_names, first_scores = first.classify_batch(points, return_scores=True, normalized=normalized)
+        second_names, second_scores = second.classify_batch(points, return_scores=True, normalized=normalized)
+        names = np.where(first_names != "UNKNOWN", first_names, second_names)
+        if not return_scores:
+            return names
+        scores = np.zeros((len(names), len(self.gestures)), dtype=np.float32)
+        for source, source_scores in ((first, first_scores), (second, second_scores)):
+            columns = [self.gestures.index(name) for name in source.gestures]
+            scores[:, columns] = np.maximum(scores[:, columns], source_scores)
+        return names, scores
+
+
+# --- Training ---
+
+def train_model(landmarks: np.ndarray, labels: Sequence[str], hidden_units: int = 32, epochs: int = 200,
+                learning_rate: float = 0.01, weight_decay: float = 1e-4, batch_size: int = 256,
+                seed: int = 0) -> GestureModel:
+    """
+    Trains a GestureModel on recorded landmarks with mini-batch Adam.
+
+    Args:
+        landmarks: (N, 21, 3) landmark array.
+        labels: (N,) gesture name per pose.
+        hidden_units: Size of the hidden ReLU layer; 0 trains softmax regression.
+        epochs: Passes over the data.
+        learning_rate: Adam step size.
+        weight_decay: L2 penalty on the weights.
+        batch_size: Poses per gradient step.
+        seed: Random seed for initialization and shuffling.
+
+    Returns:
+        The trained GestureModel.
+    """
+    rng = np.random.default_rng(seed)
+    features = landmark_features(landmarks).astype(np.float64)
+    keep = np.isfinite(features).all(axis=1)
+    features = features[keep]
+    names, targets = np.unique(np.asarray(labels)[keep], return_inverse=True)
+    if len(names) < 2:
+        raise ValueError("Training needs poses of at least two gestures.")
+
+    mean = features.mean(axis=0)
+    scale = features.std(axis=0) + 1e-6
+    inputs = (features - mean) / scale
+    sizes = [NUM_FEATURES] + ([hidden_units] if hidden_units else []) + [len(names)]
+    params = []
+    for fan_in, fan_out in zip(sizes[:-1], sizes[1:]):
+        params += [rng.normal(0.0, np.sqrt(2.0 / fan_in), (fan_in, fan_out)), np.zeros(fan_out)]
+    moments = [np.zeros_like(p) for p in params]
+    velocities = [np.zeros_like(p) for p in params]
+    one_hot = np.eye(len(names))[targets]
+
+    step = 0
+    for _ in range(epochs):
+        order = rng.permutation(len(inputs))
+        for start in range(0, len(order), batch_size):
+            batch = order[start:start + batch_size]
+            # Forward pass, keeping each layer's input for the backward pass.
+            activations = [inputs[batch]]
+            for layer in range(0, len(params), 2):
+                output = activations[-1] @ params[layer] + params[layer + 1]
+                if layer + 2 < len(params):
+                    output = np.maximum(output, 0.0)
+                activations.append(output)
+            logits = activations[-1] - activations[-1].max(axis=1, keepdims=True)
+            probabilities = np.exp(logits)
+            probabilities /= probabilities.sum(axis=1, keepdims=True)
+
+            # Backward pass of the mean cross-entropy.
+            grad = (probabilities - one_hot[batch]) / len(batch)
+            grads = [None] * len(params)
+            for layer in range(len(params) - 2, -1, -2):
+                layer_input = activations[layer // 2]
+                grads[layer] = layer_input.T @ grad + weight_decay * params[layer]
+                grads[layer + 1] = grad.sum(axis=0)
+                if layer:
+                    grad = (grad @ params[layer].T) * (layer_input > 0.0)
+
+            step += 1
+            for p, g, m, v in zip(params, grads, moments, velocities):
+                m *= 0.9
+                m += 0.1 * g
+                v *= 0.999
+                v += 0.001 * g * g
+                p -= learning_rate * (m / (1.0 - 0.9 ** step)) / (np.sqrt(v / (1.0 - 0.999 ** step)) + 1e-8)
+
+    layers = [(params[i], params[i + 1]) for i in range(0, len(params), 2)]
+    return GestureModel([str(name) for name in names], layers, mean, scale)
+
+
+def load_dataset(paths: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Loads and concatenates recorded datasets.
+
+    Each .npz file holds "landmarks", an (N, 21, 3) array, and "labels", an (N,)
+    array of gesture names, as written by the record command.
+    """
+    landmarks, labels = [], []
+    for path in paths:
+        with np.load(path, allow_pickle=False) as data:
+            landmarks.append(np.asarray(data["landmarks"], dtype=np.float32).reshape(-1, NUM_LANDMARKS, 3))
+            labels.append(np.asarray(data["labels"]).astype(str))
+    return np.concatenate(landmarks), np.concatenate(labels)
+
+
+def _record(args: argparse.Namespace):
+    """Records the first hand of every camera frame under one label until 'q' is pressed."""
+    import cv2
+    from gestureflow.detector import HandDetector
+    from gestureflow.landmarks import hands_from_results
+
+    detector = HandDetector(max_num_hands=1, mirror_landmarks=True)
+    cap = cv2.VideoCapture(args.camera)
+    if not cap.isOpened():
+        raise SystemExit("Error: Could not open webcam.")
+    samples = []
+    print(f"Recording '{args.label}'. Hold the gesture in view; press 'q' to stop.")
+    try:
+        while True:
+            success, frame = cap.read()
+            if not success:
+                continue
+            landmarks_list, results = detector.process_frame(frame)
+            hands = hands_from_results(landmarks_list, results)
+            if hands:
+                samples.append(hands[0].points)
+            preview = detector.draw_landmarks(cv2.flip(frame, 1), results)
+            cv2.putText(preview, f"{args.label}: {len(samples)} samples", (10, 30),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 255, 0), 2)
+            cv2.imshow('GestureFlow Recorder', preview)
+            if cv2.waitKey(1) & 0xFF == ord('q'):
+                break
+    finally:
+        cap.release()
+        cv2.destroyAllWindows()
+        detector.close()
+    if samples:
+        np.savez_compressed(args.output, landmarks=np.stack(samples),
+                            labels=np.array([args.label] * len(samples)))
+        print(f"Saved {len(samples)} samples to {args.output}")
+
+
+def _train(args: argparse.Namespace):
+    landmarks, labels = load_dataset(args.datasets)
+    rng = np.random.default_rng(args.seed)
+    order = rng.permutation(len(labels))
+    holdout = order[:int(len(order) * args.validation)]
+    train = order[len(holdout):]
+    start = time.perf_counter()
+    model = train_model(landmarks[train], labels[train], hidden_units=args.hidden, epochs=args.epochs,
+                        learning_rate=args.learning_rate, weight_decay=args.weight_decay, seed=args.seed)
+    print(f"Trained on {len(train)} poses ({', '.join(model.labels)}) in {time.perf_counter() - start:.1f} s")
+    if len(holdout):
+        accuracy = (model.classify_batch(landmarks[holdout]) == labels[holdout]).mean()
+        print(f"Validation accuracy on {len(holdout)} poses: {accuracy:.3f}")
+    model.save(args.output)
+    print(f"Saved model to {args.output}")
+
+
+def _evaluate(args: argparse.Namespace):
+    model = GestureModel.load(args.model, min_confidence=args.min_confidence)
+    landmarks, labels = load_dataset(args.datasets)
+    predictions = model.classify_batch(landmarks)
+    print(f"Accuracy on {len(labels)} poses: {(predictions == labels).mean():.3f}")
+    for label in np.unique(labels):
+        mask = labels == label
+        print(f"  {label:<20} {(predictions[mask] == label).mean():.3f} ({mask.sum()} poses)")
+
+    hand = landmarks[0]
+    runs = 5000
+    start = time.perf_counter()
+    for _ in range(runs):
+        model.classify(hand)
+    print(f"classify(): {(time.perf_counter() - start) / runs * 1e6:.1f} us/hand")
+
+
+def main(argv: Optional[Sequence[str]] = None):
+    parser = argparse.ArgumentParser(description="Record landmark datasets and train GestureFlow gesture models.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    record = commands.add_parser("record", help="Record landmarks of one gesture from the webcam.")
+    record.add_argument("label", help="Gesture name, e.g. FIST")
+    record.add_argument("-o", "--output", required=True, help="Dataset .npz to write")
+    record.add_argument("--camera", type=int, default=0, help="Webcam index")
+    record.set_defaults(func=_record)
+
+    train = commands.add_parser("train", help="Train a model on recorded datasets.")
+    train.add_argument("datasets", nargs="+", help="Dataset .npz files")
+    train.add_argument("-o", "--output", default="gesture_model.npz", help="Model .npz to write")
+    train.add_argument("--hidden", type=int, default=32, help="Hidden units (0 for softmax regression)")
+    train.add_argument("--epochs", type=int, default=200)
+    train.add_argument("--learning-rate", type=float, default=0.01)
+    train.add_argument("--weight-decay", type=float, default=1e-4)
+    train.add_argument("--validation", type=float, default=0.2, help="Fraction of poses held out")
+    train.add_argument("--seed", type=int, default=0)
+    train.set_defaults(func=_train)
+
+    evaluate = commands.add_parser("evaluate", help="Report accuracy and latency of a model.")
+    evaluate.add_argument("model", help="Model .npz")
+    evaluate.add_argument("datasets", nargs="+", help="Dataset .npz files")
+    evaluate.add_argument("--min-confidence", type=float, default=0.0)
+    evaluate.set_defaults(func=_evaluate)
+
+    args = parser.parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
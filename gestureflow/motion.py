@@ -0,0 +1,169 @@
+# gestureflow/motion.py
+
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+
+class MotionGate:
+    """
+    Cheap scene-change detector based on tiny grayscale thumbnails.
+
+    Each frame is reduced to a small grayscale thumbnail (a nearest-neighbour
+    subsample followed by area averaging, so only a few thousand pixels are
+    touched) and compared with the thumbnail of the last frame that was let
+    through. Comparing against that reference rather than the immediately
+    preceding frame means slow movements still add up and open the gate.
+    """
+
+    def __init__(self, threshold: float = 4.0, thumbnail_size: Tuple[int, int] = (32, 24),
+                 oversample: int = 4):
+        """
+        Initializes the MotionGate.
+
+        Args:
+            threshold: Mean absolute grey-level difference (0-255) above which a
+                       frame counts as motion.
+            thumbnail_size: (width, height) of the comparison thumbnail.
+            oversample: The first subsampling step keeps oversample x oversample
+                        pixels per thumbnail pixel for the area average.
+        """
+        self.threshold = threshold
+        self.thumbnail_size = tuple(thumbnail_size)
+        self.oversample = oversample
+        self._reference: Optional[np.ndarray] = None
+        self.last_difference = 0.0
+
+    def thumbnail(self, frame: np.ndarray, is_rgb: bool = False) -> np.ndarray:
+        """Returns the float32 grayscale thumbnail of a BGR (or RGB) frame."""
+        width, height = self.thumbnail_size
+        small = cv2.resize(frame, (width * self.oversample, height * self.oversample),
+                           interpolation=cv2.INTER_NEAREST)
+        small = cv2.resize(small, (width, height), interpolation=cv2.INTER_AREA)
+        if small.ndim == 3:
+            small = cv2.cvtColor(small, cv2.COLOR_RGB2GRAY if is_rgb else cv2.COLOR_BGR2GRAY)
+        return small.astype(np.float32)
+
+    def check(self, frame: np.ndarray, is_rgb: bool = False) -> bool:
+        """
+        Tells whether the frame differs enough from the reference thumbnail.
+
+        The reference is replaced only when motion is reported (or on the first
+        frame), see also reset().
+
+        Returns:
+            True if motion was detected.
+        """
+        thumbnail = self.thumbnail(frame, is_rgb)
+        if self._reference is None or self._reference.shape != thumbnail.shape:
+            self._reference = thumbnail
+            self.last_difference = float('inf')
+            return True
+        self.last_difference = float(cv2.mean(cv2.absdiff(thumbnail, self._reference))[0])
+        if self.last_difference > self.threshold:
+            self._reference = thumbnail
+            return True
+        return False
+
+    def reset(self):
+        """Forgets the reference; the next frame always counts as motion."""
+        self._reference = None
+
+
+class MotionGatedDetector:
+    """
+    Wraps a HandDetector and skips inference on static scenes.
+
+    While a hand is tracked every frame goes to the detector. Otherwise the
+    MotionGate decides: if the scene has not changed since the last inference,
+    the heavy MediaPipe call is skipped and the last (empty) result reused.
+
+    Exposes the same process_frame() interface as HandDetector; other attributes
+    are forwarded to the wrapped detector.
+    """
+
+    def __init__(self, detector: Any, gate: Optional[MotionGate] = None, enabled: bool = True):
+        """
+        Initializes the MotionGatedDetector.
+
+        Args:
+            detector: The HandDetector (or another wrapper) to run.
+            gate: The MotionGate to use. A default one is created if None.
+            enabled: Whether gating is active. When False every frame goes to the
+                     detector; the flag can be flipped at runtime (e.g. by the
+                     idle power mode).
+        """
+        self.detector = detector
+        self.gate = gate or MotionGate()
+        self.enabled = enabled
+        # Whether the last frame showed motion or a tracked hand (always True while disabled)
+        self.motion_detected = False
+        self._last_output: Tuple[List[Any], Optional[Any]] = ([], None)
+        self._hand_tracked = False
+
+        # Counters (read via stats())
+        self.frames = 0
+        self.skipped = 0
+        self.inference_ms = 0.0   # EMA of the time one detector call takes
+        self.gate_ms = 0.0        # EMA of the time one gate check takes
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.detector, name)
+
+    def process_frame(self, frame: np.ndarray, is_rgb: bool = False) -> Tuple[List[Any], Optional[Any]]:
+        """
+        Returns fresh landmarks, or the previous ones if the scene is static.
+        See HandDetector.process_frame.
+        """
+        self.frames += 1
+        if not self.enabled:
+            self.motion_detected = True
+            self._last_output = self.detector.process_frame(frame, is_rgb=is_rgb)
+            self._hand_tracked = bool(self._last_output[0])
+            return self._last_output
+
+        if not self._hand_tracked:
+            start = time.perf_counter()
+            self.motion_detected = self.gate.check(frame, is_rgb)
+            self.gate_ms += 0.05 * ((time.perf_counter() - start) * 1000.0 - self.gate_ms)
+            if not self.motion_detected:
+                self.skipped += 1
+                return self._last_output
+        else:
+            self.motion_detected = True
+            # The scene changes constantly while a hand is present; once it
+            # leaves, the first hand-free frame becomes the new reference.
+            self.gate.reset()
+
+        start = time.perf_counter()
+        self._last_output = self.detector.process_frame(frame, is_rgb=is_rgb)
+        elapsed_ms = (time.perf_counter() - start) * 1000.0
+        self.inference_ms = elapsed_ms if self.inference_ms == 0.0 else \
+            self.inference_ms + 0.05 * (elapsed_ms - self.inference_ms)
+        self._hand_tracked = bool(self._last_output[0])
+        return self._last_output
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Returns the gate counters.
+
+        Returns:
+            A dictionary with the number of frames seen and skipped, the skip rate,
+            the average cost of a detector call and of a gate check (ms), and the
+            estimated detector time saved by skipping (seconds).
+        """
+        saved_ms = self.skipped * max(self.inference_ms - self.gate_ms, 0.0)
+        return {
+            "frames": self.frames,
+            "skipped": self.skipped,
+            "skip_rate": (self.skipped / self.frames) if self.frames else 0.0,
+            "inference_ms": self.inference_ms,
+            "gate_ms": self.gate_ms,
+            "saved_seconds": saved_ms / 1000.0,
+        }
+
+    def close(self):
+        """Releases the wrapped detector."""
+        self.detector.close()
@@ -0,0 +1,491 @@
+# gestureflow/pipeline.py
+
+import logging
+import multiprocessing as mp
+import queue
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from gestureflow.frame_ring import SharedFrameRing
+from gestureflow.landmarks import hands_from_results
+from gestureflow.preprocess import FramePreprocessor
+
+# Stage names, in pipeline order. Used for process names and statistics.
+STAGES = ("capture", "detect", "classify", "act")
+
+# How long a stage blocks on its input queue before re-checking the stop event
+_POLL_INTERVAL = 0.1
+
+
+def _put_latest(q: Any, item: Any, dropped: Any, ring: Optional[SharedFrameRing] = None) -> None:
+    """
+    Puts an item on a bounded queue, evicting the oldest entry if it is full.
+
+    Downstream stages only care about the newest data, so a slow consumer must
+    never block its producer. Every evicted (or refused) item increments the
+    shared `dropped` counter. When frames live in a SharedFrameRing, pass it as
+    `ring` so the slot referenced by a dropped item (always at index 2) is
+    released.
+    """
+    try:
+        q.put_nowait(item)
+        return
+    except queue.Full:
+        pass
+    try:
+        evicted = q.get_nowait()
+        _release_frame(ring, evicted[2])
+    except queue.Empty:
+        pass
+    with dropped.get_lock():
+        dropped.value += 1
+    try:
+        q.put_nowait(item)
+    except queue.Full:
+        # Another producer refilled the slot in the meantime; give up on this item.
+        _release_frame(ring, item[2])
+        with dropped.get_lock():
+            dropped.value += 1
+
+
+def _resolve_frame(ring: Optional[SharedFrameRing], frame_ref: Any) -> Optional[np.ndarray]:
+    """Turns a frame reference from a queue item into an image array."""
+    if ring is None:
+        return frame_ref  # Frames travel by value
+    slot, seq = frame_ref
+    return ring.view(slot, seq)
+
+
+def _release_frame(ring: Optional[SharedFrameRing], frame_ref: Any):
+    """Gives up the ownership a queue item holds on its frame slot."""
+    if ring is not None:
+        ring.release(frame_ref[0])
+
+
+def _get(q: Any, stop_event: Any) -> Optional[Any]:
+    """Blocks on a queue until an item arrives or the stop event is set."""
+    while not stop_event.is_set():
+        try:
+            return q.get(timeout=_POLL_INTERVAL)
+        except queue.Empty:
+            continue
+    return None
+
+
+def _capture_worker(camera_index: int, flip: bool, ring: Optional[SharedFrameRing], out_q: Any,
+                    stop_event: Any, counters: Dict[str, Any]) -> None:
+    """Capture stage: reads webcam frames and hands them to the detector."""
+    cap = cv2.VideoCapture(camera_index)
+    if not cap.isOpened():
+        logging.error(f"Pipeline capture: could not open webcam with index {camera_index}.")
+        stop_event.set()
+        return
+    if ring is not None:
+        height, width = ring.frame_shape[:2]
+        cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+    seq = 0
+    frame = None  # Reused as the read buffer when shapes stay constant
+    try:
+        while not stop_event.is_set():
+            success, frame = cap.read(frame)
+            if not success:
+                frame = None
+                time.sleep(0.01)
+                continue
+            seq += 1
+
+            if ring is None:
+                if flip:
+                    frame = cv2.flip(frame, 1)
+                frame_ref = frame
+                frame = None  # Ownership moves to the queue
+            else:
+                slot = ring.acquire()
+                if slot is None:
+                    # Every slot is still held downstream; drop this frame.
+                    with counters["capture_dropped"].get_lock():
+                        counters["capture_dropped"].value += 1
+                    continue
+                # Write straight into shared memory: flip/resize and copy in one pass.
+                dst = ring.frame(slot)
+                if frame.shape != dst.shape:
+                    cv2.resize(frame, (dst.shape[1], dst.shape[0]), dst=dst)
+                    if flip:
+                        cv2.flip(dst, 1, dst=dst)
+                elif flip:
+                    cv2.flip(frame, 1, dst=dst)
+                else:
+                    np.copyto(dst, frame)
+                ring.publish(slot, seq)
+                frame_ref = (slot, seq)
+
+            _put_latest(out_q, (seq, time.time(), frame_ref), counters["capture_dropped"], ring)
+            with counters["capture"].get_lock():
+                counters["capture"].value += 1
+    finally:
+        cap.release()
+        if ring is not None:
+            ring.close()
+
+
+def _detect_worker(detector_factory: Optional[Callable[..., Any]], detector_kwargs: dict, ring: Optional[SharedFrameRing], in_q: Any, out_q: Any,
+                   stop_event: Any, counters: Dict[str, Any], landmark_filter_kwargs: Optional[dict] = None) -> None:
+    """
+    Detection stage: runs MediaPipe Hands on every frame it receives, then
+    smooths the landmarks with a OneEuroLandmarkFilter if one is configured.
+    """
+    from gestureflow.detector import HandDetector
+    from gestureflow.tracking import OneEuroLandmarkFilter
+
+    detector = (detector_factory or HandDetector)(**detector_kwargs)
+    landmark_filter = OneEuroLandmarkFilter(**landmark_filter_kwargs) if landmark_filter_kwargs is not None else None
+    # Frames arrive already mirrored; only the RGB conversion is left, into a reused buffer.
+    preprocessor = FramePreprocessor(flip=False, display=False)
+    try:
+        while not stop_event.is_set():
+            item = _get(in_q, stop_event)
+            if item is None:
+                break
+            seq, timestamp, frame_ref = item
+            frame = _resolve_frame(ring, frame_ref)
+            if frame is None:
+                _release_frame(ring, frame_ref)
+                continue
+            _, rgb_frame = preprocessor.process(frame)
+            landmarks_list, results = detector.process_frame(rgb_frame, is_rgb=True)
+            # Downstream stages receive small (21, 3) arrays instead of protobufs.
+            hands = hands_from_results(landmarks_list, results)
+            if landmark_filter is not None:
+                hands = landmark_filter.filter_hands(hands, timestamp)
+            _put_latest(out_q, (seq, timestamp, frame_ref, hands), counters["detect_dropped"], ring)
+            with counters["detect"].get_lock():
+                counters["detect"].value += 1
+    finally:
+        detector.close()
+        if ring is not None:
+            ring.close()
+
+
+def _classify_worker(classifier_factory: Optional[Callable[..., Any]], classifier_kwargs: dict, ring: Optional[SharedFrameRing], in_q: Any, action_q: Any,
+                     display_q: Any, stop_event: Any, counters: Dict[str, Any], min_confidence: float = 0.0,
+                     vote_buffer_size: int = 1, vote_threshold: int = 1) -> None:
+    """
+    Classification stage: labels one detected hand and fans out the result.
+
+    The same hand is followed while it stays in view (PrimaryHandTracker);
+    when it changes, the classifier's finger state tracking and the votes
+    start over.
+
+    Gestures recognized with a confidence below min_confidence are shown as
+    "UNKNOWN" and never reach the action stage, so they neither trigger an
+    action nor reset its debounce. The remaining labels pass through a
+    GestureVoter, and display and actions receive its stable gesture.
+    """
+    from gestureflow.temporal import GestureVoter
+    from gestureflow.tracking import PrimaryHandTracker
+
+    if classifier_factory is None:
+        from gestureflow.classifier import GestureClassifier
+        classifier_factory = GestureClassifier
+
+    classifier = classifier_factory(**classifier_kwargs)
+    voter = GestureVoter(vote_buffer_size, vote_threshold)
+    primary_hand = PrimaryHandTracker()
+    reset_tracking = getattr(classifier, "reset_tracking", None)
+    if min_confidence > 0.0 and not hasattr(classifier, "classify_with_confidence"):
+        logging.warning(f"Pipeline classify: {type(classifier).__name__} reports no confidence; "
+                        f"gesture_recognition_threshold is ignored.")
+        min_confidence = 0.0
+    while not stop_event.is_set():
+        item = _get(in_q, stop_event)
+        if item is None:
+            break
+        seq, timestamp, frame_ref, hands = item
+        hand, switched = primary_hand.select(hands)
+        if switched:
+            if reset_tracking is not None:
+                reset_tracking()
+            voter.reset()
+        hand_landmarks = hand.points if hand is not None else None
+        if hand is None:
+            gesture, confidence = "UNKNOWN", 0.0
+        elif min_confidence > 0.0:
+            gesture, confidence = classifier.classify_with_confidence(hand)
+        else:
+            gesture, confidence = classifier.classify(hand), 1.0
+
+        if gesture != "UNKNOWN" and confidence < min_confidence:
+            gesture = "UNKNOWN"
+            with counters["classify_gated"].get_lock():
+                counters["classify_gated"].value += 1
+        else:
+            gesture = voter.update(gesture, confidence)
+            _put_latest(action_q, (seq, gesture, hand_landmarks), counters["classify_dropped"])
+        if display_q is not None:
+            _put_latest(display_q, (seq, timestamp, frame_ref, hand_landmarks, gesture),
+                        counters["display_dropped"], ring)
+        else:
+            _release_frame(ring, frame_ref)
+        with counters["classify"].get_lock():
+            counters["classify"].value += 1
+    if ring is not None:
+        ring.close()
+
+
+def _act_worker(config: dict, debounce_time: float, in_q: Any, stop_event: Any,
+                counters: Dict[str, Any]) -> None:
+    """
+    Action stage: executes the action mapped to each recognized gesture.
+
+    Repeats of a gesture are debounced by debounce_time, except mouse control,
+    which updates the pointer on every classified frame.
+    """
+    from gestureflow.actions import ActionHandler
+
+    action_handler = ActionHandler(config)
+    last_gesture = None
+    gesture_start_time = None
+    try:
+        while not stop_event.is_set():
+            item = _get(in_q, stop_event)
+            if item is None:
+                break
+            _, gesture, hand_landmarks = item
+            current_time = time.time()
+            if gesture != "UNKNOWN" and hand_landmarks is not None:
+                # Mouse control follows the hand on every frame; only discrete actions are debounced
+                if gesture != last_gesture or action_handler.moves_pointer(gesture) or \
+                   (gesture_start_time is None or current_time - gesture_start_time > debounce_time):
+                    action_handler.execute_action(gesture, hand_landmarks)
+                    last_gesture = gesture
+                    gesture_start_time = current_time
+            else:
+                last_gesture = "UNKNOWN"
+                gesture_start_time = None
+            with counters["act"].get_lock():
+                counters["act"].value += 1
+    finally:
+        action_handler.close()
+
+
+class GesturePipeline:
+    """
+    Runs capture, detection, classification and actions as separate processes.
+
+    Each stage lives in its own interpreter and talks to the next one through a
+    small bounded queue that always keeps the newest items, so a stall in one
+    stage (e.g. a slow MediaPipe inference or a blocking serial write) never
+    delays the others. On a multi-core host throughput is bounded by the slowest
+    stage rather than by the sum of all stages.
+
+    By default frames are written once into a SharedFrameRing and only slot
+    references cross process boundaries; detection and display read the same
+    shared-memory frame in place.
+
+    The calling process only receives annotated results for display via
+    get_result(); it does not need to touch the camera or the models.
+    """
+
+    def __init__(self, config: dict, camera_index: int = 0, detector_kwargs: Optional[dict] = None,
+                 detector_factory: Optional[Callable[..., Any]] = None,
+                 queue_size: int = 2, flip: bool = True, display: bool = True,
+                 debounce_time: float = 0.3, frame_shape: Optional[Tuple[int, int, int]] = (720, 1280, 3),
+                 shared_frames: bool = True, mirror_landmarks: bool = False,
+                 classifier_kwargs: Optional[dict] = None,
+                 classifier_factory: Optional[Callable[..., Any]] = None,
+                 min_confidence: float = 0.0, vote_buffer_size: int = 1, vote_threshold: int = 1,
+                 landmark_filter_kwargs: Optional[dict] = None):
+        """
+        Initializes the GesturePipeline. No process is started until start().
+
+        Args:
+            config: The application configuration, forwarded to ActionHandler.
+            camera_index: Index of the webcam to open in the capture process.
+            detector_kwargs: Keyword arguments for HandDetector (or the factory).
+            detector_factory: Optional picklable callable that builds the detector
+                              inside the detect process, e.g. to add wrappers
+                              such as AdaptiveResolutionDetector. Called with
+                              detector_kwargs. Defaults to HandDetector.
+            queue_size: Capacity of each inter-stage queue.
+            flip: Whether to mirror frames horizontally (selfie view).
+            display: Whether frames and results are forwarded for display.
+            debounce_time: Seconds before the same gesture may trigger again.
+            frame_shape: (height, width, channels) of the shared frame slots.
+                         Camera frames of another size are resized into them.
+            shared_frames: Pass frames through a SharedFrameRing (zero-copy)
+                           instead of pickling them through the queues.
+            mirror_landmarks: With flip enabled, keep frames unflipped through
+                              capture and detection and mirror the landmarks
+                              instead; only get_result() flips the frame for
+                              display. No flip happens at all when display is off.
+            classifier_kwargs: Keyword arguments for GestureClassifier
+                               (thresholds, gesture definitions) or the factory.
+            classifier_factory: Optional picklable callable that builds the
+                                classifier inside the classify process, e.g. a
+                                learned GestureModel. Called with
+                                classifier_kwargs. Defaults to GestureClassifier.
+            min_confidence: Gestures classified with a lower confidence (see
+                            classify_with_confidence()) are dropped before the
+                            action stage and counted as "classify_gated".
+                            0 disables the gate.
+            vote_buffer_size: Recent frames that vote on the gesture passed
+                              to display and actions (see GestureVoter).
+            vote_threshold: Votes a gesture needs within that window; 1
+                            passes every frame's label through unchanged.
+            landmark_filter_kwargs: Keyword arguments for a
+                                    OneEuroLandmarkFilter applied to all hands
+                                    in the detect process (min_cutoff, beta,
+                                    derivative_cutoff). None disables filtering.
+        """
+        self.config = config
+        self.camera_index = camera_index
+        self.detector_kwargs = detector_kwargs or {}
+        self.detector_factory = detector_factory
+        self.queue_size = queue_size
+        self.flip = flip
+        self.display = display
+        self.debounce_time = debounce_time
+        self.frame_shape = frame_shape
+        self.shared_frames = shared_frames
+        self.mirror_landmarks = flip and mirror_landmarks
+        self.classifier_kwargs = classifier_kwargs or {}
+        self.classifier_factory = classifier_factory
+        self.min_confidence = min_confidence
+        self.vote_buffer_size = vote_buffer_size
+        self.vote_threshold = vote_threshold
+        self.landmark_filter_kwargs = landmark_filter_kwargs
+        self._display_buffer: Optional[np.ndarray] = None
+
+        self._ctx = mp.get_context("spawn")  # MediaPipe and OpenCV are not fork-safe
+        self._stop_event = self._ctx.Event()
+        self._counters = {name: self._ctx.Value('l', 0) for name in STAGES}
+        for name in ("capture_dropped", "detect_dropped", "classify_dropped", "display_dropped", "classify_gated"):
+            self._counters[name] = self._ctx.Value('l', 0)
+        self._queues: Dict[str, Any] = {}
+        self._processes = []
+        self._ring: Optional[SharedFrameRing] = None
+        self._held_slot: Optional[int] = None  # Slot of the frame last returned by get_result()
+
+    def start(self) -> 'GesturePipeline':
+        """Creates the queues and launches one process per stage."""
+        if self._processes:
+            return self
+        self._stop_event.clear()
+        ctx = self._ctx
+        q = self._queues = {
+            "frames": ctx.Queue(self.queue_size),
+            "detections": ctx.Queue(self.queue_size),
+            "gestures": ctx.Queue(self.queue_size),
+            "display": ctx.Queue(self.queue_size) if self.display else None,
+        }
+        ring = None
+        if self.shared_frames:
+            # Every frame that can be in flight at once needs its own slot: three
+            # queues that carry frames, one item inside each of the three stages
+            # that hold a frame, plus the one held by the display.
+            ring = self._ring = SharedFrameRing(3 * self.queue_size + 4, self.frame_shape,
+                                                lock=ctx.Lock())
+        specs = [
+            ("capture", _capture_worker,
+             (self.camera_index, self.flip and not self.mirror_landmarks, ring, q["frames"],
+              self._stop_event, self._counters)),
+            ("detect", _detect_worker,
+             (self.detector_factory, dict(self.detector_kwargs, mirror_landmarks=self.mirror_landmarks),
+              ring, q["frames"], q["detections"], self._stop_event, self._counters, self.landmark_filter_kwargs)),
+            ("classify", _classify_worker,
+             (self.classifier_factory, self.classifier_kwargs, ring, q["detections"], q["gestures"], q["display"], self._stop_event, self._counters,
+              self.min_confidence, self.vote_buffer_size, self.vote_threshold)),
+            ("act", _act_worker,
+             (self.config, self.debounce_time, q["gestures"], self._stop_event, self._counters)),
+        ]
+        for name, target, args in specs:
+            process = ctx.Process(target=target, args=args, name=f"gestureflow-{name}", daemon=True)
+            process.start()
+            self._processes.append(process)
+        return self
+
+    def get_result(self, timeout: float = 1.0) -> Optional[Tuple[int, float, Any, Any, str]]:
+        """
+        Returns the newest classified frame for display.
+
+        Args:
+            timeout: Seconds to wait for a result.
+
+        With shared frames the returned frame is a view into shared memory; it
+        stays valid (and may be drawn on) until the next call to get_result().
+        In mirror_landmarks mode the frame is flipped here, into a reused buffer.
+
+        Returns:
+            A tuple (seq, capture_time, frame, hand_landmarks, gesture), where
+            hand_landmarks is the (21, 3) array of the first hand (or None), or None if
+            nothing arrived in time or display forwarding is disabled.
+        """
+        display_q = self._queues.get("display")
+        if display_q is None:
+            time.sleep(timeout)
+            return None
+        try:
+            seq, timestamp, frame_ref, hand_landmarks, gesture = display_q.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+        # The previous frame has been shown; hand its slot back to the capture stage.
+        if self._held_slot is not None:
+            self._ring.release(self._held_slot)
+            self._held_slot = None
+        frame = _resolve_frame(self._ring, frame_ref)
+        if frame is None:
+            _release_frame(self._ring, frame_ref)
+            return None
+        if self.mirror_landmarks:
+            if self._display_buffer is None or self._display_buffer.shape != frame.shape:
+                self._display_buffer = np.empty_like(frame)
+            frame = cv2.flip(frame, 1, dst=self._display_buffer)
+            _release_frame(self._ring, frame_ref)  # The flipped copy no longer needs the slot
+        elif self._ring is not None:
+            self._held_slot = frame_ref[0]
+        return seq, timestamp, frame, hand_landmarks, gesture
+
+    def is_running(self) -> bool:
+        """Returns True while no stage has requested shutdown and all stages are alive."""
+        return not self._stop_event.is_set() and all(p.is_alive() for p in self._processes)
+
+    def stats(self) -> Dict[str, int]:
+        """Returns the per-stage processed counts, per-queue drop counts and gated low-confidence gestures."""
+        stats = {name: counter.value for name, counter in self._counters.items()}
+        if self._ring is not None:
+            stats["slots_in_use"] = self._ring.in_use()
+        return stats
+
+    def stop(self, timeout: float = 2.0):
+        """
+        Shuts the pipeline down.
+
+        Sets the shared stop event so every stage leaves its loop and releases its
+        resources (camera, MediaPipe, serial port), then joins the processes.
+        Stages that do not exit within the timeout are terminated.
+        """
+        self._stop_event.set()
+        deadline = time.time() + timeout
+        for process in self._processes:
+            process.join(max(0.0, deadline - time.time()))
+        for process in self._processes:
+            if process.is_alive():
+                logging.warning(f"Pipeline stage {process.name} did not exit in time; terminating.")
+                process.terminate()
+                process.join(0.5)
+        for q in self._queues.values():
+            if q is not None:
+                # Undelivered items must not keep the feeder threads (and us) alive.
+                q.cancel_join_thread()
+                q.close()
+        self._processes = []
+        self._queues = {}
+        if self._ring is not None:
+            self._ring.close()  # Unlinks the shared memory block
+            self._ring = None
+            self._held_slot = None
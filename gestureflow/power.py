@@ -0,0 +1,113 @@
+# gestureflow/power.py
+
+import logging
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import cv2
+
+
+class IdlePowerManager:
+    """
+    Drops GestureFlow into a low-power idle mode when nobody is using it.
+
+    After `idle_timeout` seconds without a detected hand the manager:
+        - lowers the capture frame rate and resolution (through cv2 CAP_PROP_*
+          settings, queued on the FrameGrabber thread when one is used),
+        - enables the motion gate so only the cheap thumbnail comparison runs
+          instead of HandDetector.process_frame,
+        - throttles the processing loop to the idle frame rate, in case the
+          camera driver ignores the frame-rate request.
+    The first frame that shows motion or a hand goes straight to the detector
+    (the motion gate lets it through) and restores the active capture settings,
+    so the loop is back to full rate within one frame.
+    """
+
+    def __init__(self, capture: Any, gated_detector: Any, idle_timeout: float = 10.0,
+                 idle_fps: float = 5.0, idle_size: Optional[Tuple[int, int]] = (320, 240),
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Initializes the IdlePowerManager.
+
+        Args:
+            capture: The cv2.VideoCapture or FrameGrabber frames are read from.
+            gated_detector: The MotionGatedDetector wrapping the hand detector.
+            idle_timeout: Seconds without a hand before entering idle mode.
+            idle_fps: Capture frame rate requested (and enforced) while idle.
+            idle_size: Capture (width, height) requested while idle, or None to
+                       keep the resolution.
+            clock: Time source, in seconds.
+        """
+        self.capture = capture
+        self.gated_detector = gated_detector
+        self.idle_timeout = idle_timeout
+        self.idle_fps = idle_fps
+        self.idle_size = tuple(idle_size) if idle_size else None
+        self.clock = clock
+
+        self.idle = False
+        self._gate_was_enabled = gated_detector.enabled
+        self._active_properties: Dict[int, float] = {}
+        self._last_hand_time = clock()
+        self._last_frame_time = 0.0
+        self.idle_periods = 0
+
+    def _idle_properties(self) -> Dict[int, float]:
+        """Capture properties to apply while idle."""
+        properties = {cv2.CAP_PROP_FPS: float(self.idle_fps)}
+        if self.idle_size:
+            properties[cv2.CAP_PROP_FRAME_WIDTH] = float(self.idle_size[0])
+            properties[cv2.CAP_PROP_FRAME_HEIGHT] = float(self.idle_size[1])
+        return properties
+
+    def _enter_idle(self):
+        properties = self._idle_properties()
+        # Remember the active settings so waking up restores them exactly.
+        self._active_properties = {prop: self.capture.get(prop) for prop in properties}
+        for prop, value in properties.items():
+            self.capture.set(prop, value)
+        self._gate_was_enabled = self.gated_detector.enabled
+        self.gated_detector.enabled = True
+        self.idle = True
+        self.idle_periods += 1
+        logging.info(f"No hand for {self.idle_timeout:.0f}s: entering idle mode.")
+
+    def _wake(self):
+        for prop, value in self._active_properties.items():
+            if value > 0:  # Drivers report 0 for properties they do not support
+                self.capture.set(prop, value)
+        self.gated_detector.enabled = self._gate_was_enabled
+        self.idle = False
+        logging.info("Activity detected: leaving idle mode.")
+
+    def update(self, hand_present: bool) -> bool:
+        """
+        Updates the power state after a frame has been processed.
+
+        Args:
+            hand_present: Whether a hand was detected (or predicted) in the frame.
+
+        Returns:
+            True if the manager is (now) in idle mode.
+        """
+        now = self.clock()
+        if hand_present:
+            self._last_hand_time = now
+        if self.idle:
+            if hand_present or self.gated_detector.motion_detected:
+                self._last_hand_time = now  # Give the user a full timeout to raise a hand
+                self._wake()
+        elif now - self._last_hand_time > self.idle_timeout:
+            self._enter_idle()
+        return self.idle
+
+    def throttle(self):
+        """
+        Sleeps as needed to keep the loop at idle_fps while idle. Call once per
+        loop iteration, before reading the next frame.
+        """
+        if self.idle and self.idle_fps > 0:
+            remaining = self._last_frame_time + 1.0 / self.idle_fps - self.clock()
+            if remaining > 0:
+                time.sleep(remaining)
+        self._last_frame_time = self.clock()
@@ -0,0 +1,103 @@
+# gestureflow/preprocess.py
+
+from typing import Optional, Tuple
+
+import cv2
+import numpy as np
+
+
+class FramePreprocessor:
+    """
+    Prepares camera frames for inference and display in as few passes as possible.
+
+    A BGR camera frame needs to be mirrored (selfie view) for display and
+    converted to RGB, optionally downscaled, for MediaPipe. Doing this with
+    separate cv2.flip / cv2.cvtColor calls (and converting back for display)
+    costs several full-frame passes and allocations per frame. This class:
+        - writes into buffers that are allocated once and reused for every frame
+          of the same size;
+        - produces the mirrored RGB inference image in a single pass: flipping
+          each row of the frame viewed as (height, width * 3) bytes reverses the
+          pixel order and the B/G/R byte order at the same time;
+        - hands out the BGR frame for display directly, so nothing is converted
+          back from RGB.
+
+    The returned arrays are overwritten by the next call to process().
+    """
+
+    def __init__(self, flip: bool = True, inference_size: Optional[Tuple[int, int]] = None,
+                 display: bool = True, flip_inference: bool = True):
+        """
+        Initializes the FramePreprocessor.
+
+        Args:
+            flip: Whether to mirror frames horizontally.
+            inference_size: Optional (width, height) to resize the inference image
+                            to. None keeps the camera resolution.
+            display: Whether a BGR display frame is needed. When False (headless
+                     mode) the display pass is skipped entirely.
+            flip_inference: Whether the inference image is mirrored too. Set to
+                            False when the detector mirrors landmarks instead
+                            (HandDetector(mirror_landmarks=True)); only the
+                            display frame is flipped then.
+        """
+        self.flip = flip
+        self.inference_size = tuple(inference_size) if inference_size else None
+        self.display = display
+        self.flip_inference = flip_inference
+
+        # Reused output buffers, (re)allocated when the input size changes
+        self._display_buffer: Optional[np.ndarray] = None
+        self._resize_buffer: Optional[np.ndarray] = None
+        self._rgb_buffer: Optional[np.ndarray] = None
+
+    @staticmethod
+    def _buffer(buffer: Optional[np.ndarray], shape: Tuple[int, ...]) -> np.ndarray:
+        """Returns `buffer` if it has the requested shape, else a new uint8 array."""
+        if buffer is None or buffer.shape != shape:
+            return np.empty(shape, dtype=np.uint8)
+        return buffer
+
+    def _to_rgb(self, src: np.ndarray) -> np.ndarray:
+        """Converts (and mirrors, if enabled) a BGR image into the RGB buffer."""
+        self._rgb_buffer = rgb = self._buffer(self._rgb_buffer, src.shape)
+        if self.flip and self.flip_inference:
+            # Reversing each row's bytes mirrors the image and swaps BGR -> RGB in one pass.
+            height = src.shape[0]
+            cv2.flip(src.reshape(height, -1), 1, dst=rgb.reshape(height, -1))
+        else:
+            cv2.cvtColor(src, cv2.COLOR_BGR2RGB, dst=rgb)
+        return rgb
+
+    def process(self, frame: np.ndarray) -> Tuple[Optional[np.ndarray], np.ndarray]:
+        """
+        Prepares one frame.
+
+        Args:
+            frame: The BGR camera frame (height, width, 3), uint8. It is not modified.
+
+        Returns:
+            A tuple (display_frame, rgb_frame):
+            - display_frame: The BGR frame to draw on and show (mirrored if flip is
+              enabled), or None if display is disabled.
+            - rgb_frame: The RGB image for inference, at inference_size if set.
+        """
+        if not frame.flags.c_contiguous:
+            frame = np.ascontiguousarray(frame)
+
+        display_frame = None
+        if self.display:
+            if self.flip:
+                self._display_buffer = self._buffer(self._display_buffer, frame.shape)
+                display_frame = cv2.flip(frame, 1, dst=self._display_buffer)
+            else:
+                display_frame = frame  # Already in the right orientation and colour order
+
+        src = frame
+        if self.inference_size and (frame.shape[1], frame.shape[0]) != self.inference_size:
+            width, height = self.inference_size
+            self._resize_buffer = self._buffer(self._resize_buffer, (height, width, 3))
+            src = cv2.resize(frame, (width, height), dst=self._resize_buffer,
+                             interpolation=cv2.INTER_AREA)
+
+        return display_frame, self._to_rgb(src)
@@ -0,0 +1,182 @@
+# gestureflow/templates.py
+
+import logging
+from typing import Any, Optional, Sequence, Tuple
+
+import numpy as np
+
+from gestureflow.landmarks import NUM_LANDMARKS, as_hand, normalize_landmarks
+from gestureflow.model import NUM_FEATURES, landmark_features, load_dataset
+
+# Optional import - only needed to index large template sets
+try:
+    from scipy.spatial import cKDTree
+    SCIPY_AVAILABLE = True
+except ImportError:
+    SCIPY_AVAILABLE = False
+
+# Features are 20 landmarks x 3 coordinates; dividing the feature distance by
+# sqrt(20) gives the RMS landmark displacement in palm lengths.
+_RMS_SCALE = 1.0 / np.sqrt(NUM_FEATURES // 3)
+
+
+class TemplateMatcher:
+    """
+    Matches hands against recorded example poses (templates).
+
+    Templates and live hands are compared in the hand-aligned landmark space of
+    gestureflow.landmarks.normalize_landmarks, so position, size and in-plane
+    rotation do not matter. The distance is the RMS landmark displacement in
+    palm lengths; a hand takes the label of its nearest template(s) if that is
+    closer than max_distance.
+
+    Small template sets are searched by brute force with one matrix product;
+    large ones use a scipy KD-tree when scipy is installed.
+
+    Exposes the same classify() / classify_batch() interface as GestureClassifier.
+    """
+
+    def __init__(self, landmarks: np.ndarray, labels: Sequence[str], max_distance: float = 0.15,
+                 k: int = 1, index_threshold: int = 1024):
+        """
+        Initializes the TemplateMatcher.
+
+        Args:
+            landmarks: (M, 21, 3) template poses.
+            labels: (M,) gesture name of each template.
+            max_distance: Largest RMS landmark displacement (palm lengths) that
+                          still counts as a match.
+            k: Number of nearest templates that vote on the label.
+            index_threshold: Template count from which a KD-tree is used (if
+                             scipy is available).
+
+        Raises:
+            ValueError: If there are no usable templates.
+        """
+        features = landmark_features(landmarks).astype(np.float32)
+        labels = np.asarray(labels).astype(str)
+        usable = np.isfinite(features).all(axis=1)
+        if not usable.any():
+            raise ValueError("TemplateMatcher needs at least one usable template.")
+        self.templates = features[usable]
+        self.max_distance = max_distance
+        self.k = max(1, min(int(k), len(self.templates)))
+        self.labels, self._template_labels = np.unique(labels[usable], return_inverse=True)
+        self.gestures = ("UNKNOWN",) + tuple(str(label) for label in self.labels if label != "UNKNOWN")
+        self._gesture_names = np.array(self.gestures)
+        self._label_columns = np.array([self.gestures.index(label) for label in self.labels], dtype=np.intp)
+
+        self._squared_norms = np.square(self.templates).sum(axis=1)
+        self._tree = None
+        if SCIPY_AVAILABLE and len(self.templates) >= index_threshold:
+            self._tree = cKDTree(self.templates)
+        elif len(self.templates) >= index_threshold:
+            logging.info("scipy not found; matching %d templates by brute force.", len(self.templates))
+
+    @classmethod
+    def from_datasets(cls, paths: Sequence[str], **kwargs) -> 'TemplateMatcher':
+        """Builds a matcher from datasets recorded with `python -m gestureflow.model record`."""
+        landmarks, labels = load_dataset(paths)
+        return cls(landmarks, labels, **kwargs)
+
+    def _nearest(self, features: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Returns the (N, k) distances (feature units) and template indices nearest to each row."""
+        if self._tree is not None:
+            distances, indices = self._tree.query(features, k=self.k)
+            return distances.reshape(len(features), self.k), indices.reshape(len(features), self.k)
+        # |a - b|^2 = |a|^2 + |b|^2 - 2 a.b, with the cross term as one BLAS product.
+        squared = self._squared_norms - 2.0 * (features @ self.templates.T)
+        squared += np.square(features).sum(axis=1, keepdims=True)
+        if self.k == 1:
+            indices = squared.argmin(axis=1)[:, None]
+        else:
+            indices = np.argpartition(squared, self.k - 1, axis=1)[:, :self.k]
+        distances = np.sqrt(np.maximum(np.take_along_axis(squared, indices, axis=1), 0.0))
+        return distances, indices
+
+    def _vote(self, distances: np.ndarray, indices: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Turns neighbour distances into (label index, confidence) per row."""
+        distances = distances * _RMS_SCALE
+        # Confidence falls linearly from 1 at an exact match to 0 at max_distance.
+        weights = np.clip(1.0 - distances / self.max_distance, 0.0, 1.0)
+        if self.k == 1:
+            return self._template_labels[indices[:, 0]], weights[:, 0]
+        votes = np.zeros((len(indices), len(self.labels)))
+        np.add.at(votes, (np.arange(len(indices))[:, None], self._template_labels[indices]), weights)
+        best = votes.argmax(axis=1)
+        return best, votes[np.arange(len(best)), best] / self.k
+
+    def match(self, hand_landmarks: Any) -> Tuple[str, float, float]:
+        """
+        Finds the closest template label for a single hand.
+
+        Args:
+            hand_landmarks: A (21, 3) landmark array, HandLandmarks or MediaPipe
+                            landmark list.
+
+        Returns:
+            (label, distance, confidence): the label ("UNKNOWN" if nothing is
+            within max_distance), the RMS landmark displacement to the nearest
+            template in palm lengths, and a confidence in [0, 1].
+        """
+        hand = as_hand(hand_landmarks)
+        if hand.points.shape != (NUM_LANDMARKS, 3):
+            return "UNKNOWN", float('inf'), 0.0
+        features = landmark_features(hand.points, hand.normalized)[None]
+        if not np.isfinite(features).all():
+            return "UNKNOWN", float('inf'), 0.0
+        distances, indices = self._nearest(features)
+        label, confidence = self._vote(distances, indices)
+        distance = float(distances[0, 0] * _RMS_SCALE)
+        if confidence[0] <= 0.0:
+            return "UNKNOWN", distance, 0.0
+        return str(self.labels[label[0]]), distance, float(confidence[0])
+
+    def classify(self, hand_landmarks: Any) -> str:
+        """Returns the matched template label, or "UNKNOWN"."""
+        if hand_landmarks is None:
+            return "UNKNOWN"
+        return self.match(hand_landmarks)[0]
+
+    def classify_with_confidence(self, hand_landmarks: Any) -> Tuple[str, float]:
+        """Returns (matched template label or "UNKNOWN", confidence) for one hand."""
+        if hand_landmarks is None:
+            return "UNKNOWN", 0.0
+        label, _, confidence = self.match(hand_landmarks)
+        return label, confidence
+
+    def classify_batch(self, landmarks: np.ndarray, return_scores: bool = False,
+                       normalized: Optional[Tuple[np.ndarray, np.ndarray]] = None):
+        """
+        Matches a stack of hand poses.
+
+        Args:
+            landmarks: Array of shape (N, 21, 3) with normalized landmarks.
+            return_scores: If True, also return the per-gesture confidences.
+            normalized: normalize_landmarks(landmarks), if already computed.
+
+        Returns:
+            An (N,) array of gesture names. With return_scores, a tuple (names,
+            scores) where scores is an (N, len(gestures)) float32 array holding
+            the confidence of the matched label.
+
+        Raises:
+            ValueError: If landmarks does not have shape (N, 21, 3).
+        """
+        points = np.asarray(landmarks, dtype=np.float32)
+        if points.ndim != 3 or points.shape[1:] != (NUM_LANDMARKS, 3):
+            raise ValueError(f"classify_batch expects an (N, {NUM_LANDMARKS}, 3) array, got shape {points.shape}.")
+        features = landmark_features(points, (normalized or normalize_landmarks(points))[0])
+        usable = np.isfinite(features).all(axis=1)
+        labels = np.zeros(len(points), dtype=np.intp)
+        confidences = np.zeros(len(points))
+        if usable.any():
+            label, confidence = self._vote(*self._nearest(features[usable]))
+            labels[usable], confidences[usable] = label, confidence
+        columns = np.where(confidences > 0.0, self._label_columns[labels], 0)
+        names = self._gesture_names[columns]
+        if return_scores:
+            scores = np.zeros((len(points), len(self.gestures)), dtype=np.float32)
+            scores[np.arange(len(points)), columns] = np.where(columns > 0, confidences, 1.0)
+            return names, scores
+        return names
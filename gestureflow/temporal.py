@@ -0,0 +1,91 @@
+# gestureflow/temporal.py
+
+from typing import Dict, Tuple
+
+
+class GestureVoter:
+    """
+    Debounces per-frame gesture labels with a vote over the last few frames.
+
+    Keeps a fixed-size ring of the most recent labels (and their confidences)
+    together with a running count and confidence sum per label, so each
+    update() is O(1) whatever the window size. The stable gesture only changes
+    once a label holds at least `threshold` of the `buffer_size` slots; a
+    single misclassified frame never reaches the actions. It then stays while
+    it keeps a majority of the window (or `threshold` votes, if fewer) and
+    falls back to "UNKNOWN" once it loses it, so a gesture that was let go
+    does not linger while other labels flicker.
+
+    Use one voter per tracked hand.
+    """
+
+    def __init__(self, buffer_size: int = 3, threshold: int = 3):
+        """
+        Initializes the GestureVoter.
+
+        Args:
+            buffer_size: Number of recent frames that vote.
+            threshold: Votes a label needs within the window to become the
+                       stable gesture (1 reproduces the raw labels).
+
+        Raises:
+            ValueError: If buffer_size < 1 or threshold is not in [1, buffer_size].
+        """
+        buffer_size, threshold = int(buffer_size), int(threshold)
+        if buffer_size < 1 or not 1 <= threshold <= buffer_size:
+            raise ValueError(f"GestureVoter needs 1 <= threshold <= buffer_size, "
+                             f"got threshold={threshold}, buffer_size={buffer_size}.")
+        self.buffer_size = buffer_size
+        self.threshold = threshold
+        self._hold = min(threshold, buffer_size // 2 + 1)
+        self.reset()
+
+    def reset(self):
+        """Empties the window; the stable gesture falls back to "UNKNOWN"."""
+        self._labels = [None] * self.buffer_size
+        self._confidences = [0.0] * self.buffer_size
+        self._next = 0
+        self._counts: Dict[str, int] = {}
+        self._confidence_sums: Dict[str, float] = {}
+        self.gesture = "UNKNOWN"
+
+    def update(self, gesture: str, confidence: float = 1.0) -> str:
+        """
+        Adds one frame's label and returns the stable gesture.
+
+        Args:
+            gesture: The frame's gesture name ("UNKNOWN" when there is no hand
+                     or no match; it takes part in the vote like any label).
+            confidence: The classifier's confidence in that label.
+
+        Returns:
+            The stable gesture: the last label that reached the threshold while
+            it still holds the window, otherwise "UNKNOWN".
+        """
+        slot = self._next
+        evicted = self._labels[slot]
+        if evicted is not None:
+            self._counts[evicted] -= 1
+            self._confidence_sums[evicted] -= self._confidences[slot]
+        self._labels[slot] = gesture
+        self._confidences[slot] = confidence
+        self._next = slot + 1 if slot + 1 < self.buffer_size else 0
+
+        count = self._counts.get(gesture, 0) + 1
+        self._counts[gesture] = count
+        self._confidence_sums[gesture] = self._confidence_sums.get(gesture, 0.0) + confidence
+        if count >= self.threshold:
+            self.gesture = gesture
+        elif self._counts.get(self.gesture, 0) < self._hold:
+            self.gesture = "UNKNOWN"
+        return self.gesture
+
+    def votes(self, gesture: str) -> Tuple[int, float]:
+        """Returns (frames voting for gesture, their mean confidence) in the current window."""
+        count = self._counts.get(gesture, 0)
+        return count, (self._confidence_sums[gesture] / count if count else 0.0)
+
+    @property
+    def confidence(self) -> float:
+        """Mean confidence of the stable gesture's votes in the current window."""
+        return self.votes(self.gesture)[1]
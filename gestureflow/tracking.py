@@ -0,0 +1,341 @@
+# gestureflow/tracking.py
+
+import copy
+import math
+import time
+from collections import namedtuple
+from typing import Any, Callable, List, Optional, Tuple
+
+import numpy as np
+
+from gestureflow.landmarks import HandLandmarks
+
+# Stand-in for the MediaPipe results object on frames where inference was skipped
+PredictedResults = namedtuple('PredictedResults',
+                              ['multi_hand_landmarks', 'multi_handedness', 'multi_hand_world_landmarks'])
+
+
+def landmarks_to_array(landmarks_list: List[Any]) -> np.ndarray:
+    """Converts a list of MediaPipe hand landmark lists into a (hands, 21, 3) array."""
+    return np.array([[(lm.x, lm.y, lm.z) for lm in hand.landmark] for hand in landmarks_list],
+                    dtype=np.float32).reshape(len(landmarks_list), -1, 3)
+
+
+def match_hands(previous: Optional[np.ndarray], points: np.ndarray) -> np.ndarray:
+    """
+    Returns, for each hand in points, the index of the nearest hand in previous
+    by wrist position, or -1 if it has no counterpart.
+
+    Args:
+        previous: (hands, 21, 3) landmarks of the last frame, or None.
+        points: (hands, 21, 3) landmarks of the current frame.
+    """
+    matches = np.full(len(points), -1, dtype=np.int64)
+    if previous is None or len(previous) == 0:
+        return matches
+    distances = np.linalg.norm(points[:, None, 0, :2] - previous[None, :, 0, :2], axis=-1)
+    taken = set()
+    # Greedy assignment is exact for the one or two hands MediaPipe reports.
+    for new_idx, old_idx in zip(*np.unravel_index(np.argsort(distances, axis=None), distances.shape)):
+        if matches[new_idx] == -1 and old_idx not in taken:
+            matches[new_idx] = old_idx
+            taken.add(old_idx)
+    return matches
+
+
+class PrimaryHandTracker:
+    """
+    Follows the hand that a single-hand consumer (classification, actions)
+    looks at, across changes in MediaPipe's output order.
+
+    The followed hand is matched to the current frame by wrist position (see
+    match_hands()). When it disappears while another hand stays, the first
+    hand is picked and select() reports the switch, so state that belongs to
+    the old hand (finger state hysteresis, gesture votes) can be reset.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """Forgets the followed hand."""
+        self.points: Optional[np.ndarray] = None  # (hands, 21, 3) of the last frame
+        self.index = 0                            # Followed hand within points
+
+    def select(self, hands: List[Any]) -> Tuple[Optional[Any], bool]:
+        """
+        Picks the followed hand among this frame's hands.
+
+        Args:
+            hands: The frame's HandLandmarks, in detector order.
+
+        Returns:
+            (the followed hand or None when there is none, True if it is a
+            different hand than on the previous frame with hands).
+        """
+        if not hands:
+            self.reset()
+            return None, False
+        points = np.stack([hand.points for hand in hands])
+        index, switched = 0, False
+        if self.points is not None:
+            followed = np.flatnonzero(match_hands(self.points, points) == self.index)
+            if len(followed):
+                index = int(followed[0])
+            else:
+                switched = True
+        self.points, self.index = points, index
+        return hands[index], switched
+
+
+class LandmarkPredictor:
+    """
+    Constant-velocity model for every landmark of every tracked hand.
+
+    Each detection updates the per-landmark velocity (smoothed across
+    detections); in between, positions are extrapolated linearly from the last
+    detection. Hands are matched between detections by their wrist position so
+    a change in MediaPipe's output order does not produce bogus velocities.
+    """
+
+    def __init__(self, velocity_smoothing: float = 0.6, max_extrapolation_s: float = 0.2):
+        """
+        Initializes the LandmarkPredictor.
+
+        Args:
+            velocity_smoothing: Weight of the newest velocity measurement (0-1].
+            max_extrapolation_s: Longest time span to extrapolate over; beyond
+                                 that the prediction is frozen.
+        """
+        self.velocity_smoothing = velocity_smoothing
+        self.max_extrapolation_s = max_extrapolation_s
+        self.reset()
+
+    def reset(self):
+        """Forgets all tracked hands."""
+        self.points: Optional[np.ndarray] = None      # (hands, 21, 3) at the last detection
+        self.velocity: Optional[np.ndarray] = None    # (hands, 21, 3) in normalized units / second
+        self.timestamp: Optional[float] = None
+
+    def update(self, points: np.ndarray, timestamp: float):
+        """
+        Feeds a detection.
+
+        Args:
+            points: Detected landmarks, shape (hands, 21, 3).
+            timestamp: Capture time of the frame, in seconds.
+        """
+        points = np.asarray(points, dtype=np.float32)
+        velocity = np.zeros_like(points)
+        if self.timestamp is not None and timestamp > self.timestamp:
+            dt = timestamp - self.timestamp
+            for new_idx, old_idx in enumerate(match_hands(self.points, points)):
+                if old_idx < 0:
+                    continue
+                measured = (points[new_idx] - self.points[old_idx]) / dt
+                velocity[new_idx] = (self.velocity_smoothing * measured +
+                                     (1.0 - self.velocity_smoothing) * self.velocity[old_idx])
+        self.points = points
+        self.velocity = velocity
+        self.timestamp = timestamp
+
+    def predict(self, timestamp: float) -> Optional[np.ndarray]:
+        """
+        Extrapolates all tracked hands to a point in time.
+
+        Returns:
+            The predicted (hands, 21, 3) landmarks, or None if nothing is tracked.
+        """
+        if self.points is None:
+            return None
+        dt = min(max(timestamp - self.timestamp, 0.0), self.max_extrapolation_s)
+        return self.points + self.velocity * dt
+
+    def speed(self) -> float:
+        """Returns the fastest wrist speed among tracked hands (normalized units / second)."""
+        if self.velocity is None or len(self.velocity) == 0:
+            return 0.0
+        return float(np.max(np.linalg.norm(self.velocity[:, 0, :2], axis=-1)))
+
+
+class OneEuroLandmarkFilter:
+    """
+    One Euro filter (Casiez et al., CHI 2012) for every landmark of every hand.
+
+    An adaptive low-pass filter: at low speed the cutoff frequency stays near
+    min_cutoff and jitter is smoothed away; as a landmark moves faster the
+    cutoff rises by beta per unit of speed, so real motion passes with little
+    lag. All hands and coordinates are filtered together as one
+    (hands, 21, 3) array. Hands keep their filter state from frame to frame,
+    matched by wrist position (see match_hands); a hand without a counterpart
+    starts from its raw landmarks.
+    """
+
+    def __init__(self, min_cutoff: float = 1.0, beta: float = 10.0, derivative_cutoff: float = 1.0):
+        """
+        Initializes the OneEuroLandmarkFilter.
+
+        Args:
+            min_cutoff: Cutoff frequency (Hz) for a landmark at rest; lower
+                        means smoother but laggier.
+            beta: Cutoff increase (Hz) per unit of speed (image widths per
+                  second); higher means less lag on fast movements.
+            derivative_cutoff: Cutoff frequency (Hz) of the speed estimate.
+        """
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.derivative_cutoff = derivative_cutoff
+        self.reset()
+
+    def reset(self):
+        """Forgets all hands."""
+        self.points: Optional[np.ndarray] = None      # (hands, 21, 3) filtered landmarks
+        self.velocity: Optional[np.ndarray] = None    # (hands, 21, 3) filtered speed, units / second
+        self.timestamp: Optional[float] = None
+
+    @staticmethod
+    def _alpha(cutoff: Any, dt: float) -> Any:
+        """Smoothing factor of a first-order low-pass filter with the given cutoff (Hz)."""
+        return 1.0 / (1.0 + 1.0 / (2.0 * math.pi * cutoff * dt))
+
+    def filter(self, points: np.ndarray, timestamp: float) -> np.ndarray:
+        """
+        Filters one frame.
+
+        Args:
+            points: Landmarks of shape (hands, 21, 3).
+            timestamp: Capture time of the frame, in seconds.
+
+        Returns:
+            The filtered (hands, 21, 3) float32 landmarks, in the order of points.
+        """
+        points = np.asarray(points, dtype=np.float32)
+        if len(points) == 0:
+            self.reset()
+            return points
+        if self.points is None:
+            self.points, self.velocity, self.timestamp = points, np.zeros_like(points), timestamp
+            return points
+
+        dt = max(timestamp - self.timestamp, 1e-6)  # A repeated timestamp holds the previous output
+        if len(self.points) == 1 and len(points) == 1:
+            previous, previous_velocity = self.points, self.velocity
+        else:
+            matches = match_hands(self.points, points)
+            matched = (matches >= 0)[:, None, None]
+            previous = np.where(matched, self.points[matches], points)
+            previous_velocity = np.where(matched, self.velocity[matches], 0.0)
+
+        measured = (points - previous) / dt
+        velocity = previous_velocity + self._alpha(self.derivative_cutoff, dt) * (measured - previous_velocity)
+        cutoff = self.min_cutoff + self.beta * np.abs(velocity)
+        filtered = previous + self._alpha(cutoff, dt) * (points - previous)
+        self.points = filtered.astype(np.float32)
+        self.velocity = velocity.astype(np.float32)
+        self.timestamp = timestamp
+        return self.points
+
+    def filter_hands(self, hands: List[Any], timestamp: float) -> List[Any]:
+        """
+        Filters the HandLandmarks of one frame (see gestureflow.landmarks).
+
+        Returns:
+            New HandLandmarks with the filtered points, in the same order.
+        """
+        if not hands:
+            self.reset()
+            return hands
+        filtered = self.filter(np.stack([hand.points for hand in hands]), timestamp)
+        return [HandLandmarks(points, hand.handedness, hand.score) for points, hand in zip(filtered, hands)]
+
+
+class FrameSkippingDetector:
+    """
+    Wraps a HandDetector and runs inference only on every Nth frame.
+
+    In between, landmarks are extrapolated by a LandmarkPredictor, so the
+    classifier and mouse control still receive landmarks at the full camera
+    rate while inference cost drops by roughly a factor of N. A detection is
+    forced earlier when:
+        - no hand was found at the last detection (nothing to extrapolate),
+        - a hand's handedness score is below min_hand_score,
+        - a hand moves faster than max_speed (linear extrapolation degrades).
+
+    Exposes the same process_frame() interface as HandDetector; other attributes
+    are forwarded to the wrapped detector.
+    """
+
+    def __init__(self, detector: Any, interval: int = 3, min_hand_score: float = 0.8,
+                 max_speed: float = 1.5, predictor: Optional[LandmarkPredictor] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Initializes the FrameSkippingDetector.
+
+        Args:
+            detector: The HandDetector (or another wrapper) to run.
+            interval: Run inference on one frame out of every `interval`.
+            min_hand_score: Handedness confidence below which the next frame is
+                            always detected.
+            max_speed: Wrist speed (image widths per second) above which every
+                       frame is detected.
+            predictor: The LandmarkPredictor to use. A default one is created if None.
+            clock: Time source, in seconds.
+        """
+        self.detector = detector
+        self.interval = max(1, int(interval))
+        self.min_hand_score = min_hand_score
+        self.max_speed = max_speed
+        self.predictor = predictor or LandmarkPredictor()
+        self.clock = clock
+
+        self._last_landmarks: List[Any] = []   # Private copies rewritten on predicted frames
+        self._last_handedness: Optional[List[Any]] = None
+        self._low_confidence = False
+        self._frames_since_detection = 0
+        self.detections = 0
+        self.predictions = 0
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.detector, name)
+
+    def _needs_detection(self) -> bool:
+        """Decides whether the current frame must go through the detector."""
+        return (not self._last_landmarks or
+                self._frames_since_detection >= self.interval - 1 or
+                self._low_confidence or
+                self.predictor.speed() > self.max_speed)
+
+    def process_frame(self, frame: np.ndarray, is_rgb: bool = False) -> Tuple[List[Any], Optional[Any]]:
+        """
+        Returns detected or predicted landmarks for a frame. See HandDetector.process_frame.
+        """
+        now = self.clock()
+        if self._needs_detection():
+            landmarks_list, results = self.detector.process_frame(frame, is_rgb=is_rgb)
+            self._frames_since_detection = 0
+            self.detections += 1
+            if not landmarks_list:
+                self.predictor.reset()
+                self._last_landmarks = []
+                return landmarks_list, results
+
+            self.predictor.update(landmarks_to_array(landmarks_list), now)
+            # Detached copies: predicted frames overwrite their coordinates.
+            self._last_landmarks = [copy.deepcopy(hand) for hand in landmarks_list]
+            self._last_handedness = getattr(results, 'multi_handedness', None)
+            self._low_confidence = any(
+                hand.classification[0].score < self.min_hand_score
+                for hand in (self._last_handedness or []))
+            return landmarks_list, results
+
+        self._frames_since_detection += 1
+        self.predictions += 1
+        predicted = self.predictor.predict(now)
+        for hand, points in zip(self._last_landmarks, predicted):
+            for landmark, (x, y, z) in zip(hand.landmark, points.tolist()):
+                landmark.x, landmark.y, landmark.z = x, y, z
+        return self._last_landmarks, PredictedResults(self._last_landmarks, self._last_handedness, None)
+
+    def close(self):
+        """Releases the wrapped detector."""
+        self.detector.close()
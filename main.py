@@ -3,11 +3,11 @@
 
 import cv2
 import numpy as np
+import functools
 import json
 import sys
 import os
 import time
-import mediapipe as mp
 
 # --- Configuration ---
 CONFIG_FILE = 'config.json'
@@ -27,6 +27,34 @@ DEFAULT_CONFIG = {
         # Example: "OPEN_PALM": "mouse_click:left"
         # Example: "THUMBS_UP": "serial_write:LED_ON"
     },
+    # Extra gesture definitions (see GestureClassifier.DEFAULT_GESTURE_DEFINITIONS for the format).
+    # An entry named like a built-in gesture replaces it; {"name": "VICTORY", "enabled": false} removes one.
+    # Example: {"name": "PINCH", "fingers": {"middle": "E", "ring": "E", "pinky": "E"},
+    #           "constraints": [{"distance": ["THUMB_TIP", "INDEX_TIP"], "relative_to": "palm_width", "max": 0.3}]}
+    "gesture_definitions": [],
+    "gesture_thresholds": {}, # Overrides for GestureClassifier thresholds, e.g. {"FINGER_EXTEND_FACTOR": 1.4}
+    "track_finger_states": True, # Keep finger states across frames with hysteresis (FINGER_STATE_HYSTERESIS threshold)
+    "gesture_model": {
+        "enabled": False, # Use a learned model (python -m gestureflow.model train ...) instead of or alongside the rules
+        "path": "gesture_model.npz",
+        "mode": "fallback", # "replace": model only; "fallback": model when the rules say UNKNOWN; "override": rules when the model is unsure
+        "min_confidence": 0.7 # Model predictions below this probability count as UNKNOWN
+    },
+    "gesture_templates": {
+        "enabled": False, # Match hands against recorded example poses (python -m gestureflow.model record LABEL -o file.npz)
+        "paths": [], # Recorded dataset files; each sample's label becomes a gesture name
+        "mode": "fallback", # "fallback": templates when the classifier says UNKNOWN; "override": templates first
+        "max_distance": 0.15, # Largest RMS landmark offset (in palm lengths) that still matches
+        "k": 1 # Nearest templates voting on the label
+    },
+    "settings": {
+        # Recognized gestures with a lower confidence (0-1, see classify_with_confidence())
+        # are shown as UNKNOWN and trigger no action; 0 disables the check. A clean pose
+        # scores about 1 and a finger right on a threshold 0.5, so 0.6-0.7 drops borderline frames
+        "gesture_recognition_threshold": 0.0,
+        "gesture_buffer_size": 3, # Recent frames that vote on the gesture
+        "action_trigger_threshold": 3 # Votes a gesture needs in that window before it is shown and acted on
+    },
     "action_settings": {
         "serial_port": None, # e.g., "COM3" on Windows, "/dev/ttyACM0" on Linux
         "baud_rate": 9600,
@@ -41,6 +69,60 @@ DEFAULT_CONFIG = {
         "connection_color": [0, 0, 255], # Red
         "font_scale": 1.0,
         "thickness": 2
+    },
+    "preprocess": {
+        "flip_horizontally": True, # Mirror the image (selfie view)
+        "mirror_landmarks": False, # Detect on the unflipped frame and mirror the landmarks instead; only the display is flipped
+        "inference_size": None # Optional [width, height] to downscale the frame fed to MediaPipe
+    },
+    "roi_tracking": {
+        "enabled": False, # Run inference on a crop around the previous frame's hands instead of the full frame
+        "size": 256, # Side length (pixels) the crop is resized to before inference
+        "padding": 0.3, # Padding around the hand bounding box, as a fraction of its size
+        "redetect_interval": 30 # Force a full-frame detection every N frames to catch new hands
+    },
+    "adaptive_resolution": {
+        "enabled": False, # Step the inference resolution up/down to hold a latency target
+        "ladder": [1280, 960, 640, 480], # Candidate inference widths (pixels)
+        "target_latency_ms": 25.0, # Per-frame inference time to hold
+        "hysteresis": 0.15, # Dead band around the target (fraction) to avoid oscillation
+        "patience": 10, # Frames outside the band before switching
+        "cooldown": 30 # Frames to wait after a switch
+    },
+    "landmark_filter": {
+        "enabled": True, # Smooth landmark jitter (One Euro filter) before classification and mouse control
+        "min_cutoff": 1.0, # Hz at rest; lower = smoother, more lag
+        "beta": 10.0, # Cutoff increase per unit of speed (image widths / s); higher = less lag when moving
+        "derivative_cutoff": 1.0 # Hz, smoothing of the speed estimate
+    },
+    "frame_skipping": {
+        "enabled": False, # Run MediaPipe on every Nth frame and extrapolate landmarks in between
+        "interval": 3, # N: one detection every N frames
+        "min_hand_score": 0.8, # Detect on the next frame when handedness confidence drops below this
+        "max_speed": 1.5 # Detect every frame while a hand moves faster than this (image widths per second)
+    },
+    "motion_gate": {
+        "enabled": False, # Skip MediaPipe while no hand is tracked and the scene is static
+        "threshold": 4.0, # Mean grey-level change (0-255) of a tiny thumbnail that counts as motion
+        "thumbnail_size": [32, 24]
+    },
+    "idle_mode": {
+        "enabled": False, # Lower capture rate/resolution and run only the motion gate when nobody is around
+        "timeout_s": 10.0, # Seconds without a hand before going idle
+        "idle_fps": 5, # Capture frame rate while idle
+        "idle_width": 320, # Capture resolution while idle
+        "idle_height": 240
+    },
+    "capture": {
+        "threaded": True, # Read frames on a background thread, always process the newest one
+        "read_timeout": 1.0 # Seconds to wait for a new frame before reporting a read failure
+    },
+    "pipeline": {
+        "enabled": False, # Run capture, detection, classification and actions as separate processes
+        "queue_size": 2, # Capacity of each inter-stage queue (oldest items are dropped when full)
+        "shared_frames": True, # Pass frames between processes through shared memory instead of pickling
+        "frame_width": 1280, # Size of the shared frame slots; camera frames are resized to fit
+        "frame_height": 720
     }
 }
 
@@ -54,19 +136,26 @@ if gestureflow_path not in sys.path:
 
 # --- Import Custom Modules ---
 try:
-    from gestureflow.detector import GestureDetector
+    from gestureflow.detector import HandDetector
     from gestureflow.classifier import GestureClassifier
+    from gestureflow.model import GestureModel, HybridGestureClassifier
+    from gestureflow.templates import TemplateMatcher
     from gestureflow.actions import ActionHandler
+    from gestureflow.capture import FrameGrabber
+    from gestureflow.pipeline import GesturePipeline
+    from gestureflow.preprocess import FramePreprocessor
+    from gestureflow.adaptive import AdaptiveResolutionDetector, ResolutionController
+    from gestureflow.tracking import FrameSkippingDetector, OneEuroLandmarkFilter, PrimaryHandTracker
+    from gestureflow.motion import MotionGate, MotionGatedDetector
+    from gestureflow.power import IdlePowerManager
+    from gestureflow.temporal import GestureVoter
+    from gestureflow.landmarks import HAND_CONNECTIONS, as_landmark_array, hands_from_results
 except ImportError as e:
     print(f"Error importing GestureFlow modules: {e}")
     print("Please ensure 'gestureflow' directory exists and contains detector.py, classifier.py, and actions.py")
     print(f"Current sys.path: {sys.path}")
     sys.exit(1)
 
-# --- MediaPipe Drawing Utilities ---
-mp_drawing = mp.solutions.drawing_utils
-mp_hands = mp.solutions.hands
-
 # --- Helper Functions ---
 def load_config(config_path):
     """Loads configuration from a JSON file."""
@@ -94,7 +183,11 @@ def load_config(config_path):
         return DEFAULT_CONFIG
 
 def draw_visualization(frame, hand_landmarks, gesture, config):
-    """Draws landmarks and gesture text on the frame."""
+    """
+    Draws landmarks and gesture text on the frame.
+
+    hand_landmarks may be a HandLandmarks, a (21, 3) landmark array or None.
+    """
     vis_config = config.get('visualization', DEFAULT_CONFIG['visualization'])
     text_color = tuple(vis_config.get('text_color', [255, 255, 255]))
     landmark_color = tuple(vis_config.get('landmark_color', [0, 255, 0]))
@@ -105,37 +198,164 @@ def draw_visualization(frame, hand_landmarks, gesture, config):
     draw_bbox_flag = vis_config.get('draw_bounding_box', False)
 
     # Draw landmarks and connections
-    if hand_landmarks and draw_landmarks_flag:
-        mp_drawing.draw_landmarks(
-            frame,
-            hand_landmarks,
-            mp_hands.HAND_CONNECTIONS,
-            mp_drawing.DrawingSpec(color=landmark_color, thickness=thickness, circle_radius=thickness),
-            mp_drawing.DrawingSpec(color=connection_color, thickness=thickness, circle_radius=thickness)
-        )
+    if hand_landmarks is not None and draw_landmarks_flag:
+        h, w = frame.shape[:2]
+        # Pixel coordinates of all 21 landmarks in one vectorized step
+        pixels = (as_landmark_array(hand_landmarks)[:, :2] * (w, h)).astype(np.int32)
+        cv2.polylines(frame, list(pixels[HAND_CONNECTIONS]), False, connection_color, thickness, cv2.LINE_AA)
+        for x, y in pixels.tolist():
+            cv2.circle(frame, (x, y), thickness + 1, landmark_color, -1, cv2.LINE_AA)
 
         # Optional: Draw bounding box
         if draw_bbox_flag:
-            h, w, _ = frame.shape
-            x_coords = [lm.x * w for lm in hand_landmarks.landmark]
-            y_coords = [lm.y * h for lm in hand_landmarks.landmark]
-            if x_coords and y_coords:
-                x_min, x_max = int(min(x_coords)), int(max(x_coords))
-                y_min, y_max = int(min(y_coords)), int(max(y_coords))
-                padding = 20 # Add some padding
-                cv2.rectangle(frame, (x_min - padding, y_min - padding),
-                              (x_max + padding, y_max + padding), landmark_color, thickness)
+            x_min, y_min = pixels.min(axis=0).tolist()
+            x_max, y_max = pixels.max(axis=0).tolist()
+            padding = 20 # Add some padding
+            cv2.rectangle(frame, (x_min - padding, y_min - padding),
+                          (x_max + padding, y_max + padding), landmark_color, thickness)
 
     # Display the recognized gesture
     if gesture and gesture != "UNKNOWN":
         cv2.putText(frame, f"Gesture: {gesture}", (10, 30),
                     cv2.FONT_HERSHEY_SIMPLEX, font_scale, text_color, thickness, cv2.LINE_AA)
-    elif hand_landmarks:
+    elif hand_landmarks is not None:
          cv2.putText(frame, "Gesture: UNKNOWN", (10, 30),
                     cv2.FONT_HERSHEY_SIMPLEX, font_scale, text_color, thickness, cv2.LINE_AA)
 
     return frame
 
+def create_classifier(config):
+    """
+    Builds the gesture classifier described by the configuration: the rule
+    based GestureClassifier, a learned GestureModel, or both combined, with
+    optional template matching on top.
+    """
+    rules = GestureClassifier(thresholds=config.get('gesture_thresholds'),
+                              definitions=config.get('gesture_definitions', []),
+                              track_finger_states=config.get('track_finger_states', DEFAULT_CONFIG['track_finger_states']))
+    classifier = rules
+    model_config = config.get('gesture_model', DEFAULT_CONFIG['gesture_model'])
+    if model_config.get('enabled', False):
+        model = GestureModel.load(model_config.get('path', 'gesture_model.npz'),
+                                  min_confidence=model_config.get('min_confidence', 0.7))
+        mode = model_config.get('mode', 'fallback')
+        classifier = model if mode == 'replace' else HybridGestureClassifier(rules, model, mode=mode)
+
+    templates_config = config.get('gesture_templates', DEFAULT_CONFIG['gesture_templates'])
+    if templates_config.get('enabled', False) and templates_config.get('paths'):
+        matcher = TemplateMatcher.from_datasets(
+            templates_config['paths'],
+            max_distance=templates_config.get('max_distance', 0.15),
+            k=templates_config.get('k', 1)
+        )
+        classifier = HybridGestureClassifier(classifier, matcher, mode=templates_config.get('mode', 'fallback'))
+    return classifier
+
+def create_detector(config, **overrides):
+    """
+    Builds the hand detector described by the configuration.
+
+    Returns a HandDetector, wrapped by the optional performance stages that are
+    enabled in the config. Keyword arguments override HandDetector settings.
+    """
+    roi_config = config.get('roi_tracking', DEFAULT_CONFIG['roi_tracking'])
+    detector_kwargs = {
+        "min_detection_confidence": config.get('min_detection_confidence', DEFAULT_CONFIG['min_detection_confidence']),
+        "min_tracking_confidence": config.get('min_tracking_confidence', DEFAULT_CONFIG['min_tracking_confidence']),
+        "roi_tracking": roi_config.get('enabled', False),
+        "roi_size": roi_config.get('size', 256),
+        "roi_padding": roi_config.get('padding', 0.3),
+        "roi_redetect_interval": roi_config.get('redetect_interval', 30),
+    }
+    detector_kwargs.update(overrides)
+    detector = HandDetector(**detector_kwargs)
+
+    adaptive_config = config.get('adaptive_resolution', DEFAULT_CONFIG['adaptive_resolution'])
+    if adaptive_config.get('enabled', False):
+        controller = ResolutionController(
+            ladder=adaptive_config.get('ladder', [1280, 960, 640, 480]),
+            target_ms=adaptive_config.get('target_latency_ms', 25.0),
+            hysteresis=adaptive_config.get('hysteresis', 0.15),
+            patience=adaptive_config.get('patience', 10),
+            cooldown=adaptive_config.get('cooldown', 30)
+        )
+        detector = AdaptiveResolutionDetector(detector, controller)
+
+    skipping_config = config.get('frame_skipping', DEFAULT_CONFIG['frame_skipping'])
+    if skipping_config.get('enabled', False):
+        detector = FrameSkippingDetector(
+            detector,
+            interval=skipping_config.get('interval', 3),
+            min_hand_score=skipping_config.get('min_hand_score', 0.8),
+            max_speed=skipping_config.get('max_speed', 1.5)
+        )
+
+    # The idle power mode relies on the motion gate, so it is added (disabled)
+    # whenever idle mode is on.
+    motion_config = config.get('motion_gate', DEFAULT_CONFIG['motion_gate'])
+    idle_config = config.get('idle_mode', DEFAULT_CONFIG['idle_mode'])
+    if motion_config.get('enabled', False) or idle_config.get('enabled', False):
+        gate = MotionGate(
+            threshold=motion_config.get('threshold', 4.0),
+            thumbnail_size=motion_config.get('thumbnail_size', [32, 24])
+        )
+        detector = MotionGatedDetector(detector, gate, enabled=motion_config.get('enabled', False))
+
+    return detector
+
+def landmark_filter_kwargs(config):
+    """Returns the OneEuroLandmarkFilter settings from the configuration, or None if it is disabled."""
+    filter_config = config.get('landmark_filter', DEFAULT_CONFIG['landmark_filter'])
+    if not filter_config.get('enabled', False):
+        return None
+    return {
+        "min_cutoff": filter_config.get('min_cutoff', 1.0),
+        "beta": filter_config.get('beta', 10.0),
+        "derivative_cutoff": filter_config.get('derivative_cutoff', 1.0),
+    }
+
+def run_pipeline(config):
+    """Runs GestureFlow as a multi-process pipeline and displays its results."""
+    pipeline_config = config.get('pipeline', DEFAULT_CONFIG['pipeline'])
+    preprocess_config = config.get('preprocess', DEFAULT_CONFIG['preprocess'])
+    settings = config.get('settings', DEFAULT_CONFIG['settings'])
+    pipeline = GesturePipeline(
+        config,
+        camera_index=config.get('camera_index', DEFAULT_CONFIG['camera_index']),
+        detector_factory=functools.partial(create_detector, config),
+        queue_size=pipeline_config.get('queue_size', 2),
+        frame_shape=(pipeline_config.get('frame_height', 720), pipeline_config.get('frame_width', 1280), 3),
+        shared_frames=pipeline_config.get('shared_frames', True),
+        flip=preprocess_config.get('flip_horizontally', True),
+        mirror_landmarks=preprocess_config.get('mirror_landmarks', False),
+        classifier_factory=functools.partial(create_classifier, config),
+        min_confidence=settings.get('gesture_recognition_threshold', 0.0),
+        vote_buffer_size=settings.get('gesture_buffer_size', 3),
+        vote_threshold=settings.get('action_trigger_threshold', 3),
+        landmark_filter_kwargs=landmark_filter_kwargs(config),
+    )
+
+    print("Starting pipeline processes... Press 'q' to quit.")
+    pipeline.start()
+    try:
+        while pipeline.is_running():
+            result = pipeline.get_result(timeout=1.0)
+            if result is None:
+                continue
+            _, _, frame, hand_landmarks, gesture = result
+            cv2.imshow('GestureFlow Interface', draw_visualization(frame, hand_landmarks, gesture, config))
+            if cv2.waitKey(1) & 0xFF == ord('q'):
+                print("Exit key 'q' pressed. Shutting down.")
+                break
+    except KeyboardInterrupt:
+        print("Keyboard interrupt received. Shutting down.")
+    finally:
+        print("Stopping pipeline processes...")
+        pipeline.stop()
+        cv2.destroyAllWindows()
+        print(f"Pipeline stats: {pipeline.stats()}")
+        print("GestureFlow Interface stopped.")
+
 # --- Main Application ---
 def main():
     """Main application function."""
@@ -144,6 +364,10 @@ def main():
     # 1. Load Configuration
     config = load_config(CONFIG_FILE)
 
+    if config.get('pipeline', DEFAULT_CONFIG['pipeline']).get('enabled', False):
+        run_pipeline(config)
+        return
+
     # 2. Initialization
     try:
         # Webcam
@@ -154,22 +378,47 @@ def main():
             sys.exit(1)
         print(f"Webcam {camera_index} opened successfully.")
 
-        # Gesture Detector
-        detector = GestureDetector(
-            min_detection_confidence=config.get('min_detection_confidence', DEFAULT_CONFIG['min_detection_confidence']),
-            min_tracking_confidence=config.get('min_tracking_confidence', DEFAULT_CONFIG['min_tracking_confidence'])
+        # Threaded capture: keeps only the newest frame so slow inference
+        # does not let stale frames pile up in the driver queue.
+        capture_config = config.get('capture', DEFAULT_CONFIG['capture'])
+        if capture_config.get('threaded', True):
+            cap = FrameGrabber(cap, read_timeout=capture_config.get('read_timeout', 1.0)).start()
+            print("Threaded frame capture started.")
+
+        # Frame preprocessing: flip + colour conversion (+ resize) into reused buffers
+        preprocess_config = config.get('preprocess', DEFAULT_CONFIG['preprocess'])
+        flip = preprocess_config.get('flip_horizontally', True)
+        mirror_landmarks = flip and preprocess_config.get('mirror_landmarks', False)
+        preprocessor = FramePreprocessor(
+            flip=flip,
+            inference_size=preprocess_config.get('inference_size'),
+            flip_inference=not mirror_landmarks
         )
-        print("GestureDetector initialized.")
+
+        # Gesture Detector
+        detector = create_detector(config, mirror_landmarks=mirror_landmarks)
+        print("HandDetector initialized.")
 
         # Gesture Classifier
-        # Pass any necessary classification parameters from config if needed
-        classifier = GestureClassifier()
+        classifier = create_classifier(config)
         print("GestureClassifier initialized.")
 
         # Action Handler
         action_handler = ActionHandler(config)
         print("ActionHandler initialized.")
 
+        # Idle power mode
+        power_manager = None
+        idle_config = config.get('idle_mode', DEFAULT_CONFIG['idle_mode'])
+        if idle_config.get('enabled', False):
+            power_manager = IdlePowerManager(
+                cap, detector,
+                idle_timeout=idle_config.get('timeout_s', 10.0),
+                idle_fps=idle_config.get('idle_fps', 5),
+                idle_size=(idle_config.get('idle_width', 320), idle_config.get('idle_height', 240))
+            )
+            print("Idle power mode enabled.")
+
     except Exception as e:
         print(f"Initialization failed: {e}")
         if 'cap' in locals() and cap.isOpened():
@@ -181,46 +430,81 @@ def main():
     last_gesture = None
     gesture_start_time = None
     debounce_time = 0.3 # Seconds to wait before repeating an action for the same gesture
+    settings = config.get('settings', DEFAULT_CONFIG['settings'])
+    min_confidence = settings.get('gesture_recognition_threshold', 0.0)
+    # Single-frame flicker is voted away before it reaches the actions
+    voter = GestureVoter(settings.get('gesture_buffer_size', 3), settings.get('action_trigger_threshold', 3))
+    filter_kwargs = landmark_filter_kwargs(config)
+    landmark_filter = OneEuroLandmarkFilter(**filter_kwargs) if filter_kwargs is not None else None
+    # Finger state hysteresis and votes belong to one hand; follow it across hand order swaps
+    primary_hand = PrimaryHandTracker()
 
     try:
         while True:
             # Read frame
+            if power_manager:
+                power_manager.throttle()
             success, frame = cap.read()
             if not success:
                 print("Error: Failed to read frame from webcam.")
                 time.sleep(1) # Wait a bit before retrying
                 continue
 
-            # Flip the frame horizontally for a later selfie-view display
-            # Also convert the BGR image to RGB before processing
-            frame = cv2.flip(frame, 1)
-            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            # Mirror the frame for selfie-view display and build the RGB
+            # inference image in one go (no BGR -> RGB -> BGR round trip)
+            bgr_frame, rgb_frame = preprocessor.process(frame)
 
             # Process the frame
-            rgb_frame.flags.writeable = False # Optimize performance
-            results = detector.detect(rgb_frame)
-            rgb_frame.flags.writeable = True
-
-            # Convert back to BGR for OpenCV display
-            bgr_frame = cv2.cvtColor(rgb_frame, cv2.COLOR_RGB2BGR)
+            landmarks_list, results = detector.process_frame(rgb_frame, is_rgb=True)
+            if power_manager:
+                power_manager.update(bool(landmarks_list))
 
             recognized_gesture = "UNKNOWN"
+            confidence = 0.0
             hand_landmarks = None
+            if not landmarks_list:
+                primary_hand.reset()
+                if landmark_filter:
+                    landmark_filter.reset()
 
             # Check if hands were detected
-            if results.multi_hand_landmarks:
-                # For simplicity, process only the first detected hand
-                hand_landmarks = results.multi_hand_landmarks[0]
+            if landmarks_list:
+                # For simplicity, process only one hand, the same one while it
+                # stays in view. Landmarks are converted to a (21, 3) array
+                # once; every later stage works on that array.
+                hands = hands_from_results(landmarks_list, results)
+                if landmark_filter:
+                    # All hands are filtered so each keeps its own filter state
+                    hands = landmark_filter.filter_hands(hands, time.monotonic())
+                hand, switched = primary_hand.select(hands)
+                if switched:
+                    reset_tracking = getattr(classifier, 'reset_tracking', None)
+                    if reset_tracking:
+                        reset_tracking()
+                    voter.reset()
+                hand_landmarks = hand.points
+
+                # Classify gesture (the HandLandmarks object caches the
+                # normalized hand for every classifier that looks at it)
+                if min_confidence > 0.0:
+                    recognized_gesture, confidence = classifier.classify_with_confidence(hand)
+                else:
+                    recognized_gesture, confidence = classifier.classify(hand), 1.0
 
-                # Classify gesture
-                recognized_gesture = classifier.classify(hand_landmarks)
+            if recognized_gesture != "UNKNOWN" and confidence < min_confidence:
+                # Too unsure to act on; skip the frame without resetting the debounce
+                recognized_gesture = "UNKNOWN"
+            else:
+                # Frames without a hand vote UNKNOWN, so a lost hand releases the gesture
+                recognized_gesture = voter.update(recognized_gesture, confidence)
 
                 # Execute action (with debounce)
                 current_time = time.time()
-                if recognized_gesture != "UNKNOWN":
-                    if recognized_gesture != last_gesture or \
+                if recognized_gesture != "UNKNOWN" and hand_landmarks is not None:
+                    # Mouse control follows the hand on every frame; only discrete actions are debounced
+                    if recognized_gesture != last_gesture or action_handler.moves_pointer(recognized_gesture) or \
                        (gesture_start_time is None or current_time - gesture_start_time > debounce_time):
-                        action_handler.execute(recognized_gesture, hand_landmarks, frame.shape) # Pass landmarks and frame shape if needed by actions
+                        action_handler.execute_action(recognized_gesture, hand_landmarks) # Mouse control needs the landmarks
                         last_gesture = recognized_gesture
                         gesture_start_time = current_time
                 else:
@@ -228,7 +512,6 @@ def main():
                     last_gesture = "UNKNOWN"
                     gesture_start_time = None
 
-
             # Visualization
             visualized_frame = draw_visualization(bgr_frame, hand_landmarks, recognized_gesture, config)
 
@@ -247,10 +530,20 @@ def main():
     finally:
         # Cleanup
         print("Releasing resources...")
+        if isinstance(cap, FrameGrabber):
+            stats = cap.stats()
+            print(f"Capture stats: {stats['frames_captured']} captured, "
+                  f"{stats['frames_consumed']} processed, {stats['frames_dropped']} dropped "
+                  f"({stats['drop_rate']:.1%}).")
+        if isinstance(detector, MotionGatedDetector):
+            stats = detector.stats()
+            print(f"Motion gate: skipped {stats['skipped']} of {stats['frames']} frames "
+                  f"({stats['skip_rate']:.1%}), saving ~{stats['saved_seconds']:.1f}s of inference.")
         if cap.isOpened():
             cap.release()
         cv2.destroyAllWindows()
-        action_handler.cleanup() # Allow action handler to release resources (e.g., serial port)
+        detector.close()
+        action_handler.close() # Allow action handler to release resources (e.g., serial port)
         print("GestureFlow Interface stopped.")
 
 if __name__ == "__main__":
@@ -0,0 +1,25 @@
+# tests/conftest.py
+
+import os
+import sys
+
+import pytest
+
+# Make the gestureflow package importable without installing it (as main.py does)
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from gestureflow._synthetic import perturbed_hands as _perturbed_hands, synthetic_hand
+
+
+@pytest.fixture
+def make_hand():
+    """The synthetic_hand builder."""
+    return synthetic_hand
+
+
+@pytest.fixture
+def perturbed_hands():
+    """5000 noisy poses covering every combination of extended fingers."""
+    return _perturbed_hands(5000)
@@ -0,0 +1,78 @@
+# tests/test_adaptive.py
+
+import numpy as np
+import pytest
+
+from gestureflow.adaptive import AdaptiveResolutionDetector, ResolutionController
+
+
+def feed(controller, latency_ms, frames):
+    """Feeds a constant latency and returns the width chosen after each frame."""
+    return [controller.update(latency_ms) for _ in range(frames)]
+
+
+def test_steps_down_under_load_and_back_up():
+    controller = ResolutionController(target_ms=25.0)
+    assert feed(controller, 60.0, 500)[-1] == 480
+    assert feed(controller, 2.0, 500)[-1] == 1280
+    assert controller.switches == 6
+
+
+def test_patience_and_cooldown_space_the_switches():
+    controller = ResolutionController(target_ms=25.0, patience=5, cooldown=20)
+    widths = feed(controller, 60.0, 200)
+    switch_frames = [i for i in range(1, len(widths)) if widths[i] != widths[i - 1]]
+    # The first check runs on frame `cooldown`; the band must then be violated `patience` times
+    first = 20 + 5 - 2  # 0-based index of the frame whose update switches
+    assert widths[:first] == [1280] * first
+    assert switch_frames == [first, first + 24, first + 48]
+    assert widths[-1] == 480
+
+
+def test_no_switch_inside_the_band():
+    controller = ResolutionController(ladder=(1280, 640), target_ms=25.0, cooldown=5)
+    # Just under 115% of the target: too slow to be comfortable, not slow enough to step down
+    assert set(feed(controller, 28.0, 300)) == {1280}
+    assert feed(controller, 100.0, 100)[-1] == 640
+    # At 640 px, 6 ms predicts 24 ms at 1280 px: above 85% of the target, so no step up
+    assert set(feed(controller, 6.0, 500)) == {640}
+    assert controller.switches == 1
+
+
+def test_no_switch_during_cooldown():
+    controller = ResolutionController(target_ms=25.0, patience=1, cooldown=50)
+    assert set(feed(controller, 200.0, 49)) == {1280}
+    assert controller.update(200.0) == 960
+    assert set(feed(controller, 200.0, 49)) == {960}
+
+
+def test_inference_size():
+    controller = ResolutionController(ladder=(640,))
+    assert controller.inference_size((720, 1280, 3)) == (640, 360)
+    assert controller.inference_size((480, 640, 3)) is None
+    with pytest.raises(ValueError):
+        ResolutionController(ladder=())
+
+
+class FakeDetector:
+    def __init__(self):
+        self.shapes = []
+        self.closed = False
+
+    def process_frame(self, frame, is_rgb=False):
+        self.shapes.append(frame.shape)
+        return [], None
+
+    def close(self):
+        self.closed = True
+
+
+def test_detector_runs_at_the_selected_width():
+    fake = FakeDetector()
+    detector = AdaptiveResolutionDetector(fake, ResolutionController(ladder=(640, 320)))
+    detector.process_frame(np.zeros((720, 1280, 3), dtype=np.uint8))
+    detector.process_frame(np.zeros((240, 320, 3), dtype=np.uint8))
+    assert fake.shapes == [(360, 640, 3), (240, 320, 3)]
+    assert detector.controller.average_ms is not None
+    detector.close()
+    assert fake.closed
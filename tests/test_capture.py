@@ -0,0 +1,83 @@
+# tests/test_capture.py
+
+import threading
+
+import numpy as np
+
+from gestureflow.capture import FrameGrabber
+
+
+class FakeCapture:
+    """Delivers numbered frames when the test allows it."""
+
+    def __init__(self):
+        self.allowed = threading.Semaphore(0)
+        self.count = 0
+        self.properties = {}
+
+    def read(self):
+        if not self.allowed.acquire(timeout=0.01):
+            return False, None
+        self.count += 1
+        return True, np.full((2, 2), self.count, dtype=np.uint8)
+
+    def set(self, prop, value):
+        self.properties[prop] = value
+        return True
+
+    def get(self, prop):
+        return self.properties.get(prop, 0.0)
+
+    def isOpened(self):
+        return True
+
+    def release(self):
+        pass
+
+
+def wait_for_captured(grabber, count):
+    for _ in range(500):
+        if grabber.frames_captured >= count:
+            return
+        threading.Event().wait(0.002)
+    raise AssertionError(f"only {grabber.frames_captured} frames captured")
+
+
+def test_latest_frame_wins():
+    capture = FakeCapture()
+    grabber = FrameGrabber(capture, read_timeout=0.5).start()
+    try:
+        for _ in range(3):
+            capture.allowed.release()
+        wait_for_captured(grabber, 3)
+        success, frame = grabber.read()
+        assert success and frame[0, 0] == 3
+        stats = grabber.stats()
+        assert stats["frames_dropped"] == 2 and stats["frames_consumed"] == 1
+    finally:
+        grabber.release()
+
+
+def test_read_times_out_without_new_frame():
+    capture = FakeCapture()
+    grabber = FrameGrabber(capture).start()
+    try:
+        capture.allowed.release()
+        wait_for_captured(grabber, 1)
+        assert grabber.read(timeout=0.5)[0]
+        assert grabber.read(timeout=0.05) == (False, None)
+    finally:
+        grabber.release()
+
+
+def test_properties_are_applied_by_the_capture_thread():
+    capture = FakeCapture()
+    grabber = FrameGrabber(capture).start()
+    try:
+        assert grabber.set(5, 15.0)
+        assert grabber.get(5) == 15.0
+        capture.allowed.release()
+        wait_for_captured(grabber, 1)
+        assert capture.properties[5] == 15.0
+    finally:
+        grabber.release()
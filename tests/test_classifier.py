@@ -0,0 +1,138 @@
+# tests/test_classifier.py
+
+import numpy as np
+import pytest
+
+from gestureflow.classifier import GestureClassifier
+
+
+@pytest.mark.parametrize("extended, gesture", [
+    ((0, 0, 0, 0, 0), "FIST"),
+    ((1, 1, 1, 1, 1), "OPEN_PALM"),
+    ((1, 0, 0, 0, 0), "THUMBS_UP"),
+    ((0, 1, 0, 0, 0), "POINTING_UP"),
+    ((0, 1, 1, 0, 0), "VICTORY"),
+    ((0, 1, 1, 1, 0), "THREE_FINGERS_UP"),
+    ((1, 1, 0, 0, 1), "SPIDERMAN"),
+    ((0, 1, 0, 0, 1), "ROCK"),
+    ((1, 0, 0, 0, 1), "CALL_ME"),
+    ((1, 0, 1, 0, 1), "UNKNOWN"),
+])
+def test_canonical_poses(make_hand, extended, gesture):
+    assert GestureClassifier().classify(make_hand(extended)) == gesture
+
+
+@pytest.mark.parametrize("extended, gesture, score", [
+    ((0, 0, 0, 0, 0), "FIST", 0.964),
+    ((0, 1, 1, 1, 0), "THREE_FINGERS_UP", 0.964),
+    ((0, 1, 0, 0, 1), "ROCK", 0.964),
+    ((1, 1, 1, 1, 1), "OPEN_PALM", 1.0),
+    ((1, 0, 0, 0, 0), "THUMBS_UP", 1.0),
+    ((0, 1, 0, 0, 0), "POINTING_UP", 1.0),
+    ((1, 1, 0, 0, 1), "SPIDERMAN", 1.0),
+    ((1, 0, 0, 0, 1), "CALL_ME", 1.0),
+])
+def test_canonical_pose_scores(make_hand, extended, gesture, score):
+    classifier = GestureClassifier()
+    assert classifier.classify_with_confidence(make_hand(extended)) == (gesture, pytest.approx(score, abs=1e-3))
+
+
+def test_derived_pose_scores(make_hand):
+    classifier = GestureClassifier()
+    victory = make_hand((0, 1, 1, 0, 0))
+    victory[8, 0] -= 0.03
+    victory[12, 0] += 0.03
+    thumbs_up = make_hand((1, 0, 0, 0, 0))
+    thumbs_down = thumbs_up.copy()
+    thumbs_down[:, :2] = 2 * thumbs_up[0, :2] - thumbs_up[:, :2]
+    ok_sign = make_hand((0, 0, 1, 1, 1))
+    ok_sign[4] = ok_sign[8]
+    for hand, gesture in ((victory, "VICTORY"), (thumbs_down, "THUMBS_DOWN"), (ok_sign, "OK_SIGN")):
+        assert classifier.classify_with_confidence(hand) == (gesture, pytest.approx(1.0))
+
+
+def test_held_gesture_keeps_its_score(make_hand):
+    classifier = GestureClassifier(track_finger_states=True)
+    hand = make_hand((0, 1, 0, 0, 0))
+    assert classifier.classify(hand) == "POINTING_UP"
+    # Bend the index finger into the hysteresis band, below the enter threshold
+    bent = hand.copy()
+    bent[8] = bent[5] + (bent[8] - bent[5]) * 0.65
+    gesture, confidence = classifier.classify_with_confidence(bent)
+    assert gesture == "POINTING_UP" and confidence > 0.5
+    assert GestureClassifier().classify(bent) != "POINTING_UP"
+
+
+def test_reset_tracking_forgets_held_fingers(make_hand):
+    classifier = GestureClassifier(track_finger_states=True)
+    hand = make_hand((0, 1, 0, 0, 0))
+    bent = hand.copy()
+    bent[8] = bent[5] + (bent[8] - bent[5]) * 0.65
+    classifier.classify(hand)
+    classifier.reset_tracking()
+    assert classifier.classify(bent) == GestureClassifier().classify(bent)
+
+
+def test_fingers_pressed_together(make_hand):
+    hand = make_hand((0, 1, 1, 0, 0))
+    hand[12, 0] = hand[8, 0] + 0.02
+    assert GestureClassifier().classify(hand) == "INDEX_AND_MIDDLE_UP"
+
+
+def test_invalid_input_is_unknown():
+    classifier = GestureClassifier()
+    assert classifier.classify(None) == "UNKNOWN"
+    assert classifier.classify(np.zeros((5, 3), dtype=np.float32)) == "UNKNOWN"
+
+
+def test_batch_matches_single(perturbed_hands):
+    classifier = GestureClassifier()
+    names, scores = classifier.classify_batch(perturbed_hands, return_scores=True)
+    assert list(names) == [classifier.classify(hand) for hand in perturbed_hands]
+    single = np.stack([classifier.score(hand) for hand in perturbed_hands])
+    np.testing.assert_allclose(scores, single, atol=1e-5)
+
+
+def test_batch_rejects_bad_shape():
+    with pytest.raises(ValueError):
+        GestureClassifier().classify_batch(np.zeros((4, 20, 3)))
+
+
+def test_scores_agree_with_decisions(perturbed_hands):
+    classifier = GestureClassifier()
+    names, scores = classifier.classify_batch(perturbed_hands, return_scores=True)
+    columns = [classifier.gestures.index(name) for name in names]
+    chosen = scores[np.arange(len(names)), columns]
+    assert (chosen[names != "UNKNOWN"] >= 0.5).all()
+
+
+def test_confidence_matches_score(perturbed_hands):
+    classifier = GestureClassifier()
+    for hand in perturbed_hands[:200]:
+        gesture, confidence = classifier.classify_with_confidence(hand)
+        assert gesture == classifier.classify(hand)
+        assert confidence == pytest.approx(classifier.score(hand)[classifier.gestures.index(gesture)], abs=1e-5)
+
+
+def test_tracking_without_hysteresis_matches_untracked(perturbed_hands):
+    plain = GestureClassifier()
+    tracked = GestureClassifier(thresholds={"FINGER_STATE_HYSTERESIS": 0.0}, track_finger_states=True)
+    assert [tracked.classify(hand) for hand in perturbed_hands] == [plain.classify(hand) for hand in perturbed_hands]
+
+
+def test_rotation_and_scale_invariance(make_hand):
+    classifier = GestureClassifier()
+    hand = make_hand((0, 1, 1, 1, 0))
+    angle = 0.4
+    rotation = np.array([[np.cos(angle), -np.sin(angle), 0.0],
+                         [np.sin(angle), np.cos(angle), 0.0],
+                         [0.0, 0.0, 1.0]], dtype=np.float32)
+    moved = ((hand - hand[0]) @ rotation * 1.7 + 0.3).astype(np.float32)
+    assert classifier.classify(moved) == classifier.classify(hand) == "THREE_FINGERS_UP"
+
+
+def test_degenerate_hand_is_unknown():
+    classifier = GestureClassifier()
+    flat = np.zeros((21, 3), dtype=np.float32)
+    assert classifier.classify(flat) == "UNKNOWN"
+    assert classifier.classify_batch(flat[None])[0] == "UNKNOWN"
@@ -0,0 +1,71 @@
+# tests/test_cursor.py
+
+import pytest
+
+from gestureflow.cursor import CursorInterpolator, ScreenMapping
+
+
+SCREEN = (1920, 1080)
+
+
+@pytest.mark.parametrize("camera, screen", [
+    ((0.2, 0.2), (0, 0)),
+    ((0.8, 0.2), (1919, 0)),
+    ((0.2, 0.8), (0, 1079)),
+    ((0.8, 0.8), (1919, 1079)),
+    ((0.5, 0.5), (959.5, 539.5)),
+])
+def test_region_corners_map_to_screen_corners(camera, screen):
+    mapping = ScreenMapping(SCREEN, active_region=(0.2, 0.2, 0.8, 0.8), edge_dead_zone=0.0)
+    assert mapping.map(*camera) == pytest.approx(screen)
+
+
+def test_dead_zone_and_outside_points_pin_to_the_edge():
+    mapping = ScreenMapping(SCREEN, active_region=(0.2, 0.2, 0.8, 0.8), edge_dead_zone=0.1)
+    # The dead zone is 10% of the 0.6 wide region: 0.06 on each side
+    assert mapping.map(0.25, 0.25) == pytest.approx((0, 0))
+    assert mapping.map(0.0, 1.0) == pytest.approx((0, 1079))
+    assert mapping.map(0.74, 0.75) == pytest.approx((1919, 1079))
+    assert mapping.map(0.7, 0.7)[0] < 1919
+
+
+def test_acceleration_keeps_centre_and_corners():
+    linear = ScreenMapping(SCREEN, edge_dead_zone=0.0)
+    curved = ScreenMapping(SCREEN, edge_dead_zone=0.0, acceleration=2.0)
+    for camera in ((0.2, 0.2), (0.5, 0.5), (0.8, 0.8)):
+        assert curved.map(*camera) == pytest.approx(linear.map(*camera))
+    # Finer control near the centre: a small offset moves the pointer less
+    assert abs(curved.map(0.55, 0.5)[0] - 959.5) < abs(linear.map(0.55, 0.5)[0] - 959.5)
+
+
+@pytest.mark.parametrize("kwargs", [
+    {"active_region": (0.8, 0.2, 0.2, 0.8)},
+    {"edge_dead_zone": 0.5},
+    {"acceleration": 0.0},
+])
+def test_invalid_mapping(kwargs):
+    with pytest.raises(ValueError):
+        ScreenMapping(SCREEN, **kwargs)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_interpolator_glides_relative():
+    moves = []
+    clock = FakeClock()
+    cursor = CursorInterpolator(lambda dx, dy: moves.append((dx, dy)), rate_hz=100, clock=clock)
+    cursor.update(100.0, 0.0)
+    clock.now = 0.05
+    cursor.update(150.0, 0.0)
+    # Halfway through the 50 ms glide
+    clock.now = 0.075
+    with cursor._state_lock:
+        assert cursor._position(clock.now) == pytest.approx((125.0, 0.0))
+    cursor.release()
+    assert not cursor._active
@@ -0,0 +1,62 @@
+# tests/test_frame_ring.py
+
+import numpy as np
+import pytest
+
+from gestureflow.frame_ring import SharedFrameRing
+
+
+@pytest.fixture
+def ring():
+    ring = SharedFrameRing(2, (4, 4, 3))
+    yield ring
+    ring.close()
+
+
+def test_publish_and_view(ring):
+    slot = ring.acquire()
+    ring.frame(slot)[:] = 7
+    message = ring.publish(slot, seq=1)
+    assert message[:2] == (slot, 1)
+    assert (ring.view(slot, 1) == 7).all()
+    assert ring.view(slot, 2) is None
+
+
+def test_release_frees_the_slot(ring):
+    slots = [ring.acquire(), ring.acquire()]
+    assert ring.acquire() is None
+    assert ring.frames_dropped == 1
+    ring.publish(slots[0], seq=1, owners=2)
+    ring.publish(slots[1], seq=2)
+    ring.release(slots[0])
+    assert ring.acquire() is None  # One owner left
+    ring.release(slots[0])
+    assert ring.in_use() == 1
+    assert ring.view(slots[0], 1) is None
+    assert ring.acquire() == slots[0]
+
+
+def test_abandon(ring):
+    slot = ring.acquire()
+    ring.abandon(slot)
+    assert ring.in_use() == 0
+
+
+def test_reuses_the_oldest_free_slot(ring):
+    for seq in (1, 2, 3):
+        slot = ring.acquire()
+        ring.publish(slot, seq=seq)
+        ring.release(slot)
+    # Slot 0 held frame 3, slot 1 frame 2: the older one is written next
+    assert ring.acquire() == 1
+
+
+def test_attach_by_name(ring):
+    slot = ring.acquire()
+    ring.frame(slot)[:] = np.arange(48, dtype=np.uint8).reshape(4, 4, 3)
+    ring.publish(slot, seq=5)
+    attached = SharedFrameRing(2, (4, 4, 3), name=ring.name, create=False)
+    try:
+        np.testing.assert_array_equal(attached.view(slot, 5), ring.frame(slot))
+    finally:
+        attached.close()
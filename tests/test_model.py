@@ -0,0 +1,105 @@
+# tests/test_model.py
+
+import numpy as np
+import pytest
+
+from gestureflow._synthetic import synthetic_hand
+from gestureflow.classifier import GestureClassifier
+from gestureflow.model import GestureModel, HybridGestureClassifier, main, train_model
+
+
+POSES = {
+    "FIST": (0, 0, 0, 0, 0),
+    "OPEN_PALM": (1, 1, 1, 1, 1),
+    "POINTING_UP": (0, 1, 0, 0, 0),
+    "VICTORY": (0, 1, 1, 0, 0),
+    "CUSTOM": (1, 0, 1, 0, 1),  # No rule matches this pose
+}
+
+
+def labelled_poses(count, seed):
+    rng = np.random.default_rng(seed)
+    names = np.array(list(POSES))[rng.integers(len(POSES), size=count)]
+    hands = np.stack([synthetic_hand(POSES[name]) for name in names])
+    return hands + rng.normal(0.0, 0.01, hands.shape).astype(np.float32), names
+
+
+def rotate_and_scale(hands, angle, scale):
+    rotation = np.array([[np.cos(angle), -np.sin(angle), 0.0],
+                         [np.sin(angle), np.cos(angle), 0.0],
+                         [0.0, 0.0, 1.0]], dtype=np.float32)
+    wrists = hands[:, :1]
+    return ((hands - wrists) @ rotation * scale + wrists).astype(np.float32)
+
+
+@pytest.fixture(scope="module")
+def model():
+    hands, names = labelled_poses(2000, seed=0)
+    return train_model(hands, names, hidden_units=16, epochs=30)
+
+
+def test_model_learns_synthetic_poses(model):
+    hands, names = labelled_poses(500, seed=1)
+    assert (model.classify_batch(hands) == names).mean() > 0.98
+    moved = rotate_and_scale(hands, 0.5, 1.6)
+    assert (model.classify_batch(moved) == names).mean() > 0.98
+
+
+def test_classify_matches_batch(model):
+    hands, _ = labelled_poses(100, seed=2)
+    names, scores = model.classify_batch(hands, return_scores=True)
+    assert [model.classify(hand) for hand in hands] == list(names)
+    for hand, name, row in zip(hands, names, scores):
+        gesture, confidence = model.classify_with_confidence(hand)
+        assert confidence == pytest.approx(row[model.gestures.index(gesture)], abs=1e-5)
+
+
+def test_save_load_round_trip(model, tmp_path):
+    path = tmp_path / "model.npz"
+    model.save(str(path))
+    loaded = GestureModel.load(str(path))
+    hands, _ = labelled_poses(200, seed=3)
+    names, scores = model.classify_batch(hands, return_scores=True)
+    loaded_names, loaded_scores = loaded.classify_batch(hands, return_scores=True)
+    assert loaded.labels == model.labels
+    np.testing.assert_array_equal(loaded_names, names)
+    np.testing.assert_array_equal(loaded_scores, scores)
+
+
+def test_min_confidence_reports_unknown(model):
+    strict = GestureModel(model.labels, model.layers, model.mean, model.scale, min_confidence=1.01)
+    hand = synthetic_hand(POSES["FIST"])
+    assert strict.classify(hand) == "UNKNOWN"
+    assert strict.classify_batch(hand[None])[0] == "UNKNOWN"
+
+
+def test_hybrid_falls_back_to_the_model(model):
+    rules = GestureClassifier()
+    hybrid = HybridGestureClassifier(rules, model, mode="fallback")
+    custom = synthetic_hand(POSES["CUSTOM"])
+    fist = synthetic_hand(POSES["FIST"])
+    assert rules.classify(custom) == "UNKNOWN"
+    assert hybrid.classify(custom) == "CUSTOM"
+    assert hybrid.classify(fist) == "FIST"
+    assert list(hybrid.classify_batch(np.stack([custom, fist]))) == ["CUSTOM", "FIST"]
+    assert "CUSTOM" in hybrid.gestures and "THUMBS_DOWN" in hybrid.gestures
+
+
+def test_invalid_training_and_modes(model):
+    hands, _ = labelled_poses(10, seed=4)
+    with pytest.raises(ValueError):
+        train_model(hands, ["FIST"] * len(hands))
+    with pytest.raises(ValueError):
+        HybridGestureClassifier(GestureClassifier(), model, mode="vote")
+
+
+def test_train_and_evaluate_cli(tmp_path, capsys):
+    hands, names = labelled_poses(400, seed=5)
+    dataset = tmp_path / "poses.npz"
+    np.savez_compressed(dataset, landmarks=hands, labels=names)
+    model_path = tmp_path / "model.npz"
+    main(["train", str(dataset), "-o", str(model_path), "--hidden", "0", "--epochs", "30"])
+    main(["evaluate", str(model_path), str(dataset)])
+    output = capsys.readouterr().out
+    accuracy = float(output.split("Accuracy on 400 poses: ")[1].split()[0])
+    assert accuracy > 0.95
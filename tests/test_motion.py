@@ -0,0 +1,75 @@
+# tests/test_motion.py
+
+import numpy as np
+
+from gestureflow.motion import MotionGate, MotionGatedDetector
+
+
+def grey(level):
+    return np.full((240, 320, 3), level, dtype=np.uint8)
+
+
+def test_gate_compares_against_the_last_motion_frame():
+    gate = MotionGate(threshold=4.0)
+    assert gate.check(grey(100))  # The first frame always counts
+    assert not gate.check(grey(100))
+    # Slow drift adds up against the reference instead of hiding below the threshold
+    assert not gate.check(grey(103))
+    assert not gate.check(grey(104))
+    assert gate.check(grey(106))
+    assert gate.last_difference == 6.0
+    assert not gate.check(grey(108))
+    gate.reset()
+    assert gate.check(grey(108))
+
+
+class FakeDetector:
+    """Reports a hand on the frames listed in hand_frames."""
+
+    def __init__(self, hand_frames=()):
+        self.hand_frames = set(hand_frames)
+        self.calls = 0
+        self.closed = False
+
+    def process_frame(self, frame, is_rgb=False):
+        self.calls += 1
+        return (["hand"], "results") if self.calls in self.hand_frames else ([], None)
+
+    def close(self):
+        self.closed = True
+
+
+def test_static_scene_skips_the_detector():
+    fake = FakeDetector()
+    detector = MotionGatedDetector(fake, MotionGate(threshold=4.0))
+    for _ in range(5):
+        assert detector.process_frame(grey(50)) == ([], None)
+    assert fake.calls == 1 and not detector.motion_detected
+    detector.process_frame(grey(90))
+    assert fake.calls == 2 and detector.motion_detected
+    stats = detector.stats()
+    assert stats["frames"] == 6 and stats["skipped"] == 4
+    assert stats["skip_rate"] == 4 / 6
+
+
+def test_tracked_hand_bypasses_the_gate():
+    fake = FakeDetector(hand_frames={1, 2, 3})
+    detector = MotionGatedDetector(fake, MotionGate(threshold=4.0))
+    # The hand keeps every frame going to the detector, static or not
+    outputs = [detector.process_frame(grey(50)) for _ in range(4)]
+    assert fake.calls == 4 and detector.skipped == 0
+    assert outputs[2] == (["hand"], "results") and outputs[3] == ([], None)
+    # Once the hand is gone the next frame becomes the new reference; after it the static scene is skipped
+    detector.process_frame(grey(50))
+    detector.process_frame(grey(50))
+    assert fake.calls == 5 and detector.skipped == 1
+
+
+def test_disabled_gate_runs_every_frame():
+    fake = FakeDetector()
+    detector = MotionGatedDetector(fake, enabled=False)
+    for _ in range(3):
+        detector.process_frame(grey(50))
+    assert fake.calls == 3 and detector.skipped == 0 and detector.motion_detected
+    detector.close()
+    assert fake.closed
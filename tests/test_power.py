@@ -0,0 +1,98 @@
+# tests/test_power.py
+
+import cv2
+import pytest
+
+from gestureflow import power
+from gestureflow.power import IdlePowerManager
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeCapture:
+    def __init__(self):
+        self.properties = {cv2.CAP_PROP_FPS: 30.0, cv2.CAP_PROP_FRAME_WIDTH: 1280.0,
+                           cv2.CAP_PROP_FRAME_HEIGHT: 720.0}
+
+    def get(self, prop):
+        return self.properties.get(prop, 0.0)
+
+    def set(self, prop, value):
+        self.properties[prop] = value
+        return True
+
+
+class FakeGatedDetector:
+    def __init__(self):
+        self.enabled = False
+        self.motion_detected = False
+
+
+@pytest.fixture
+def setup():
+    clock, capture, gated = FakeClock(), FakeCapture(), FakeGatedDetector()
+    manager = IdlePowerManager(capture, gated, idle_timeout=10.0, idle_fps=5.0, idle_size=(320, 240), clock=clock)
+    return manager, clock, capture, gated
+
+
+def test_enters_idle_after_the_timeout(setup):
+    manager, clock, capture, gated = setup
+    clock.now = 10.0
+    assert not manager.update(False)
+    clock.now = 10.5
+    assert manager.update(False)
+    assert gated.enabled and manager.idle_periods == 1
+    assert capture.properties == {cv2.CAP_PROP_FPS: 5.0, cv2.CAP_PROP_FRAME_WIDTH: 320.0,
+                                  cv2.CAP_PROP_FRAME_HEIGHT: 240.0}
+
+
+def test_a_hand_restarts_the_timeout(setup):
+    manager, clock, _, _ = setup
+    clock.now = 8.0
+    manager.update(True)
+    clock.now = 17.0
+    assert not manager.update(False)
+    clock.now = 18.5
+    assert manager.update(False)
+
+
+@pytest.mark.parametrize("wake_by_hand", [True, False])
+def test_wakes_on_motion_or_hand_and_restores_the_capture(setup, wake_by_hand):
+    manager, clock, capture, gated = setup
+    clock.now = 11.0
+    manager.update(False)
+    clock.now = 30.0
+    assert manager.update(False)  # Still idle while nothing moves
+    gated.motion_detected = not wake_by_hand
+    assert not manager.update(wake_by_hand)
+    assert not gated.enabled
+    assert capture.properties == {cv2.CAP_PROP_FPS: 30.0, cv2.CAP_PROP_FRAME_WIDTH: 1280.0,
+                                  cv2.CAP_PROP_FRAME_HEIGHT: 720.0}
+    # Waking gives a full timeout before going idle again
+    gated.motion_detected = False
+    clock.now = 39.0
+    assert not manager.update(False)
+    clock.now = 40.5
+    assert manager.update(False) and manager.idle_periods == 2
+
+
+def test_throttle_holds_the_idle_rate(setup, monkeypatch):
+    manager, clock, _, _ = setup
+    sleeps = []
+    monkeypatch.setattr(power.time, "sleep", sleeps.append)
+    manager.throttle()
+    clock.now = 0.05
+    manager.throttle()
+    assert sleeps == []  # Full rate while active
+    clock.now = 11.0
+    manager.update(False)
+    manager.throttle()
+    clock.now = 11.05
+    manager.throttle()
+    assert sleeps == [pytest.approx(0.15)]
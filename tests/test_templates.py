@@ -0,0 +1,87 @@
+# tests/test_templates.py
+
+import numpy as np
+import pytest
+
+from gestureflow._synthetic import perturbed_hands, synthetic_hand
+from gestureflow.model import landmark_features
+from gestureflow.templates import TemplateMatcher
+
+FIST = (0, 0, 0, 0, 0)
+OPEN_PALM = (1, 1, 1, 1, 1)
+POINTING_UP = (0, 1, 0, 0, 0)
+
+
+def jittered(extended, count, noise, seed):
+    rng = np.random.default_rng(seed)
+    hand = synthetic_hand(extended)
+    return hand + rng.normal(0.0, noise, (count,) + hand.shape).astype(np.float32)
+
+
+def test_exact_template_matches():
+    matcher = TemplateMatcher(np.stack([synthetic_hand(FIST), synthetic_hand(OPEN_PALM)]), ["FIST", "OPEN_PALM"])
+    label, distance, confidence = matcher.match(synthetic_hand(OPEN_PALM))
+    assert label == "OPEN_PALM"
+    assert distance == pytest.approx(0.0, abs=1e-3) and confidence == pytest.approx(1.0, abs=1e-2)
+
+
+def test_max_distance_cutoff():
+    templates = np.stack([synthetic_hand(FIST), synthetic_hand(OPEN_PALM)])
+    hand = synthetic_hand(POINTING_UP)
+    _, distance, _ = TemplateMatcher(templates, ["FIST", "OPEN_PALM"]).match(hand)
+    assert TemplateMatcher(templates, ["FIST", "OPEN_PALM"], max_distance=distance * 0.9).classify_with_confidence(hand) \
+        == ("UNKNOWN", 0.0)
+    assert TemplateMatcher(templates, ["FIST", "OPEN_PALM"], max_distance=distance * 1.1).classify(hand) == "FIST"
+
+
+def test_k_nearest_vote():
+    hand = synthetic_hand(FIST)
+    near = jittered(FIST, 1, 0.002, seed=0)
+    farther = jittered(FIST, 2, 0.01, seed=1)
+    templates = np.concatenate([near, farther])
+    labels = ["NEAR", "FAR", "FAR"]
+    assert TemplateMatcher(templates, labels, max_distance=1.0, k=1).classify(hand) == "NEAR"
+    label, confidence = TemplateMatcher(templates, labels, max_distance=1.0, k=3).classify_with_confidence(hand)
+    # Two of the three neighbours vote FAR, each with a weight just below 1
+    assert label == "FAR" and 0.6 < confidence < 2.0 / 3.0
+
+
+@pytest.mark.parametrize("k", [1, 3])
+def test_classify_matches_batch(k):
+    templates = np.concatenate([jittered(FIST, 20, 0.01, 0), jittered(OPEN_PALM, 20, 0.01, 1),
+                                jittered(POINTING_UP, 20, 0.01, 2)])
+    labels = ["FIST"] * 20 + ["OPEN_PALM"] * 20 + ["POINTING_UP"] * 20
+    matcher = TemplateMatcher(templates, labels, max_distance=0.2, k=k)
+    hands = perturbed_hands(300, seed=3)
+    names, scores = matcher.classify_batch(hands, return_scores=True)
+    assert [matcher.classify(hand) for hand in hands] == list(names)
+    assert 0 < (names == "UNKNOWN").sum() < len(names)
+    for hand, name, row in zip(hands[:50], names, scores):
+        gesture, confidence = matcher.classify_with_confidence(hand)
+        if gesture != "UNKNOWN":
+            assert confidence == pytest.approx(row[matcher.gestures.index(gesture)], abs=1e-5)
+
+
+def test_brute_force_nearest_matches_direct_distances():
+    templates = perturbed_hands(200, seed=4)
+    matcher = TemplateMatcher(templates, ["POSE"] * len(templates), k=3, index_threshold=10 ** 9)
+    features = landmark_features(perturbed_hands(50, seed=5)).astype(np.float32)
+    distances, indices = matcher._nearest(features)
+    direct = np.linalg.norm(features[:, None] - matcher.templates[None], axis=-1)
+    np.testing.assert_array_equal(np.sort(indices, axis=1), np.sort(np.argsort(direct, axis=1)[:, :3], axis=1))
+    np.testing.assert_allclose(np.sort(distances, axis=1), np.sort(direct, axis=1)[:, :3], atol=1e-3)
+
+
+@pytest.mark.parametrize("k", [1, 3])
+def test_kd_tree_matches_brute_force(k):
+    pytest.importorskip("scipy")
+    templates = perturbed_hands(2000, seed=6)
+    labels = np.array(["A", "B", "C", "D"])[np.arange(len(templates)) % 4]
+    brute = TemplateMatcher(templates, labels, max_distance=0.3, k=k, index_threshold=10 ** 9)
+    tree = TemplateMatcher(templates, labels, max_distance=0.3, k=k, index_threshold=1)
+    assert brute._tree is None and tree._tree is not None
+    hands = perturbed_hands(300, seed=7)
+    names, scores = brute.classify_batch(hands, return_scores=True)
+    tree_names, tree_scores = tree.classify_batch(hands, return_scores=True)
+    np.testing.assert_array_equal(tree_names, names)
+    np.testing.assert_allclose(tree_scores, scores, atol=1e-4)
@@ -0,0 +1,68 @@
+# tests/test_temporal.py
+
+import pytest
+
+from gestureflow.temporal import GestureVoter
+
+
+def test_label_needs_threshold_votes():
+    voter = GestureVoter(buffer_size=3, threshold=3)
+    assert voter.update("FIST") == "UNKNOWN"
+    assert voter.update("FIST") == "UNKNOWN"
+    assert voter.update("FIST") == "FIST"
+
+
+def test_single_outlier_is_ignored():
+    voter = GestureVoter(buffer_size=3, threshold=2)
+    for gesture in ("FIST", "FIST", "OPEN_PALM", "FIST"):
+        stable = voter.update(gesture)
+    assert stable == "FIST"
+
+
+def test_threshold_one_passes_raw_labels():
+    voter = GestureVoter(buffer_size=3, threshold=1)
+    assert [voter.update(g) for g in ("FIST", "OPEN_PALM", "FIST")] == ["FIST", "OPEN_PALM", "FIST"]
+
+
+def test_stable_label_needs_to_hold_the_window():
+    voter = GestureVoter(buffer_size=3, threshold=3)
+    for _ in range(3):
+        voter.update("FIST")
+    # One outlier keeps the majority, two do not
+    assert voter.update("OPEN_PALM") == "FIST"
+    assert voter.update("POINTING_UP") == "UNKNOWN"
+
+
+def test_flicker_never_becomes_stable():
+    voter = GestureVoter(buffer_size=3, threshold=3)
+    for _ in range(3):
+        voter.update("FIST")
+    assert [voter.update(g) for g in ("OPEN_PALM", "VICTORY") * 3] == ["FIST"] + ["UNKNOWN"] * 5
+
+
+def test_votes_and_confidence():
+    voter = GestureVoter(buffer_size=4, threshold=2)
+    voter.update("FIST", 0.8)
+    voter.update("FIST", 0.6)
+    voter.update("OPEN_PALM", 0.9)
+    assert voter.votes("FIST") == (2, pytest.approx(0.7))
+    assert voter.confidence == pytest.approx(0.7)
+    # The oldest vote leaves the window
+    voter.update("OPEN_PALM", 1.0)
+    voter.update("OPEN_PALM", 1.0)
+    assert voter.votes("FIST") == (1, pytest.approx(0.6))
+
+
+def test_reset():
+    voter = GestureVoter(buffer_size=2, threshold=2)
+    voter.update("FIST")
+    voter.update("FIST")
+    voter.reset()
+    assert voter.gesture == "UNKNOWN"
+    assert voter.votes("FIST") == (0, 0.0)
+
+
+@pytest.mark.parametrize("buffer_size, threshold", [(0, 1), (3, 0), (3, 4)])
+def test_invalid_arguments(buffer_size, threshold):
+    with pytest.raises(ValueError):
+        GestureVoter(buffer_size, threshold)
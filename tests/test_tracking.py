@@ -0,0 +1,67 @@
+# tests/test_tracking.py
+
+import numpy as np
+
+from gestureflow.landmarks import HandLandmarks
+from gestureflow.tracking import OneEuroLandmarkFilter, PrimaryHandTracker, match_hands
+
+
+def test_filter_reduces_jitter_at_rest(make_hand):
+    rng = np.random.default_rng(1)
+    rest = make_hand((1, 1, 1, 1, 1))[None]
+    landmark_filter = OneEuroLandmarkFilter()
+    raw, filtered = [], []
+    for frame in range(300):
+        points = rest + rng.normal(0.0, 0.003, rest.shape).astype(np.float32)
+        raw.append(points)
+        filtered.append(landmark_filter.filter(points, frame / 30.0))
+    raw_jitter = np.std(np.diff(np.stack(raw[30:]), axis=0))
+    filtered_jitter = np.std(np.diff(np.stack(filtered[30:]), axis=0))
+    assert filtered_jitter < raw_jitter / 2
+
+
+def test_filter_follows_motion(make_hand):
+    hand = make_hand((1, 1, 1, 1, 1))[None]
+    landmark_filter = OneEuroLandmarkFilter()
+    velocity = np.array([0.5, 0.0, 0.0], dtype=np.float32)  # Image widths per second
+    for frame in range(60):
+        t = frame / 30.0
+        filtered = landmark_filter.filter(hand + velocity * t, t)
+    # Lag behind a steady 0.5 widths/s motion stays below one frame's travel
+    lag = (hand + velocity * t - filtered)[..., 0]
+    assert np.abs(lag).max() < 0.5 / 30.0
+
+
+def test_first_frame_and_reset_pass_raw_points(make_hand):
+    hand = make_hand((0, 1, 0, 0, 0))[None]
+    landmark_filter = OneEuroLandmarkFilter()
+    np.testing.assert_array_equal(landmark_filter.filter(hand, 0.0), hand)
+    landmark_filter.filter(hand + 0.1, 1 / 30.0)
+    assert len(landmark_filter.filter(np.empty((0, 21, 3)), 2 / 30.0)) == 0
+    assert landmark_filter.points is None
+    np.testing.assert_array_equal(landmark_filter.filter(hand + 0.2, 3 / 30.0), hand + 0.2)
+
+
+def test_filter_hands_keeps_metadata(make_hand):
+    hands = [HandLandmarks(make_hand((1, 1, 1, 1, 1)), "Right", 0.9)]
+    filtered = OneEuroLandmarkFilter().filter_hands(hands, 0.0)
+    assert filtered[0].handedness == "Right" and filtered[0].score == 0.9
+
+
+def test_match_hands_follows_swapped_order(make_hand):
+    left = make_hand((1, 1, 1, 1, 1))
+    right = left + np.array([0.4, 0.0, 0.0], dtype=np.float32)
+    previous = np.stack([left, right])
+    assert list(match_hands(previous, np.stack([right + 0.01, left - 0.01]))) == [1, 0]
+
+
+def test_primary_hand_follows_swaps_and_reports_switches(make_hand):
+    left = HandLandmarks(make_hand((1, 1, 1, 1, 1)))
+    right = HandLandmarks(left.points + np.array([0.4, 0.0, 0.0], dtype=np.float32))
+    primary = PrimaryHandTracker()
+    assert primary.select([left, right]) == (left, False)
+    assert primary.select([right, left]) == (left, False)
+    # The followed hand leaves: the other one takes over
+    assert primary.select([right]) == (right, True)
+    assert primary.select([]) == (None, False)
+    assert primary.select([left]) == (left, False)